@@ -68,8 +68,7 @@ export async function POST(
     // Get processing result from Python service
     let processingResult = null;
     try {
-      const status = await pythonService.getStatus(id);
-      processingResult = status.result;
+      processingResult = await pythonService.getResult(id);
     } catch (e) {
       console.warn('Could not get processing result from Python:', e);
     }
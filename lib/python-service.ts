@@ -37,6 +37,8 @@ export interface ProcessingOptions {
   useAiParsing?: boolean;
   aiProvider?: 'local' | 'claude' | 'openai';
   ocrProvider?: 'easyocr' | 'tesseract' | 'google';
+  useCache?: boolean;
+  profile?: boolean;
 }
 
 export interface ProcessingLog {
@@ -58,8 +60,14 @@ export interface ProcessingStatusResponse {
   pageCount?: number;
   errorMessage?: string;
   result?: ProcessingResult;
+  logCursor?: number;
 }
 
+export type ProcessingEvent =
+  | { type: 'status'; status: Omit<ProcessingStatusResponse, 'uploadId' | 'logs'> }
+  | { type: 'log'; log: ProcessingLog }
+  | { type: 'end'; status: Omit<ProcessingStatusResponse, 'uploadId' | 'logs'> };
+
 export interface TocItem {
   id?: string;
   title: string;
@@ -92,6 +100,7 @@ export interface ProcessingResult {
     totalPages: number;
     isScanned: boolean;
     extractionMethod: string;
+    fallbackPages?: number[];
   };
   toc: TocItem[];
   chapters: ChapterContent[];
@@ -104,6 +113,21 @@ export interface PageContent {
   text: string;
   confidence?: number;
   isOcr: boolean;
+  ocrDpi?: number;
+}
+
+export interface StageProfile {
+  stage: string;
+  seconds: number;
+  peakMemoryBytes: number;
+  topFunctions: {
+    function: string;
+    calls: number;
+    selfSeconds: number;
+    cumulativeSeconds: number;
+  }[];
+  pstatsFile: string;
+  collapsedFile: string;
 }
 
 export interface AiProvider {
@@ -158,6 +182,8 @@ class PythonServiceClient {
           use_ai_parsing: options.useAiParsing ?? true,
           ai_provider: options.aiProvider ?? 'local',
           ocr_provider: options.ocrProvider ?? 'easyocr',
+          use_cache: options.useCache ?? true,
+          profile: options.profile ?? false,
         },
       }),
     });
@@ -171,10 +197,59 @@ class PythonServiceClient {
   }
 
   /**
-   * Get processing status
+   * Upload a file to the Python service (streamed to its UPLOAD_DIR).
+   * Set startProcessing to queue processing in the same request.
    */
-  async getStatus(uploadId: string): Promise<ProcessingStatusResponse> {
-    const response = await fetch(`${this.baseUrl}/status/${uploadId}`, {
+  async uploadDocument(
+    file: Blob,
+    fileName: string,
+    options: ProcessingOptions & { uploadId?: string; startProcessing?: boolean } = {}
+  ): Promise<{
+    uploadId: string;
+    filePath: string;
+    fileSize: number;
+    fileHash: string;
+    status?: ProcessingStatus;
+    message: string;
+  }> {
+    const form = new FormData();
+    if (options.uploadId) form.append('upload_id', options.uploadId);
+    form.append('process', String(options.startProcessing ?? false));
+    form.append('use_ocr', String(options.useOcr ?? false));
+    form.append('use_ai_parsing', String(options.useAiParsing ?? true));
+    form.append('ai_provider', options.aiProvider ?? 'local');
+    form.append('ocr_provider', options.ocrProvider ?? 'easyocr');
+    form.append('use_cache', String(options.useCache ?? true));
+    form.append('profile', String(options.profile ?? false));
+    form.append('file', file, fileName);
+
+    const response = await fetch(`${this.baseUrl}/upload`, {
+      method: 'POST',
+      body: form,
+    });
+
+    if (!response.ok) {
+      const error = await response.json();
+      throw new Error(error.detail || 'Failed to upload document');
+    }
+
+    const data = await response.json();
+    return {
+      uploadId: data.upload_id,
+      filePath: data.file_path,
+      fileSize: data.file_size,
+      fileHash: data.file_hash,
+      status: data.status ?? undefined,
+      message: data.message,
+    };
+  }
+
+  /**
+   * Get processing status.
+   * Pass the previous logCursor as `since` to receive only newer log entries.
+   */
+  async getStatus(uploadId: string, since: number = 0): Promise<ProcessingStatusResponse> {
+    const response = await fetch(`${this.baseUrl}/status/${uploadId}?since=${since}`, {
       method: 'GET',
       headers: { 'Content-Type': 'application/json' },
     });
@@ -199,9 +274,123 @@ class PythonServiceClient {
       pageCount: data.page_count,
       errorMessage: data.error_message,
       result: data.result,
+      logCursor: data.log_cursor,
     };
   }
 
+  /**
+   * Get the result of a completed job.
+   * Results are not part of the status response; fetch them once when done.
+   */
+  async getResult(uploadId: string): Promise<ProcessingResult> {
+    const response = await fetch(`${this.baseUrl}/result/${uploadId}`, {
+      method: 'GET',
+      headers: { Accept: 'application/json' },
+    });
+
+    if (!response.ok) {
+      const error = await response.json().catch(() => ({}));
+      throw new Error(error.detail || 'Failed to get result');
+    }
+
+    return response.json();
+  }
+
+  /**
+   * Get the per-stage profile of a job processed with `profile: true`.
+   * Files are downloadable from `${baseUrl}/status/${uploadId}/profile/${file}`.
+   */
+  async getProfile(uploadId: string): Promise<StageProfile[]> {
+    const response = await fetch(`${this.baseUrl}/status/${uploadId}/profile`, {
+      method: 'GET',
+      headers: { Accept: 'application/json' },
+    });
+
+    if (!response.ok) {
+      const error = await response.json().catch(() => ({}));
+      throw new Error(error.detail || 'Failed to get profile');
+    }
+
+    const data = await response.json();
+    return data.stages.map((stage: any) => ({
+      stage: stage.stage,
+      seconds: stage.seconds,
+      peakMemoryBytes: stage.peak_memory_bytes,
+      topFunctions: stage.top_functions.map((fn: any) => ({
+        function: fn.function,
+        calls: fn.calls,
+        selfSeconds: fn.self_seconds,
+        cumulativeSeconds: fn.cumulative_seconds,
+      })),
+      pstatsFile: stage.pstats_file,
+      collapsedFile: stage.collapsed_file,
+    }));
+  }
+
+  /**
+   * Stream processing progress (Server-Sent Events).
+   * Calls onEvent for each status change and new log entry until the job ends.
+   */
+  async streamStatus(
+    uploadId: string,
+    onEvent: (event: ProcessingEvent) => void,
+    since: number = 0
+  ): Promise<void> {
+    const response = await fetch(`${this.baseUrl}/status/${uploadId}/events?since=${since}`, {
+      method: 'GET',
+      headers: { Accept: 'text/event-stream' },
+    });
+
+    if (!response.ok || !response.body) {
+      if (response.status === 404) {
+        throw new Error('Upload not found');
+      }
+      throw new Error('Failed to stream status');
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+
+      buffer += decoder.decode(value, { stream: true });
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) >= 0) {
+        const message = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+
+        let eventName = '';
+        let data = '';
+        for (const line of message.split('\n')) {
+          if (line.startsWith('event: ')) eventName = line.slice(7);
+          else if (line.startsWith('data: ')) data = line.slice(6);
+        }
+        if (!eventName || !data) continue;
+
+        const payload = JSON.parse(data);
+        if (eventName === 'log') {
+          onEvent({ type: 'log', log: payload });
+        } else if (eventName === 'status' || eventName === 'end') {
+          onEvent({
+            type: eventName,
+            status: {
+              status: payload.status,
+              progress: payload.progress,
+              currentStep: payload.current_step,
+              detectedTitle: payload.detected_title,
+              detectedAuthor: payload.detected_author,
+              pageCount: payload.page_count,
+              errorMessage: payload.error_message,
+            },
+          });
+        }
+      }
+    }
+  }
+
   /**
    * Extract text from a file
    */
@@ -215,6 +404,7 @@ class PythonServiceClient {
     totalPages: number;
     isScanned: boolean;
     extractionMethod: string;
+    fallbackPages?: number[];
   }> {
     const response = await fetch(`${this.baseUrl}/extract-text`, {
       method: 'POST',
@@ -334,6 +524,22 @@ class PythonServiceClient {
     return response.json();
   }
 
+  /**
+   * Request cancellation of a queued or running job
+   */
+  async cancelProcessing(uploadId: string): Promise<void> {
+    const response = await fetch(`${this.baseUrl}/status/${uploadId}/cancel`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+    });
+
+    // 409 means the job already finished
+    if (!response.ok && response.status !== 409) {
+      const error = await response.json().catch(() => ({}));
+      throw new Error(error.detail || 'Failed to cancel processing');
+    }
+  }
+
   /**
    * Clear processing status
    */
@@ -387,7 +593,8 @@ export const pythonService = new PythonServiceClient();
 // ============================================
 
 /**
- * Poll for processing status until complete or failed
+ * Poll for processing status until complete or failed.
+ * Only new log entries are fetched on each poll; onUpdate receives all logs so far.
  */
 export async function pollProcessingStatus(
   uploadId: string,
@@ -396,11 +603,17 @@ export async function pollProcessingStatus(
   maxAttempts: number = 600 // 10 minutes max
 ): Promise<ProcessingStatusResponse> {
   let attempts = 0;
+  let logCursor = 0;
+  const logs: ProcessingLog[] = [];
 
   return new Promise((resolve, reject) => {
     const poll = async () => {
       try {
-        const status = await pythonService.getStatus(uploadId);
+        const update = await pythonService.getStatus(uploadId, logCursor);
+        logs.push(...update.logs);
+        logCursor = update.logCursor ?? logs.length;
+
+        const status = { ...update, logs: [...logs] };
         onUpdate(status);
 
         if (status.status === 'COMPLETED') {
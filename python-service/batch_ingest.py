@@ -0,0 +1,100 @@
+"""
+Batch Ingestion CLI
+Process whole directories of books without going through the HTTP API.
+
+Examples:
+    python batch_ingest.py ../uploads/abx --pattern "*.abx" --parallel 4
+    python batch_ingest.py "../uploads/documents/*.pdf" --no-ai --ocr-provider tesseract
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+
+from config import settings
+from models import ProcessingOptions
+from services.jobs import JobExecutor, BatchRunner, collect_batch_files, get_job_store
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Batch-process books through the document pipeline.")
+    parser.add_argument("paths", nargs="+", help="Files, directories or glob patterns")
+    parser.add_argument("--pattern", default="*", help="File pattern inside directories (default: *)")
+    parser.add_argument("--recursive", action="store_true", help="Search directories recursively")
+    parser.add_argument("--parallel", type=int, default=settings.BATCH_PARALLELISM,
+                        help=f"Files processed at once (default: {settings.BATCH_PARALLELISM})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help=f"Worker pool size (default: max of --parallel and {settings.JOB_WORKERS})")
+    parser.add_argument("--output-dir", default=None,
+                        help=f"Where batch results are written (default: {settings.BATCH_OUTPUT_DIR})")
+    parser.add_argument("--ocr", action="store_true", help="Force OCR")
+    parser.add_argument("--ocr-provider", default="easyocr", help="easyocr, tesseract, google")
+    parser.add_argument("--no-ai", action="store_true", help="Disable AI TOC parsing")
+    parser.add_argument("--ai-provider", default=settings.DEFAULT_AI_PROVIDER, help="local, claude, openai")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached results")
+    return parser.parse_args(argv)
+
+
+def print_progress(summary: dict):
+    """Print one line per finished file with aggregate throughput."""
+    last = summary["last"]
+    eta = f"{summary['eta_seconds']:.0f}s" if summary["eta_seconds"] is not None else "-"
+    print(
+        f"[{summary['completed'] + summary['failed']}/{summary['total_files']}] "
+        f"{last['status']:<9} {last['file_path']} ({last['pages']} pages, {last['duration_ms']} ms) | "
+        f"{summary['pages_per_sec']:.1f} pages/s, {summary['books_per_sec']:.3f} books/s, "
+        f"{summary['failed']} failed, ETA {eta}",
+        flush=True
+    )
+    if last.get("error"):
+        print(f"    error: {last['error']}", flush=True)
+
+
+async def run_batch(args: argparse.Namespace) -> int:
+    files = collect_batch_files(args.paths, args.pattern, args.recursive)
+    if not files:
+        print("No supported files found", file=sys.stderr)
+        return 1
+
+    options = ProcessingOptions(
+        use_ocr=args.ocr,
+        ocr_provider=args.ocr_provider,
+        use_ai_parsing=not args.no_ai,
+        ai_provider=args.ai_provider,
+        use_cache=not args.no_cache,
+    )
+
+    job_store = get_job_store()
+    executor = JobExecutor(job_store, max_workers=args.workers or max(args.parallel, settings.JOB_WORKERS))
+    runner = BatchRunner(
+        job_store, executor, files, options,
+        parallelism=args.parallel,
+        output_dir=args.output_dir,
+        on_progress=print_progress
+    )
+
+    print(f"Batch {runner.batch_id}: {len(files)} files, parallelism {runner.parallelism}", flush=True)
+    try:
+        summary = await runner.run()
+    finally:
+        await executor.shutdown()
+
+    print(
+        f"Done in {summary['elapsed_seconds']}s: {summary['completed']} completed, "
+        f"{summary['failed']} failed, {summary['pages']} pages "
+        f"({summary['pages_per_sec']:.1f} pages/s). Results in {summary['output_dir']}"
+    )
+    return 0 if summary["failed"] == 0 else 2
+
+
+def main(argv=None) -> int:
+    logging.basicConfig(
+        level=logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    return asyncio.run(run_batch(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
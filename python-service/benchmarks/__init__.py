@@ -0,0 +1,24 @@
+"""
+Pipeline Benchmarks
+Stage-level benchmarks with stored baselines and a regression gate.
+
+Run from python-service:
+    python -m benchmarks                    # Compare with the stored baseline
+    python -m benchmarks --save-baseline    # Record a new baseline
+"""
+
+from .corpus import Corpus, build_corpus
+from .runner import Benchmark, measure, run_benchmarks, compare, load_baseline, save_baseline
+from .stages import build_benchmarks
+
+__all__ = [
+    "Corpus",
+    "build_corpus",
+    "Benchmark",
+    "measure",
+    "run_benchmarks",
+    "compare",
+    "load_baseline",
+    "save_baseline",
+    "build_benchmarks",
+]
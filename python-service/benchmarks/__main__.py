@@ -0,0 +1,89 @@
+"""
+Benchmark CLI
+
+Examples:
+    python -m benchmarks --save-baseline
+    python -m benchmarks
+    python -m benchmarks --only toc_patterns content_splitter --min-time 3
+
+Without --save-baseline the results are compared against the baseline file,
+which has to exist: the exit status is 1 on a regression and 2 when there is
+no baseline. Baselines are machine-specific and not committed; a CI job
+creates one on the base branch with --save-baseline (or restores it from its
+cache) before running the gate on the change.
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+from .corpus import build_corpus
+from .runner import DEFAULT_BASELINE, DEFAULT_THRESHOLD, compare, load_baseline, run_benchmarks, save_baseline
+from .stages import build_benchmarks
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the document pipeline stages.")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="Run only these benchmarks")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds to time each benchmark (default: 1)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE,
+                        help=f"Baseline file (default: {DEFAULT_BASELINE})")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed regression as a fraction (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--abx", type=Path, default=None, help="ABX book of the corpus (default: 17789.abx)")
+    return parser.parse_args(argv)
+
+
+def print_result(name: str, result: dict):
+    pages = f"{result['pages_per_sec']:>9.1f} pages/s" if result["pages_per_sec"] else " " * 17
+    print(
+        f"{name:<18} {result['ops_per_sec']:>10.3f} ops/s  {pages}  "
+        f"{result['peak_memory_bytes'] / 1e6:>8.1f} MB peak  ({result['rounds']} rounds)",
+        flush=True
+    )
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("services").setLevel(logging.ERROR)
+
+    baseline = None
+    if not args.save_baseline:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            print(f"No baseline at {args.baseline}; run with --save-baseline to create one", file=sys.stderr)
+            return 2
+
+    with tempfile.TemporaryDirectory(prefix="benchmark-corpus-") as work_dir:
+        benchmarks = build_benchmarks(build_corpus(Path(work_dir), args.abx))
+        if args.only:
+            unknown = set(args.only) - {b.name for b in benchmarks}
+            if unknown:
+                print(f"Unknown benchmarks: {', '.join(sorted(unknown))}", file=sys.stderr)
+                return 2
+            benchmarks = [b for b in benchmarks if b.name in args.only]
+
+        results = run_benchmarks(benchmarks, min_time=args.min_time, on_result=print_result)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+
+    print(f"\nNo regressions beyond {args.threshold:.0%} (baseline from {baseline.get('created_at')})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
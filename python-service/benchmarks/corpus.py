@@ -0,0 +1,108 @@
+"""
+Benchmark Corpus
+The fixed inputs every benchmark run uses: the sample ABX book shipped with
+the repository and a synthetic PDF generated with PyMuPDF, so results only
+change when the code does.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import fitz  # PyMuPDF
+
+from services.text_extractor.abx_extractor import ABXExtractor
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_ABX_PATH = REPO_ROOT / "17789.abx"
+
+PDF_PAGES = 60
+PDF_LINES_PER_PAGE = 40
+OCR_PAGES = 5
+TOC_ENTRIES = 150
+ARABIC_PAGES = 300
+CHAPTER_EVERY = 8  # Pages per synthetic chapter
+
+_LEVEL_WORDS = ["الكتاب", "الباب", "الفصل", "المسألة"]
+_PARAGRAPH = (
+    "قَالَ الإمامُ أبو حامدٍ رحمهُ اللهُ تعالى:  إنَّ العِلْمَ ثمرةُ الفِكْرِ، والفكرُ مِفتاحُ "
+    "المعرفةِ؛ وهذه مسألةٌ ذكرها في كتابِ الإحيـاءِ على مذهبِ أهلِ السُّنَّةِ.\n"
+)
+_ORDINALS = ["الأول", "الثاني", "الثالث", "الرابع", "الخامس", "السادس", "السابع", "الثامن", "التاسع", "العاشر"]
+
+
+@dataclass
+class Corpus:
+    """Paths and preloaded inputs shared by the benchmarks."""
+    abx_path: Path
+    pdf_path: Path
+    ocr_pdf_path: Path
+    abx_text: str = ""
+    abx_pages: List[Dict[str, Any]] = field(default_factory=list)
+    toc_text: str = ""
+    toc_items: List[Dict[str, Any]] = field(default_factory=list)
+    arabic_pages: List[str] = field(default_factory=list)  # Diacritized text with page numbers
+
+
+def build_corpus(work_dir: Path, abx_path: Optional[Path] = None) -> Corpus:
+    """
+    Build the corpus in work_dir.
+
+    Args:
+        work_dir: Directory for generated files
+        abx_path: ABX book to use (default: 17789.abx at the repository root)
+    """
+    abx_path = Path(abx_path or DEFAULT_ABX_PATH)
+    if not abx_path.exists():
+        raise FileNotFoundError(f"Benchmark corpus file not found: {abx_path}")
+
+    work_dir.mkdir(parents=True, exist_ok=True)
+    corpus = Corpus(
+        abx_path=abx_path,
+        pdf_path=work_dir / "synthetic.pdf",
+        ocr_pdf_path=work_dir / "synthetic_ocr.pdf"
+    )
+    _write_pdf(corpus.pdf_path)
+    _write_pdf(corpus.ocr_pdf_path, pages=OCR_PAGES)
+
+    extracted = asyncio.run(ABXExtractor().extract(str(abx_path)))
+    corpus.abx_text = extracted.text
+    corpus.abx_pages = [p.model_dump() for p in extracted.pages]
+
+    corpus.toc_text = _toc_text(TOC_ENTRIES)
+    corpus.arabic_pages = [f"{i + 1}\n{_PARAGRAPH * 30}\n\n\n- {i + 1} -\n" for i in range(ARABIC_PAGES)]
+    corpus.toc_items = [
+        {"title": f"{_LEVEL_WORDS[1]} {i + 1}", "page_number": page, "level": 1 if i % 3 == 0 else 2}
+        for i, page in enumerate(range(1, extracted.total_pages + 1, CHAPTER_EVERY))
+    ]
+    return corpus
+
+
+def _write_pdf(path: Path, pages: int = PDF_PAGES):
+    """Deterministic text PDF with an outline (Latin text: the base-14 fonts have no Arabic glyphs)."""
+    doc = fitz.open()
+    toc = []
+    for page_num in range(pages):
+        page = doc.new_page()
+        if page_num % CHAPTER_EVERY == 0:
+            toc.append([1, f"Chapter {page_num // CHAPTER_EVERY + 1}", page_num + 1])
+        for line in range(PDF_LINES_PER_PAGE):
+            page.insert_text(
+                (50, 40 + line * 18),
+                f"Page {page_num + 1}, line {line + 1}: the quick brown fox jumps over the lazy dog",
+                fontsize=10
+            )
+    doc.set_toc(toc)
+    doc.save(str(path))
+    doc.close()
+
+
+def _toc_text(entries: int) -> str:
+    """Arabic table of contents in the dotted-leader layout the patterns target."""
+    lines = ["فهرس المحتويات"]
+    for i in range(entries):
+        word = _LEVEL_WORDS[i % len(_LEVEL_WORDS)]
+        ordinal = _ORDINALS[i % len(_ORDINALS)]
+        lines.append(f"{word} {ordinal} في أحكام المسألة رقم {i + 1} ........ {i * 3 + 1}")
+    return "\n".join(lines)
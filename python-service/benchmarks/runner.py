@@ -0,0 +1,156 @@
+"""
+Benchmark Runner
+Times benchmarks, measures their peak memory, and compares the results
+with a stored JSON baseline.
+"""
+
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "baseline.json"
+DEFAULT_THRESHOLD = 0.25  # Allowed slowdown / memory growth before a stage counts as regressed
+MEMORY_NOISE_BYTES = 512 * 1024  # Peak memory changes below this are ignored
+
+
+@dataclass
+class Benchmark:
+    """One stage benchmark. run() returns the number of pages it processed (0 if not page-based)."""
+    name: str
+    run: Callable[[], Awaitable[int]]
+    setup: Optional[Callable[[], None]] = None  # Untimed, before every round
+
+
+def measure(
+    benchmark: Benchmark,
+    loop: asyncio.AbstractEventLoop,
+    min_time: float = 1.0,
+    min_rounds: int = 3,
+    max_rounds: int = 1000
+) -> Dict[str, Any]:
+    """
+    Time a benchmark until it ran for min_time seconds (and min_rounds rounds).
+
+    Peak memory comes from one extra round under tracemalloc, which would
+    otherwise slow down the timed rounds.
+    """
+    def run_round() -> int:
+        if benchmark.setup is not None:
+            benchmark.setup()
+        return loop.run_until_complete(benchmark.run())
+
+    run_round()  # Warm up imports and caches
+
+    times: List[float] = []
+    pages = 0
+    while (sum(times) < min_time or len(times) < min_rounds) and len(times) < max_rounds:
+        if benchmark.setup is not None:
+            benchmark.setup()
+        start = time.perf_counter()
+        pages = loop.run_until_complete(benchmark.run())
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run_round()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(times)
+    return {
+        "rounds": len(times),
+        "median_seconds": round(median, 6),
+        "ops_per_sec": round(1 / median, 3) if median > 0 else None,
+        "pages_per_sec": round(pages / median, 1) if pages and median > 0 else None,
+        "peak_memory_bytes": peak,
+    }
+
+
+def run_benchmarks(
+    benchmarks: List[Benchmark],
+    min_time: float = 1.0,
+    on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Measure each benchmark on a shared event loop."""
+    results = {}
+    loop = asyncio.new_event_loop()
+    try:
+        for benchmark in benchmarks:
+            results[benchmark.name] = measure(benchmark, loop, min_time=min_time)
+            if on_result is not None:
+                on_result(benchmark.name, results[benchmark.name])
+    finally:
+        loop.close()
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD
+) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    Returns:
+        One message per regression: throughput below (1 - threshold) of the
+        baseline, or peak memory above (1 + threshold) of it
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+
+        if base.get("ops_per_sec") and result.get("ops_per_sec") is not None:
+            if result["ops_per_sec"] < base["ops_per_sec"] * (1 - threshold):
+                regressions.append(
+                    f"{name}: {result['ops_per_sec']:.3f} ops/s vs baseline {base['ops_per_sec']:.3f} "
+                    f"({_change(result['ops_per_sec'], base['ops_per_sec'])})"
+                )
+
+        base_peak = base.get("peak_memory_bytes")
+        peak = result.get("peak_memory_bytes")
+        if base_peak and peak is not None:
+            if peak > base_peak * (1 + threshold) and peak - base_peak > MEMORY_NOISE_BYTES:
+                regressions.append(
+                    f"{name}: peak memory {peak / 1e6:.1f} MB vs baseline {base_peak / 1e6:.1f} MB "
+                    f"({_change(peak, base_peak)})"
+                )
+    return regressions
+
+
+def _change(value: float, base: float) -> str:
+    return f"{(value - base) / base * 100:+.0f}%"
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, Any]]:
+    """Read a baseline file, or None if it does not exist."""
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path: Path, results: Dict[str, Dict[str, Any]], merge: bool = True):
+    """Write results as the new baseline (keeping stages that were not run)."""
+    path = Path(path)
+    previous = (load_baseline(path) or {}).get("results", {}) if merge else {}
+
+    baseline = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": {**previous, **results},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
@@ -0,0 +1,106 @@
+"""
+Stage Benchmarks
+One benchmark per pipeline stage, run over the fixed corpus. External
+engines are stubbed (OCR engine, AI provider) so the numbers measure this
+service's own code.
+"""
+
+from typing import List
+
+from models import AiTocParseResult
+from services.text_extractor import PDFExtractor, OCRProcessor, clear_sessions
+from services.text_extractor.abx_extractor import ABXExtractor
+from services.toc_detector import ArabicTOCPatterns, TocDetector
+from services.content_splitter import ContentSplitter
+from services.normalization import STORAGE, MATCHING, DISPLAY, normalize_many
+from .corpus import Corpus
+from .runner import Benchmark
+
+
+# A clean page's worth of text, so the draft resolution is kept
+_STUB_OCR_TEXT = " ".join(["نص تجريبي"] * 40)
+
+
+async def _stub_ocr(image) -> tuple:
+    """OCR engine stand-in: rendering and preprocessing are still measured."""
+    return _STUB_OCR_TEXT, 0.9
+
+
+async def _stub_ocr_batch(images) -> list:
+    """Batched OCR engine stand-in."""
+    return [(_STUB_OCR_TEXT, 0.9) for _ in images]
+
+
+async def _stub_ai_parse(text, pages=None) -> AiTocParseResult:
+    """AI provider stand-in that finds nothing, so every other strategy runs too."""
+    return AiTocParseResult(toc_items=[], confidence=0.0, provider="local")
+
+
+def build_benchmarks(corpus: Corpus) -> List[Benchmark]:
+    """Benchmarks in pipeline order."""
+    pdf_extractor = PDFExtractor()
+    abx_extractor = ABXExtractor()
+
+    # In-process and uncached: every round renders every page
+    ocr_processor = OCRProcessor(provider="tesseract", workers=0)
+    ocr_processor._run_ocr = _stub_ocr
+    ocr_processor._run_ocr_batch = _stub_ocr_batch
+    ocr_processor.cache = None
+
+    patterns = ArabicTOCPatterns()
+
+    toc_detector = TocDetector(ai_provider="local")
+    toc_detector.ai_parser.parse = _stub_ai_parse
+
+    splitter = ContentSplitter()
+
+    async def pdf_extract() -> int:
+        extracted, _ = await pdf_extractor.extract(str(corpus.pdf_path))
+        return extracted.total_pages
+
+    async def abx_extract() -> int:
+        extracted = await abx_extractor.extract(str(corpus.abx_path))
+        return extracted.total_pages
+
+    async def ocr_pages() -> int:
+        pages = await ocr_processor.process_pdf(str(corpus.ocr_pdf_path))
+        return len(pages)
+
+    async def parse_toc() -> int:
+        patterns.parse_toc(corpus.toc_text)
+        return 0
+
+    async def detect_toc() -> int:
+        await toc_detector.detect(corpus.abx_text, pages=corpus.abx_pages)
+        return len(corpus.abx_pages)
+
+    async def split_content() -> int:
+        await splitter.split(corpus.abx_pages, corpus.toc_items)
+        return len(corpus.abx_pages)
+
+    toc_titles = corpus.toc_text.splitlines()
+
+    async def normalize_storage() -> int:
+        normalize_many(corpus.arabic_pages, STORAGE)
+        return len(corpus.arabic_pages)
+
+    async def normalize_matching() -> int:
+        normalize_many(toc_titles, MATCHING)
+        return 0
+
+    async def normalize_display() -> int:
+        normalize_many(corpus.arabic_pages, DISPLAY)
+        return len(corpus.arabic_pages)
+
+    return [
+        # Documents are re-opened every round instead of served from the session cache
+        Benchmark("pdf_extractor", pdf_extract, setup=clear_sessions),
+        Benchmark("abx_extractor", abx_extract),
+        Benchmark("ocr_processor", ocr_pages, setup=clear_sessions),
+        Benchmark("toc_patterns", parse_toc),
+        Benchmark("toc_detector", detect_toc),
+        Benchmark("content_splitter", split_content),
+        Benchmark("normalize_storage", normalize_storage),
+        Benchmark("normalize_matching", normalize_matching),
+        Benchmark("normalize_display", normalize_display),
+    ]
@@ -67,20 +67,115 @@ class Settings(BaseSettings):
     EASYOCR_LANGUAGES: list = ["ar", "en"]
     EASYOCR_GPU: bool = False  # Set to True if GPU available
 
+    # OCR worker pool: OCR runs on worker processes that load their engine
+    # once (a pool per job worker process, limited to the job worker's share
+    # of the CPUs)
+    OCR_WORKERS: int = 2  # 0 or 1 = OCR in the job process
+    OCR_WORKER_MAX_RESTARTS: int = 3  # Pool restarts per document after a worker dies
+    # Start this provider's OCR workers when a job worker starts, e.g.
+    # "easyocr" on a server that mostly OCRs scans. None (the default) starts
+    # them on the first OCR request: every job worker that preloads keeps
+    # OCR_WORKERS engine processes (EasyOCR: several hundred MB each) alive,
+    # even when it only ever handles text PDFs
+    OCR_PRELOAD_PROVIDER: Optional[str] = None
+
+    # OCR page cache (text and confidence per page, keyed by file hash,
+    # page, provider, DPI and preprocessing version)
+    OCR_CACHE_ENABLED: bool = True
+    OCR_CACHE_DIR: Path = Path(__file__).parent.parent / "temp" / "ocr_cache"
+    OCR_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # 512MB, least recently used evicted first (approximate, see OCRCache)
+    OCR_CACHE_SCAN_INTERVAL: float = 300.0  # Seconds between recounts of the cache size on disk
+
     # ============================================
     # PROCESSING SETTINGS
     # ============================================
     MAX_FILE_SIZE: int = 100 * 1024 * 1024  # 100MB
-    ALLOWED_EXTENSIONS: list = [".pdf", ".docx"]
+    ALLOWED_EXTENSIONS: list = [".pdf", ".docx", ".abx"]
 
     # OCR confidence threshold (0-1)
     OCR_CONFIDENCE_THRESHOLD: float = 0.5
 
+    # Adaptive OCR resolution: pages are OCRed at OCR_DRAFT_DPI first and
+    # re-rendered at OCR_DPI when the draft's confidence is below
+    # OCR_CONFIDENCE_THRESHOLD or it has too little text
+    OCR_DPI: int = 300
+    OCR_DRAFT_DPI: int = 200  # 0 = always render at OCR_DPI
+    OCR_DRAFT_MIN_TEXT_LENGTH: int = 50  # Characters a draft needs to be kept
+
+    # Pages passed to one Tesseract run (other engines OCR page by page)
+    OCR_TESSERACT_BATCH_PAGES: int = 8
+
     # Text extraction settings
-    MIN_TEXT_LENGTH_FOR_OCR: int = 100  # Minimum characters to consider PDF as text-based
+    MIN_TEXT_LENGTH_FOR_OCR: int = 100  # Minimum characters per page to consider it text-based
+
+    # Per-page OCR of PDFs: only pages without a usable text layer are OCRed
+    OCR_MIN_IMAGE_COVERAGE: float = 0.3  # Share of a short page covered by images before it is OCRed
+    OCR_MAX_BAD_GLYPH_RATIO: float = 0.3  # Share of unmapped glyphs above which the text layer is unusable
+    OCR_SCAN_PROBE_PAGES: int = 10  # First pages classified up front; when most need OCR, the whole PDF is OCRed
+    DOCUMENT_SESSION_CACHE_SIZE: int = 4  # Open documents kept per process for back-to-back requests
+
+    # Parallel PDF text extraction: page ranges are extracted and cleaned in
+    # worker processes (a pool per job worker process, created on first use)
+    PDF_EXTRACTION_WORKERS: int = 4  # 0 or 1 = always serial; limited to the job worker's share of the CPUs
+    PDF_PARALLEL_MIN_PAGES: int = 200  # PDFs with fewer pages are extracted serially
+    PDF_PARALLEL_CHUNK_PAGES: int = 50  # Pages per worker task
+    PDF_FALLBACK_PAGE_TIMEOUT: float = 30.0  # Seconds pdfplumber gets per page PyMuPDF failed on
 
     # TOC detection settings
     TOC_MAX_PAGES_TO_SCAN: int = 20  # First N pages to scan for TOC
+    TOC_CONFIDENCE_THRESHOLD: float = 0.7  # Stop detection at the first preferred result this confident
+    TOC_AI_TIMEOUT: float = 120.0  # Seconds to wait for the AI provider
+    # Start the AI alongside pattern matching instead of after it: faster when
+    # the patterns fail, but every document then sends a (paid) AI request
+    TOC_AI_SPECULATIVE: bool = False
+
+    # Profiling mode (ProcessingOptions.profile)
+    PROFILE_TOP_FUNCTIONS: int = 25  # Functions listed per stage in the job's profile report
+
+    # Result cache (finished pipeline results keyed by file hash + options)
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_DIR: Path = Path(__file__).parent.parent / "temp" / "result_cache"
+    RESULT_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024  # 2GB, least recently used evicted first
+
+    # ============================================
+    # JOB STORE
+    # ============================================
+    # Backend for processing job state: memory, sqlite
+    # "memory" is per-process; use "sqlite" when running several uvicorn workers
+    JOB_STORE_BACKEND: str = "sqlite"
+    JOB_STORE_PATH: Path = Path(__file__).parent.parent / "temp" / "jobs.db"
+
+    # Results at least this large (serialized JSON) are gzipped to disk and loaded on request
+    JOB_RESULT_SPILL_BYTES: int = 64 * 1024
+    JOB_RESULT_DIR: Path = Path(__file__).parent.parent / "temp" / "job_results"
+
+    # Retention of finished jobs (COMPLETED, FAILED, CANCELLED)
+    JOB_RETENTION_SECONDS: int = 24 * 60 * 60  # Deleted this long after their last update
+    JOB_RETENTION_MAX_BYTES: int = 1024 * 1024 * 1024  # 1GB of results; oldest jobs evicted first
+    JOB_EVICTION_INTERVAL: float = 60.0  # Seconds between eviction passes
+
+    # ============================================
+    # JOB EXECUTION
+    # ============================================
+    # Parallel /process jobs per service instance (process pool size)
+    JOB_WORKERS: int = 2
+    # Jobs waiting for a free worker before /process answers 429
+    JOB_QUEUE_SIZE: int = 20
+    # Extra workers reserved for /extract-text, /detect-toc and /split-content,
+    # which also run ahead of queued /process jobs
+    INTERACTIVE_WORKERS: int = 1
+    INTERACTIVE_QUEUE_SIZE: int = 50
+
+    # Seconds between cancellation checks against the job store
+    CANCEL_CHECK_INTERVAL: float = 0.5
+
+    # Batch ingestion (POST /batch, batch_ingest.py)
+    BATCH_PARALLELISM: int = 2  # Files processed at the same time per batch
+    BATCH_OUTPUT_DIR: Path = Path(__file__).parent.parent / "temp" / "batches"
+
+    # Progress stream (/status/{upload_id}/events)
+    STATUS_STREAM_INTERVAL: float = 0.5  # Seconds between job store checks
+    STATUS_STREAM_HEARTBEAT: float = 15.0  # Seconds between keep-alive comments
 
     # ============================================
     # NEXT.JS SERVICE
@@ -3,10 +3,12 @@ Document Processing Service - FastAPI Application
 Converts PDF/DOCX books to structured content with AI-powered TOC detection.
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
 from contextlib import asynccontextmanager
+import asyncio
+import hashlib
 import logging
 from typing import Optional
 import json
@@ -15,15 +17,33 @@ from config import settings
 from models import (
     ProcessingOptions,
     ProcessRequest,
+    BatchRequest,
     ExtractTextRequest,
     DetectTocRequest,
     SplitContentRequest,
     DocumentUploadResponse,
+    FileUploadResponse,
     ProcessingStatusResponse,
     ProcessingStatus,
     ProcessingStep,
     StepStatus,
 )
+from services.jobs import (
+    get_job_store,
+    JobExecutor,
+    QueueFullError,
+    TERMINAL_STATUSES,
+    stream_job_events,
+    status_fields,
+    BatchRunner,
+    collect_batch_files,
+    read_batch_summary,
+    extract_text_task,
+    detect_toc_task,
+    split_content_task,
+)
+from services.uploads import StreamingUploadWriter, UploadError, UploadTooLargeError
+from services import metrics
 
 # Configure logging
 logging.basicConfig(
@@ -32,8 +52,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# In-memory storage for processing status (in production, use Redis or database)
-processing_status: dict = {}
+# Processing job state (in-memory or SQLite, see JOB_STORE_BACKEND)
+job_store = get_job_store()
+
+# Bounded worker pool for /process jobs (see JOB_WORKERS, JOB_QUEUE_SIZE)
+job_executor = JobExecutor(job_store)
+
+# Running batches (keeps references so the tasks are not garbage collected)
+batch_tasks: dict = {}
+
+
+async def evict_finished_jobs():
+    """Periodically drop finished jobs past their TTL or the retention budget."""
+    while True:
+        await asyncio.sleep(settings.JOB_EVICTION_INTERVAL)
+        try:
+            await asyncio.to_thread(job_store.evict_finished)
+        except Exception as e:
+            logger.error(f"Job eviction failed: {e}")
 
 
 @asynccontextmanager
@@ -43,9 +79,14 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     logger.info(f"Upload directory: {settings.UPLOAD_DIR}")
     logger.info(f"Default AI provider: {settings.DEFAULT_AI_PROVIDER}")
+    logger.info(f"Job store backend: {settings.JOB_STORE_BACKEND}")
+    await job_executor.start()
+    eviction_task = asyncio.create_task(evict_finished_jobs())
     yield
     # Shutdown
     logger.info("Shutting down...")
+    eviction_task.cancel()
+    await job_executor.shutdown()
 
 
 # Create FastAPI application
@@ -89,8 +130,16 @@ async def root():
         "docs": "/docs",
         "endpoints": {
             "health": "/health",
+            "upload": "POST /upload",
             "process": "POST /process",
-            "status": "GET /status/{upload_id}",
+            "status": "GET /status/{upload_id}?since={log_cursor}",
+            "status_events": "GET /status/{upload_id}/events",
+            "cancel": "POST /status/{upload_id}/cancel",
+            "result": "GET /result/{upload_id}",
+            "profile": "GET /status/{upload_id}/profile",
+            "batch": "POST /batch",
+            "batch_status": "GET /batch/{batch_id}",
+            "metrics": "GET /metrics",
             "extract_text": "POST /extract-text",
             "detect_toc": "POST /detect-toc",
             "split_content": "POST /split-content",
@@ -103,20 +152,85 @@ async def root():
 # ============================================
 
 @app.post("/process", response_model=DocumentUploadResponse)
-async def process_document(
-    request: ProcessRequest,
-    background_tasks: BackgroundTasks
-):
+async def process_document(request: ProcessRequest):
     """
     Start processing a document.
-    This runs in the background and updates status as it progresses.
+    The job is queued for the worker pool and updates status as it progresses.
+    Returns 429 when the queue is full.
+    """
+    try:
+        position = await _start_processing(request.upload_id, request.file_path, request.options)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+    return DocumentUploadResponse(
+        upload_id=request.upload_id,
+        status=ProcessingStatus.PENDING,
+        message="Processing started" if position == 0 else f"Queued ({position} jobs ahead)"
+    )
+
+
+@app.post("/upload", response_model=FileUploadResponse)
+async def upload_document(request: Request):
+    """
+    Upload a document as multipart/form-data.
+
+    The 'file' part is streamed to UPLOAD_DIR in chunks while it is hashed
+    and checked against MAX_FILE_SIZE, so it is never held in memory.
+    Optional fields: upload_id, process ("true" to start processing right
+    away) and the ProcessingOptions fields (use_ocr, ai_provider, ...).
     """
-    from services.document_processor import DocumentProcessor
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.MAX_FILE_SIZE + 64 * 1024:
+        raise HTTPException(status_code=413, detail="File too large")
 
-    upload_id = request.upload_id
+    try:
+        writer = StreamingUploadWriter(request.headers.get("content-type", ""))
+        stored = await writer.consume(request.stream())
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response = FileUploadResponse(
+        upload_id=stored.upload_id,
+        file_path=stored.file_path,
+        file_name=stored.file_name,
+        file_size=stored.file_size,
+        file_hash=stored.file_hash,
+    )
 
+    if stored.fields.get("process", "").lower() in ("1", "true", "yes"):
+        try:
+            options = ProcessingOptions(**{
+                key: value for key, value in stored.fields.items()
+                if key in ProcessingOptions.model_fields
+            })
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+        try:
+            await _start_processing(stored.upload_id, stored.file_path, options, stored.file_hash)
+            response.status = ProcessingStatus.PENDING
+            response.message = "Upload successful, processing started"
+        except QueueFullError:
+            response.message = "Upload successful, processing queue is full; retry with POST /process"
+
+    return response
+
+
+async def _start_processing(
+    upload_id: str,
+    file_path: str,
+    options: ProcessingOptions,
+    file_hash: Optional[str] = None
+) -> int:
+    """
+    Create the job and queue it for the worker pool.
+    Returns the number of jobs ahead; raises QueueFullError if the queue is full.
+    """
     # Initialize status
-    processing_status[upload_id] = {
+    job_store.create(upload_id, {
         "status": ProcessingStatus.PENDING,
         "progress": 0,
         "current_step": None,
@@ -125,56 +239,209 @@ async def process_document(
         "detected_author": None,
         "page_count": None,
         "error_message": None,
+    })
+
+    # Queue for the worker pool
+    try:
+        return await job_executor.submit(upload_id, file_path, options, file_hash)
+    except QueueFullError:
+        job_store.delete(upload_id)
+        raise
+
+
+@app.post("/batch")
+async def start_batch(request: BatchRequest):
+    """
+    Process many files at once.
+    Paths may be files, directories (filtered by pattern) or glob patterns.
+    Progress is available from GET /batch/{batch_id}.
+    """
+    files = collect_batch_files(request.paths, request.pattern, request.recursive)
+    if not files:
+        raise HTTPException(status_code=400, detail="No supported files found")
+
+    runner = BatchRunner(job_store, job_executor, files, request.options, request.parallelism)
+    runner.prepare()
+    task = asyncio.create_task(runner.run())
+    batch_tasks[runner.batch_id] = task
+    task.add_done_callback(lambda _: batch_tasks.pop(runner.batch_id, None))
+
+    return {
+        "batch_id": runner.batch_id,
+        "total_files": len(files),
+        "parallelism": runner.parallelism,
+        "output_dir": str(runner.output_dir),
     }
 
-    # Start background processing
-    processor = DocumentProcessor()
-    background_tasks.add_task(
-        processor.process,
-        upload_id,
-        request.file_path,
-        request.options,
-        processing_status
-    )
 
-    return DocumentUploadResponse(
-        upload_id=upload_id,
-        status=ProcessingStatus.PENDING,
-        message="Processing started"
-    )
+@app.get("/batch/{batch_id}")
+async def get_batch_status(batch_id: str):
+    """Get aggregate progress of a batch: throughput, failures and ETA."""
+    summary = read_batch_summary(batch_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return summary
 
 
 @app.get("/status/{upload_id}", response_model=ProcessingStatusResponse)
-async def get_processing_status(upload_id: str):
-    """Get the current processing status for a document."""
-    if upload_id not in processing_status:
+async def get_processing_status(
+    upload_id: str,
+    request: Request,
+    response: Response,
+    since: int = 0
+):
+    """
+    Get the current processing status for a document.
+
+    Pass the previous response's log_cursor as ?since= to receive only newer
+    log entries, and its ETag as If-None-Match to get 304 when nothing changed.
+    """
+    summary = job_store.get_summary(upload_id)
+    if summary is None:
         raise HTTPException(status_code=404, detail="Upload not found")
 
-    status_data = processing_status[upload_id]
+    fields = status_fields(summary)
+    etag = _status_etag(fields, summary['log_count'], since)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
     return ProcessingStatusResponse(
         upload_id=upload_id,
-        **status_data
+        logs=job_store.get_logs(upload_id, since),
+        log_cursor=summary['log_count'],
+        **fields
+    )
+
+
+@app.get("/status/{upload_id}/events")
+async def stream_processing_status(upload_id: str, request: Request, since: int = 0):
+    """
+    Stream processing progress as Server-Sent Events.
+    Sends 'status' events on progress changes, one 'log' event per new log
+    entry, and a final 'end' event. Reconnecting clients resume from
+    Last-Event-ID (or ?since=).
+    """
+    if job_store.get_summary(upload_id) is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+
+    last_event_id = request.headers.get("last-event-id")
+    cursor = int(last_event_id) if last_event_id and last_event_id.isdigit() else since
+
+    return StreamingResponse(
+        stream_job_events(job_store, upload_id, cursor),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 
+@app.get("/result/{upload_id}")
+async def get_processing_result(upload_id: str, request: Request):
+    """
+    Get the result of a completed job (extracted text, TOC and chapters).
+    Results spilled to disk are sent as-is with Content-Encoding: gzip when
+    the client accepts it.
+    """
+    summary = job_store.get_summary(upload_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if summary.get('status') != ProcessingStatus.COMPLETED.value:
+        raise HTTPException(status_code=409, detail=f"Result not available ({summary.get('status')})")
+
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        path = job_store.result_path(upload_id)
+        if path is not None:
+            return FileResponse(
+                path,
+                media_type="application/json",
+                headers={"Content-Encoding": "gzip"}
+            )
+
+    result = await asyncio.to_thread(job_store.get_result, upload_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Result not found")
+    return JSONResponse(result)
+
+
+@app.get("/status/{upload_id}/profile")
+async def get_processing_profile(upload_id: str):
+    """
+    Get the per-stage profile of a job processed with options.profile:
+    duration, peak traced memory and top functions of each stage.
+    """
+    summary = job_store.get_summary(upload_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if not summary.get('profile'):
+        raise HTTPException(status_code=404, detail="No profile recorded for this job")
+
+    return {"upload_id": upload_id, "stages": summary['profile']}
+
+
+@app.get("/status/{upload_id}/profile/{file_name}")
+async def download_processing_profile(upload_id: str, file_name: str):
+    """
+    Download a stage profile listed in GET /status/{upload_id}/profile:
+    *.pstats (python -m pstats, snakeviz) or *.collapsed (flamegraph.pl, speedscope).
+    """
+    summary = job_store.get_summary(upload_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+
+    files = {
+        stage[key] for stage in summary.get('profile') or []
+        for key in ('pstats_file', 'collapsed_file')
+    }
+    path = job_store.artifact_dir(upload_id) / file_name
+    if file_name not in files or not path.is_file():
+        raise HTTPException(status_code=404, detail="Profile file not found")
+
+    media_type = "text/plain" if file_name.endswith(".collapsed") else "application/octet-stream"
+    return FileResponse(path, media_type=media_type, filename=file_name)
+
+
+@app.post("/status/{upload_id}/cancel", status_code=202)
+async def cancel_processing(upload_id: str):
+    """
+    Request cancellation of a queued or running job.
+    Queued jobs are dropped before they start; running jobs stop at the next
+    page or stage boundary and end with status CANCELLED.
+    """
+    summary = job_store.get_summary(upload_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if summary.get('status') in TERMINAL_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Job already finished ({summary['status']})")
+
+    job_store.update(upload_id, cancel_requested=True)
+    return {"upload_id": upload_id, "message": "Cancellation requested"}
+
+
+def _status_etag(fields: dict, log_count: int, since: int) -> str:
+    """Build a weak ETag for a status response."""
+    digest = hashlib.md5(
+        json.dumps([fields, log_count, since], sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
 @app.post("/extract-text")
 async def extract_text(request: ExtractTextRequest):
     """
     Extract text from a PDF or DOCX file.
     Returns the extracted text and metadata.
     """
-    from services.text_extractor import TextExtractor
-
     try:
-        extractor = TextExtractor()
-        result = await extractor.extract(
+        return await job_executor.call(
+            extract_text_task,
             request.file_path,
-            use_ocr=request.use_ocr,
-            ocr_provider=request.ocr_provider
+            request.use_ocr,
+            request.ocr_provider
         )
-        return result.model_dump()
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found")
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
         logger.error(f"Text extraction error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -186,12 +453,10 @@ async def detect_toc(request: DetectTocRequest):
     Detect table of contents from text.
     Uses pattern matching and AI for best results.
     """
-    from services.toc_detector import TocDetector
-
     try:
-        detector = TocDetector(ai_provider=request.ai_provider)
-        result = await detector.detect(request.text, request.pages)
-        return result.model_dump()
+        return await job_executor.call(detect_toc_task, request.text, request.pages, request.ai_provider)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
         logger.error(f"TOC detection error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -203,12 +468,11 @@ async def split_content(request: SplitContentRequest):
     Split document content based on detected TOC.
     Returns structured chapters and sections.
     """
-    from services.content_splitter import ContentSplitter
-
     try:
-        splitter = ContentSplitter()
-        result = await splitter.split(request.pages, request.toc_items)
-        return {"chapters": [ch.model_dump() for ch in result]}
+        chapters = await job_executor.call(split_content_task, request.pages, request.toc_items)
+        return {"chapters": chapters}
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
         logger.error(f"Content splitting error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -282,8 +546,7 @@ async def test_ai_provider(provider: str):
 @app.delete("/status/{upload_id}")
 async def clear_status(upload_id: str):
     """Clear processing status for an upload."""
-    if upload_id in processing_status:
-        del processing_status[upload_id]
+    if job_store.delete(upload_id):
         return {"message": "Status cleared"}
     raise HTTPException(status_code=404, detail="Upload not found")
 
@@ -291,17 +554,36 @@ async def clear_status(upload_id: str):
 @app.get("/stats")
 async def get_stats():
     """Get service statistics."""
+    counts = job_store.count_by_status()
     return {
-        "active_processes": len([s for s in processing_status.values()
-                                 if s["status"] not in [ProcessingStatus.COMPLETED, ProcessingStatus.FAILED]]),
-        "completed": len([s for s in processing_status.values()
-                          if s["status"] == ProcessingStatus.COMPLETED]),
-        "failed": len([s for s in processing_status.values()
-                       if s["status"] == ProcessingStatus.FAILED]),
-        "total": len(processing_status)
+        "active_processes": sum(n for status, n in counts.items() if status not in TERMINAL_STATUSES),
+        "completed": counts.get(ProcessingStatus.COMPLETED.value, 0),
+        "failed": counts.get(ProcessingStatus.FAILED.value, 0),
+        "cancelled": counts.get(ProcessingStatus.CANCELLED.value, 0),
+        "total": sum(counts.values()),
+        "queue": job_executor.stats(),
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Service metrics in the Prometheus text exposition format."""
+    queue = job_executor.stats()
+    metrics.QUEUE_DEPTH.set(queue["queued"], priority="bulk")
+    metrics.QUEUE_DEPTH.set(queue["interactive_queued"], priority="interactive")
+    metrics.RUNNING_JOBS.set(queue["running"], priority="bulk")
+    metrics.RUNNING_JOBS.set(queue["interactive_running"], priority="interactive")
+
+    metrics.JOBS_BY_STATUS.clear()
+    for status, count in job_store.count_by_status().items():
+        metrics.JOBS_BY_STATUS.set(count, status=status)
+
+    return PlainTextResponse(
+        metrics.registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 # ============================================
 # ERROR HANDLERS
 # ============================================
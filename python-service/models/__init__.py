@@ -1,3 +1,4 @@
+from .page_store import PageStore, PageView, PageDicts
 from .schemas import (
     DocumentType,
     ProcessingStatus,
@@ -5,15 +6,21 @@ from .schemas import (
     StepStatus,
     ProcessingOptions,
     ProcessRequest,
+    BatchRequest,
     ExtractTextRequest,
     DetectTocRequest,
     SplitContentRequest,
     DocumentUploadResponse,
+    FileUploadResponse,
     ProcessingStatusResponse,
     ProcessingLog,
     TocItem,
     ExtractedText,
     PageContent,
+    SectionContent,
+    ChapterContent,
+    BookStructure,
+    AiTocParseResult,
 )
 
 __all__ = [
@@ -23,13 +30,22 @@ __all__ = [
     "StepStatus",
     "ProcessingOptions",
     "ProcessRequest",
+    "BatchRequest",
     "ExtractTextRequest",
     "DetectTocRequest",
     "SplitContentRequest",
     "DocumentUploadResponse",
+    "FileUploadResponse",
     "ProcessingStatusResponse",
     "ProcessingLog",
     "TocItem",
     "ExtractedText",
     "PageContent",
+    "SectionContent",
+    "ChapterContent",
+    "BookStructure",
+    "AiTocParseResult",
+    "PageStore",
+    "PageView",
+    "PageDicts",
 ]
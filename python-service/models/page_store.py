@@ -0,0 +1,242 @@
+"""
+Page Store
+The text of a document held once: one backing string plus the start and
+end offset of every page in it. Pages are handed out as views that slice
+their text out of the buffer when it is read, so a book is no longer kept
+both as a list of page texts and as a joined full text.
+"""
+
+import math
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def _page_fields(page: Any) -> Tuple[int, str, Optional[float], bool, Optional[int]]:
+    """page_number, text, confidence, is_ocr and ocr_dpi of a PageContent or page dict."""
+    if isinstance(page, Mapping):
+        return (
+            page.get("page_number", 0),
+            page.get("text") or "",
+            page.get("confidence"),
+            bool(page.get("is_ocr", False)),
+            page.get("ocr_dpi")
+        )
+    return page.page_number, page.text or "", page.confidence, page.is_ocr, page.ocr_dpi
+
+
+class PageStore(Sequence):
+    """
+    Pages of a document as offsets into one string.
+
+    The store is a sequence of PageContent built on access; nothing but the
+    buffer and a few small arrays is kept between accesses.
+    """
+
+    __slots__ = ("_buffer", "_offsets", "_numbers", "_confidences", "_ocr", "_dpis", "_detached")
+
+    def __init__(self, buffer: str = ""):
+        self._buffer = buffer
+        self._offsets = array("q")      # start, end per page
+        self._numbers = array("l")
+        self._confidences = array("d")  # NaN = no confidence
+        self._ocr = bytearray()
+        self._dpis = array("l")         # 0 = not OCRed
+        self._detached: Dict[int, str] = {}  # Pages that are not a substring of the buffer
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[Any], separator: str = "\n\n") -> "PageStore":
+        """
+        Join pages into a new buffer.
+
+        Args:
+            pages: PageContent objects or page dicts, in order
+            separator: Placed between pages; the buffer is the document's full text
+        """
+        store = cls()
+        parts: List[str] = []
+        position = 0
+
+        for page in pages:
+            number, text, confidence, is_ocr, ocr_dpi = _page_fields(page)
+            if parts:
+                parts.append(separator)
+                position += len(separator)
+            parts.append(text)
+            store._add(number, position, position + len(text), confidence, is_ocr, ocr_dpi)
+            position += len(text)
+
+        store._buffer = "".join(parts)
+        return store
+
+    @classmethod
+    def from_text(cls, text: str, pages: Iterable[Any]) -> "PageStore":
+        """
+        Use an existing full text as the buffer and locate each page in it.
+
+        Extractors whose full text is not a plain join of the pages (e.g.
+        unstripped ABX chapters) still have every page as a substring of it,
+        in order. A page that cannot be found keeps its own copy.
+        """
+        store = cls(text)
+        cursor = 0
+
+        for page in pages:
+            number, page_text, confidence, is_ocr, ocr_dpi = _page_fields(page)
+            start = text.find(page_text, cursor) if page_text else cursor
+            if start < 0:
+                store._detached[len(store)] = page_text
+                store._add(number, -1, -1, confidence, is_ocr, ocr_dpi)
+                continue
+            cursor = start + len(page_text)
+            store._add(number, start, cursor, confidence, is_ocr, ocr_dpi)
+
+        return store
+
+    def _add(
+        self,
+        number: int,
+        start: int,
+        end: int,
+        confidence: Optional[float],
+        is_ocr: bool,
+        ocr_dpi: Optional[int] = None
+    ):
+        self._offsets.append(start)
+        self._offsets.append(end)
+        self._numbers.append(number)
+        self._confidences.append(math.nan if confidence is None else confidence)
+        self._ocr.append(1 if is_ocr else 0)
+        self._dpis.append(ocr_dpi or 0)
+
+    @property
+    def text(self) -> str:
+        """The full text (the buffer itself, not a copy)."""
+        return self._buffer
+
+    def page_text(self, index: int) -> str:
+        """Text of the page at an index, sliced from the buffer."""
+        detached = self._detached.get(index)
+        if detached is not None:
+            return detached
+        return self._buffer[self._offsets[2 * index]:self._offsets[2 * index + 1]]
+
+    def page_number(self, index: int) -> int:
+        return self._numbers[index]
+
+    def confidence(self, index: int) -> Optional[float]:
+        value = self._confidences[index]
+        return None if math.isnan(value) else value
+
+    def is_ocr(self, index: int) -> bool:
+        return bool(self._ocr[index])
+
+    def ocr_dpi(self, index: int) -> Optional[int]:
+        return self._dpis[index] or None
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("page index out of range")
+
+        from .schemas import PageContent
+
+        return PageContent.model_construct(
+            page_number=self._numbers[index],
+            text=self.page_text(index),
+            confidence=self.confidence(index),
+            is_ocr=bool(self._ocr[index]),
+            ocr_dpi=self.ocr_dpi(index)
+        )
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def dicts(self) -> "PageDicts":
+        """The pages as dicts (the shape the TOC detector and splitter take), text read lazily."""
+        return PageDicts(self)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PageStore):
+            return NotImplemented
+        return (
+            self._buffer == other._buffer
+            and self._numbers == other._numbers
+            and self._ocr == other._ocr
+            and self._dpis == other._dpis
+            and all(
+                self.page_text(i) == other.page_text(i) and self.confidence(i) == other.confidence(i)
+                for i in range(len(self))
+            )
+        )
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"PageStore(pages={len(self)}, chars={len(self._buffer)})"
+
+    def __getstate__(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+
+class PageView(Mapping):
+    """One page of a PageStore as a read-only dict; "text" is sliced when read."""
+
+    __slots__ = ("_store", "_index")
+
+    _KEYS = ("page_number", "text", "confidence", "is_ocr", "ocr_dpi")
+
+    def __init__(self, store: PageStore, index: int):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "page_number":
+            return self._store.page_number(self._index)
+        if key == "text":
+            return self._store.page_text(self._index)
+        if key == "confidence":
+            return self._store.confidence(self._index)
+        if key == "is_ocr":
+            return self._store.is_ocr(self._index)
+        if key == "ocr_dpi":
+            return self._store.ocr_dpi(self._index)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+
+class PageDicts(Sequence):
+    """Sequence of PageView over a PageStore."""
+
+    __slots__ = ("_store",)
+
+    def __init__(self, store: PageStore):
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("page index out of range")
+        return PageView(self._store, index)
@@ -2,11 +2,13 @@
 Pydantic Schemas for Document Processing Service
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, model_serializer, model_validator
+from typing import Optional, List, Dict, Any, Iterable
 from enum import Enum
 from datetime import datetime
 
+from .page_store import PageStore
+
 
 # ============================================
 # ENUMS
@@ -59,6 +61,8 @@ class ProcessingOptions(BaseModel):
     use_ai_parsing: bool = Field(default=True, description="Use AI for TOC parsing")
     ai_provider: str = Field(default="local", description="AI provider: local, claude, openai")
     ocr_provider: str = Field(default="easyocr", description="OCR provider: easyocr, tesseract, google")
+    use_cache: bool = Field(default=True, description="Reuse a cached result for identical file and options")
+    profile: bool = Field(default=False, description="Profile each stage (cProfile, tracemalloc); see GET /status/{upload_id}/profile")
 
 
 class ProcessRequest(BaseModel):
@@ -68,6 +72,15 @@ class ProcessRequest(BaseModel):
     options: ProcessingOptions = Field(default_factory=ProcessingOptions)
 
 
+class BatchRequest(BaseModel):
+    """Request to process many files (paths, directories or glob patterns)."""
+    paths: List[str]
+    pattern: str = Field(default="*", description="File pattern inside directories")
+    recursive: bool = False
+    options: ProcessingOptions = Field(default_factory=ProcessingOptions)
+    parallelism: Optional[int] = Field(default=None, ge=1, description="Files processed at once")
+
+
 class ExtractTextRequest(BaseModel):
     """Request to extract text from a file."""
     file_path: str
@@ -99,6 +112,17 @@ class DocumentUploadResponse(BaseModel):
     message: str = "Upload successful"
 
 
+class FileUploadResponse(BaseModel):
+    """Response after streaming a file to the service with POST /upload."""
+    upload_id: str
+    file_path: str
+    file_name: str
+    file_size: int
+    file_hash: str  # SHA-256
+    status: Optional[ProcessingStatus] = None  # Set when processing was started
+    message: str = "Upload successful"
+
+
 class ProcessingLog(BaseModel):
     """Log entry for processing step."""
     step: ProcessingStep
@@ -119,6 +143,7 @@ class ProcessingStatusResponse(BaseModel):
     detected_author: Optional[str] = None
     page_count: Optional[int] = None
     error_message: Optional[str] = None
+    log_cursor: int = 0  # Total logs so far; pass as ?since= to get only newer entries
 
 
 # ============================================
@@ -131,15 +156,64 @@ class PageContent(BaseModel):
     text: str
     confidence: Optional[float] = None  # OCR confidence
     is_ocr: bool = False
+    ocr_dpi: Optional[int] = None  # Resolution the OCR text was read at
 
 
 class ExtractedText(BaseModel):
-    """Result of text extraction."""
-    text: str
-    pages: List[PageContent]
+    """
+    Result of text extraction.
+
+    The text is held once, in a PageStore: `text` is its buffer and `pages`
+    are PageContent views into it. Constructing from text and pages (or
+    validating a dumped dict) locates the pages inside the text; extractors
+    that build the full text by joining pages use from_pages() instead.
+    Dumps keep the text / pages shape.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    store: PageStore = Field(exclude=True, repr=False)
     total_pages: int
     is_scanned: bool = False
     extraction_method: str  # pymupdf, pdfplumber, ocr
+    fallback_pages: List[int] = []  # Pages whose text came from pdfplumber instead of PyMuPDF
+
+    @model_validator(mode="before")
+    @classmethod
+    def _build_store(cls, data: Any) -> Any:
+        if isinstance(data, dict) and "store" not in data:
+            data = dict(data)
+            data["store"] = PageStore.from_text(data.pop("text", ""), data.pop("pages", []))
+        return data
+
+    @model_serializer(mode="wrap")
+    def _serialize(self, handler) -> Dict[str, Any]:
+        fields = handler(self)
+        pages = [
+            {
+                "page_number": self.store.page_number(i),
+                "text": self.store.page_text(i),
+                "confidence": self.store.confidence(i),
+                "is_ocr": self.store.is_ocr(i),
+                "ocr_dpi": self.store.ocr_dpi(i),
+            }
+            for i in range(len(self.store))
+        ]
+        return {"text": self.store.text, "pages": pages, **fields}
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[Any], separator: str = "\n\n", **fields) -> "ExtractedText":
+        """Build from pages, joining them (with separator) into the full text."""
+        store = PageStore.from_pages(pages, separator)
+        fields.setdefault("total_pages", len(store))
+        return cls(store=store, **fields)
+
+    @property
+    def text(self) -> str:
+        return self.store.text
+
+    @property
+    def pages(self) -> PageStore:
+        return self.store
 
 
 class TocItem(BaseModel):
@@ -8,6 +8,7 @@ from typing import List, Dict, Any, Optional
 import re
 
 from models import TocItem, ChapterContent, SectionContent, PageContent
+from ..normalization import DISPLAY, MATCHING, normalize
 
 logger = logging.getLogger(__name__)
 
@@ -61,34 +62,46 @@ class ContentSplitter:
 
         for i, chapter_item in enumerate(level1_items):
             # Determine page range
-            start_page = chapter_item.page_number
             end_page = (
                 level1_items[i + 1].page_number - 1
                 if i + 1 < len(level1_items)
                 else len(pages)
             )
 
-            # Extract content
-            content = self._extract_pages_content(pages, start_page, end_page)
-
-            # Find sections within this chapter
-            child_items = [
-                t for t in toc_with_pages
-                if t.level > 1 and start_page <= (t.page_number or 0) <= end_page
-            ]
-
-            sections = self._extract_sections(pages, child_items, start_page, end_page)
-
-            chapters.append(ChapterContent(
-                title=chapter_item.title,
-                order=i + 1,
-                sections=sections,
-                content=content if not sections else None
-            ))
+            chapters.append(self._build_chapter(pages, chapter_item, i + 1, end_page, toc_with_pages))
 
         logger.info(f"Created {len(chapters)} chapters")
         return chapters
 
+    def _build_chapter(
+        self,
+        pages: List[Dict[str, Any]],
+        chapter_item: TocItem,
+        order: int,
+        end_page: int,
+        toc_with_pages: List[TocItem]
+    ) -> ChapterContent:
+        """Build one chapter and its sections from the pages in its range."""
+        start_page = chapter_item.page_number
+
+        # Extract content
+        content = self._extract_pages_content(pages, start_page, end_page)
+
+        # Find sections within this chapter
+        child_items = [
+            t for t in toc_with_pages
+            if t.level > 1 and start_page <= (t.page_number or 0) <= end_page
+        ]
+
+        sections = self._extract_sections(pages, child_items, start_page, end_page)
+
+        return ChapterContent(
+            title=chapter_item.title,
+            order=order,
+            sections=sections,
+            content=content if not sections else None
+        )
+
     def _normalize_toc_items(self, items: List[Dict[str, Any]]) -> List[TocItem]:
         """Convert dict items to TocItem objects."""
         result = []
@@ -223,8 +236,8 @@ class ContentSplitter:
             return pos
 
         # Try normalized match
-        normalized_title = self._normalize_for_matching(title)
-        normalized_text = self._normalize_for_matching(text[start:])
+        normalized_title = normalize(title, MATCHING)
+        normalized_text = normalize(text[start:], MATCHING)
 
         pos = normalized_text.find(normalized_title)
         if pos >= 0:
@@ -240,13 +253,6 @@ class ContentSplitter:
 
         return -1
 
-    def _normalize_for_matching(self, text: str) -> str:
-        """Normalize text for matching."""
-        # Remove diacritics and normalize spacing
-        text = re.sub(r'[\u064B-\u065F\u0670]', '', text)  # Arabic diacritics
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
-
     def _find_sections_in_content(
         self,
         content: str,
@@ -287,20 +293,8 @@ class ContentCleaner:
     @staticmethod
     def clean_chapter_content(content: str) -> str:
         """Clean chapter content for display."""
-        if not content:
-            return ""
-
-        # Remove excessive whitespace
-        content = re.sub(r'\n{3,}', '\n\n', content)
-        content = re.sub(r' {2,}', ' ', content)
-
-        # Remove page numbers
-        content = re.sub(r'^\s*\d+\s*$', '', content, flags=re.MULTILINE)
-
-        # Remove headers/footers (common patterns)
-        content = re.sub(r'^\s*-\s*\d+\s*-\s*$', '', content, flags=re.MULTILINE)
-
-        return content.strip()
+        # Excessive whitespace, page numbers and "- 12 -" footers
+        return normalize(content, DISPLAY)
 
     @staticmethod
     def format_for_html(content: str) -> str:
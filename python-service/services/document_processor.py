@@ -5,7 +5,8 @@ Orchestrates the full document processing workflow.
 
 import logging
 import time
-from typing import Dict, Any, Optional
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
 from pathlib import Path
 import hashlib
 
@@ -21,6 +22,10 @@ from config import settings
 from .text_extractor import TextExtractor, PDFExtractor
 from .toc_detector import TocDetector
 from .content_splitter import ContentSplitter
+from .jobs import JobStore, CancellationToken, JobCancelledError
+from .result_cache import ResultCache
+from .profiling import StageProfiler
+from . import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -35,13 +40,15 @@ class DocumentProcessor:
         self.text_extractor = TextExtractor()
         self.pdf_extractor = PDFExtractor()
         self.content_splitter = ContentSplitter()
+        self.result_cache = ResultCache() if settings.RESULT_CACHE_ENABLED else None
 
     async def process(
         self,
         upload_id: str,
         file_path: str,
         options: ProcessingOptions,
-        status_store: Dict[str, Any]
+        status_store: JobStore,
+        file_hash: Optional[str] = None
     ):
         """
         Process a document through the full pipeline.
@@ -50,55 +57,92 @@ class DocumentProcessor:
             upload_id: Unique identifier for this upload
             file_path: Path to the document file
             options: Processing options
-            status_store: Dict to update with progress
+            status_store: Job store to update with progress
+            file_hash: SHA-256 of the file if already known (e.g. from /upload)
         """
         logger.info(f"Starting processing for upload {upload_id}")
+        cancel_token = CancellationToken(status_store, upload_id)
 
         try:
             # Initialize status
             self._update_status(status_store, upload_id, ProcessingStatus.EXTRACTING_TEXT, 10)
 
+            # Reuse a finished result for the same file and options
+            # (not when profiling, which needs the pipeline to actually run)
+            cache_key = None
+            if self.result_cache is not None:
+                cache_key = ResultCache.make_key(file_hash or get_file_hash(file_path), options)
+                if options.use_cache and not options.profile and self._load_cached_result(status_store, upload_id, cache_key):
+                    return
+
+            profiler = StageProfiler(status_store.artifact_dir(upload_id)) if options.profile else None
+
             # Step 1: Get document info
-            doc_info = await self.text_extractor.get_document_info(file_path)
-            status_store[upload_id]['page_count'] = doc_info.get('page_count', 0)
+            with self._profile_stage(profiler, status_store, upload_id, "document_info"):
+                doc_info = await self.text_extractor.get_document_info(file_path)
+                status_store.update(upload_id, page_count=doc_info.get('page_count', 0))
+
+                # Embedded TOC (for PDFs)
+                embedded_toc = None
+                if file_path.lower().endswith('.pdf'):
+                    embedded_toc = await self.pdf_extractor.get_embedded_toc(file_path)
+
+            toc_detector = TocDetector(ai_provider=options.ai_provider if options.use_ai_parsing else "pattern")
 
             # Step 2: Extract text
             self._log_step(status_store, upload_id, ProcessingStep.TEXT_EXTRACTION, StepStatus.IN_PROGRESS)
             start_time = time.time()
 
-            extracted = await self.text_extractor.extract(
-                file_path,
-                use_ocr=options.use_ocr,
-                ocr_provider=options.ocr_provider
-            )
+            with self._profile_stage(profiler, status_store, upload_id, "text_extraction"):
+                stream = self.text_extractor.stream(
+                    file_path,
+                    use_ocr=options.use_ocr,
+                    ocr_provider=options.ocr_provider,
+                    cancel_token=cancel_token
+                )
+                extracted = stream.to_extracted([page async for page in stream])
 
             duration = int((time.time() - start_time) * 1000)
+            method = "ocr" if extracted.is_scanned else "text"
+            metrics.PAGES_EXTRACTED.inc(extracted.total_pages, method=method)
+            metrics.CHARS_EXTRACTED.inc(len(extracted.text), method=method)
+            metrics.EXTRACTION_SECONDS.inc(duration / 1000, method=method)
+
+            message = f"Extracted {len(extracted.text)} characters from {extracted.total_pages} pages"
+            ocr_pages = sum(1 for i in range(len(extracted.pages)) if extracted.pages.is_ocr(i))
+            if ocr_pages and not extracted.is_scanned:
+                message += f" ({ocr_pages} OCRed)"
             self._log_step(
                 status_store, upload_id,
                 ProcessingStep.TEXT_EXTRACTION if not extracted.is_scanned else ProcessingStep.OCR,
                 StepStatus.COMPLETED,
-                f"Extracted {len(extracted.text)} characters from {extracted.total_pages} pages",
+                message,
                 duration
             )
+            if stream.ocr_pages and not extracted.is_scanned:
+                # Hybrid OCR ran inside text extraction; its share gets its own step
+                self._log_step(
+                    status_store, upload_id,
+                    ProcessingStep.OCR,
+                    StepStatus.COMPLETED,
+                    f"OCRed {stream.ocr_pages} pages without a usable text layer",
+                    int(stream.ocr_seconds * 1000)
+                )
 
+            cancel_token.check()
             self._update_status(status_store, upload_id, ProcessingStatus.DETECTING_TOC, 30)
 
-            # Step 3: Get embedded TOC (for PDFs)
-            embedded_toc = None
-            if file_path.lower().endswith('.pdf'):
-                embedded_toc = await self.pdf_extractor.get_embedded_toc(file_path)
-
-            # Step 4: Detect TOC
+            # Step 3: Detect TOC
             self._log_step(status_store, upload_id, ProcessingStep.TOC_DETECTION, StepStatus.IN_PROGRESS)
-            start_time = time.time()
 
-            toc_detector = TocDetector(ai_provider=options.ai_provider if options.use_ai_parsing else "pattern")
+            start_time = time.time()
 
-            toc_result = await toc_detector.detect(
-                extracted.text,
-                pages=[p.model_dump() for p in extracted.pages],
-                embedded_toc=embedded_toc
-            )
+            with self._profile_stage(profiler, status_store, upload_id, "toc_detection"):
+                toc_result = await toc_detector.detect(
+                    extracted.text,
+                    pages=extracted.pages.dicts(),
+                    embedded_toc=embedded_toc
+                )
 
             duration = int((time.time() - start_time) * 1000)
             self._log_step(
@@ -111,40 +155,40 @@ class DocumentProcessor:
 
             # Update detected info
             if toc_result.detected_title:
-                status_store[upload_id]['detected_title'] = toc_result.detected_title
+                status_store.update(upload_id, detected_title=toc_result.detected_title)
             if toc_result.detected_author:
-                status_store[upload_id]['detected_author'] = toc_result.detected_author
+                status_store.update(upload_id, detected_author=toc_result.detected_author)
 
+            cancel_token.check()
             self._update_status(status_store, upload_id, ProcessingStatus.PARSING_STRUCTURE, 50)
 
-            # Step 5: Use AI for complex TOC (if enabled and needed)
-            if options.use_ai_parsing and len(toc_result.toc_items) < 3:
-                self._log_step(status_store, upload_id, ProcessingStep.AI_PARSING, StepStatus.IN_PROGRESS)
-                start_time = time.time()
-
-                # Re-run with AI
-                ai_detector = TocDetector(ai_provider=options.ai_provider)
-                toc_result = await ai_detector.detect(extracted.text)
-
-                duration = int((time.time() - start_time) * 1000)
+            # Step 4: AI parsing already ran inside TOC detection when the
+            # other strategies fell short; it is never repeated here
+            if toc_detector.ai_seconds is not None:
+                if toc_result.provider == options.ai_provider:
+                    message = f"AI found {len(toc_result.toc_items)} entries"
+                else:
+                    message = f"AI result not used, TOC from {toc_result.provider}"
                 self._log_step(
                     status_store, upload_id,
                     ProcessingStep.AI_PARSING,
                     StepStatus.COMPLETED,
-                    f"AI found {len(toc_result.toc_items)} entries",
-                    duration
+                    message,
+                    int(toc_detector.ai_seconds * 1000)
                 )
 
+            cancel_token.check()
             self._update_status(status_store, upload_id, ProcessingStatus.SPLITTING_CONTENT, 70)
 
-            # Step 6: Split content
+            # Step 5: Split content
             self._log_step(status_store, upload_id, ProcessingStep.CONTENT_SPLITTING, StepStatus.IN_PROGRESS)
             start_time = time.time()
 
-            chapters = await self.content_splitter.split(
-                [p.model_dump() for p in extracted.pages],
-                [t.model_dump() for t in toc_result.toc_items]
-            )
+            with self._profile_stage(profiler, status_store, upload_id, "content_splitting"):
+                chapters = await self.content_splitter.split(
+                    extracted.pages.dicts(),
+                    [t.model_dump() for t in toc_result.toc_items]
+                )
 
             duration = int((time.time() - start_time) * 1000)
             self._log_step(
@@ -155,21 +199,29 @@ class DocumentProcessor:
                 duration
             )
 
+            cancel_token.check()
             self._update_status(status_store, upload_id, ProcessingStatus.SAVING_TO_DB, 90)
 
-            # Step 7: Prepare result for database save
+            # Step 6: Prepare result for database save
             # (Actual DB save happens in Next.js API)
-            result = {
-                'upload_id': upload_id,
-                'extracted_text': extracted.model_dump(),
-                'toc': [t.model_dump() for t in toc_result.toc_items],
-                'chapters': [c.model_dump() for c in chapters],
-                'detected_title': toc_result.detected_title,
-                'detected_author': toc_result.detected_author,
-            }
-
-            # Store result for retrieval
-            status_store[upload_id]['result'] = result
+            with self._profile_stage(profiler, status_store, upload_id, "save_result"):
+                result = {
+                    'upload_id': upload_id,
+                    'extracted_text': extracted.model_dump(),
+                    'toc': [t.model_dump() for t in toc_result.toc_items],
+                    'chapters': [c.model_dump() for c in chapters],
+                    'detected_title': toc_result.detected_title,
+                    'detected_author': toc_result.detected_author,
+                }
+
+                # Store result for retrieval
+                status_store.update(upload_id, result=result)
+
+                if cache_key is not None:
+                    try:
+                        self.result_cache.set(cache_key, result)
+                    except Exception as e:
+                        logger.warning(f"Failed to cache result for {upload_id}: {e}")
 
             self._log_step(
                 status_store, upload_id,
@@ -180,30 +232,106 @@ class DocumentProcessor:
 
             # Complete
             self._update_status(status_store, upload_id, ProcessingStatus.COMPLETED, 100)
+            metrics.JOBS_FINISHED.inc(status=ProcessingStatus.COMPLETED.value)
             logger.info(f"Processing completed for upload {upload_id}")
 
+        except JobCancelledError:
+            self._mark_cancelled(status_store, upload_id)
+
         except Exception as e:
             logger.error(f"Processing failed for {upload_id}: {e}")
-            status_store[upload_id]['status'] = ProcessingStatus.FAILED
-            status_store[upload_id]['error_message'] = str(e)
+            metrics.JOBS_FINISHED.inc(status=ProcessingStatus.FAILED.value)
+            status_store.update(upload_id, status=ProcessingStatus.FAILED, error_message=str(e))
+            job = status_store.get_summary(upload_id) or {}
             self._log_step(
                 status_store, upload_id,
-                status_store[upload_id].get('current_step', ProcessingStep.UPLOAD),
+                job.get('current_step') or ProcessingStep.UPLOAD,
                 StepStatus.FAILED,
                 str(e)
             )
 
+    @contextmanager
+    def _profile_stage(
+        self,
+        profiler: Optional[StageProfiler],
+        store: JobStore,
+        upload_id: str,
+        stage: str
+    ) -> Iterator[None]:
+        """Run a stage under the job's profiler (if profiling) and publish the reports."""
+        if profiler is None:
+            yield
+            return
+
+        try:
+            with profiler.stage(stage):
+                yield
+        finally:
+            try:
+                store.update(upload_id, profile=profiler.reports)
+            except KeyError:
+                pass  # The job was deleted
+
+    def _mark_cancelled(self, store: JobStore, upload_id: str):
+        """Record that the job stopped because cancellation was requested."""
+        logger.info(f"Processing cancelled for upload {upload_id}")
+        metrics.JOBS_FINISHED.inc(status=ProcessingStatus.CANCELLED.value)
+        try:
+            job = store.get_summary(upload_id) or {}
+            store.update(upload_id, status=ProcessingStatus.CANCELLED)
+            self._log_step(
+                store, upload_id,
+                job.get('current_step') or ProcessingStep.UPLOAD,
+                StepStatus.SKIPPED,
+                "Cancelled"
+            )
+        except KeyError:
+            # The job was deleted, which also cancels it
+            pass
+
+    def _load_cached_result(self, store: JobStore, upload_id: str, cache_key: str) -> bool:
+        """Complete the job from the result cache. Returns False on a miss."""
+        start_time = time.time()
+        result = self.result_cache.get(cache_key)
+        if result is None:
+            return False
+
+        result['upload_id'] = upload_id
+        store.update(
+            upload_id,
+            page_count=result.get('extracted_text', {}).get('total_pages'),
+            detected_title=result.get('detected_title'),
+            detected_author=result.get('detected_author'),
+            result=result
+        )
+
+        duration = int((time.time() - start_time) * 1000)
+        self._log_step(
+            store, upload_id,
+            ProcessingStep.DB_SAVE,
+            StepStatus.COMPLETED,
+            f"Reused cached result ({len(result.get('chapters', []))} chapters)",
+            duration
+        )
+        self._update_status(store, upload_id, ProcessingStatus.COMPLETED, 100)
+        metrics.JOBS_FINISHED.inc(status=ProcessingStatus.COMPLETED.value)
+        logger.info(f"Processing completed for upload {upload_id} from cache")
+        return True
+
     def _update_status(
         self,
-        store: Dict,
+        store: JobStore,
         upload_id: str,
         status: ProcessingStatus,
         progress: int
     ):
         """Update processing status."""
-        store[upload_id]['status'] = status
-        store[upload_id]['progress'] = progress
-        store[upload_id]['current_step'] = self._status_to_step(status)
+        store.update(
+            upload_id,
+            status=status,
+            progress=progress,
+            current_step=self._status_to_step(status)
+        )
 
     def _status_to_step(self, status: ProcessingStatus) -> Optional[ProcessingStep]:
         """Convert status to current step."""
@@ -218,7 +346,7 @@ class DocumentProcessor:
 
     def _log_step(
         self,
-        store: Dict,
+        store: JobStore,
         upload_id: str,
         step: ProcessingStep,
         status: StepStatus,
@@ -226,6 +354,9 @@ class DocumentProcessor:
         duration: Optional[int] = None
     ):
         """Add a log entry for a processing step."""
+        if status == StepStatus.COMPLETED and duration is not None:
+            metrics.STEP_DURATION.observe(duration / 1000, step=getattr(step, 'value', step))
+
         log_entry = {
             'step': step,
             'status': status,
@@ -233,13 +364,13 @@ class DocumentProcessor:
             'duration': duration,
             'created_at': time.time()
         }
-        store[upload_id]['logs'].append(log_entry)
+        store.append_log(upload_id, log_entry)
 
 
 def get_file_hash(file_path: str) -> str:
     """Calculate SHA256 hash of a file."""
     sha256 = hashlib.sha256()
     with open(file_path, 'rb') as f:
-        for chunk in iter(lambda: f.read(8192), b''):
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
             sha256.update(chunk)
     return sha256.hexdigest()
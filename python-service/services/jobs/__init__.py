@@ -0,0 +1,37 @@
+from .job_store import (
+    JobStore,
+    InMemoryJobStore,
+    SQLiteJobStore,
+    create_job_store,
+    get_job_store,
+)
+from .cancellation import CancellationToken, JobCancelledError, check_cancelled
+from .executor import JobExecutor, Priority, QueueFullError, run_processing_job, worker_cpus
+from .tasks import extract_text_task, detect_toc_task, split_content_task
+from .events import TERMINAL_STATUSES, stream_job_events, status_fields
+from .batch import BatchRunner, collect_batch_files, read_batch_summary
+
+__all__ = [
+    "JobStore",
+    "InMemoryJobStore",
+    "SQLiteJobStore",
+    "create_job_store",
+    "get_job_store",
+    "CancellationToken",
+    "JobCancelledError",
+    "check_cancelled",
+    "JobExecutor",
+    "Priority",
+    "QueueFullError",
+    "run_processing_job",
+    "worker_cpus",
+    "extract_text_task",
+    "detect_toc_task",
+    "split_content_task",
+    "TERMINAL_STATUSES",
+    "stream_job_events",
+    "status_fields",
+    "BatchRunner",
+    "collect_batch_files",
+    "read_batch_summary",
+]
@@ -0,0 +1,242 @@
+"""
+Batch Ingestion
+Processes whole directories of books through the job executor with a
+parallelism limit, writing per-file results and aggregate progress as it goes.
+"""
+
+import asyncio
+import glob
+import gzip
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from models import ProcessingOptions, ProcessingStatus
+from config import settings
+from .job_store import JobStore
+from .executor import JobExecutor, QueueFullError
+
+logger = logging.getLogger(__name__)
+
+
+def collect_batch_files(
+    paths: List[str],
+    pattern: str = "*",
+    recursive: bool = False
+) -> List[str]:
+    """
+    Expand files, directories and glob patterns into a sorted list of
+    supported documents (see ALLOWED_EXTENSIONS).
+    """
+    found = []
+
+    for entry in paths:
+        if glob.has_magic(entry):
+            candidates = glob.glob(entry, recursive=True)
+        elif Path(entry).is_dir():
+            directory = Path(entry)
+            matches = directory.rglob(pattern) if recursive else directory.glob(pattern)
+            candidates = [str(p) for p in matches]
+        else:
+            candidates = [entry]
+
+        for candidate in candidates:
+            path = Path(candidate)
+            if path.is_file() and path.suffix.lower() in settings.ALLOWED_EXTENSIONS:
+                found.append(str(path.resolve()))
+
+    # Keep the order stable and drop duplicates
+    return sorted(set(found))
+
+
+class BatchRunner:
+    """
+    Run a batch of files through a JobExecutor.
+
+    Output (in BATCH_OUTPUT_DIR/<batch_id>/):
+        manifest.jsonl: one line per finished file (status, pages, duration, error)
+        results/<upload_id>.json.gz: the pipeline result of each completed file
+        summary.json: aggregate progress, rewritten after every file
+    """
+
+    def __init__(
+        self,
+        status_store: JobStore,
+        executor: JobExecutor,
+        files: List[str],
+        options: ProcessingOptions,
+        parallelism: Optional[int] = None,
+        batch_id: Optional[str] = None,
+        output_dir: Optional[Path] = None,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        self.status_store = status_store
+        self.executor = executor
+        self.files = files
+        self.options = options
+        self.parallelism = max(1, parallelism or settings.BATCH_PARALLELISM)
+        self.batch_id = batch_id or uuid.uuid4().hex[:12]
+        self.output_dir = Path(output_dir or settings.BATCH_OUTPUT_DIR) / self.batch_id
+        self.on_progress = on_progress
+
+        self.completed = 0
+        self.failed = 0
+        self.pages = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def summary_path(self) -> Path:
+        return self.output_dir / "summary.json"
+
+    def prepare(self):
+        """Create the output directory and publish a PENDING summary."""
+        (self.output_dir / "results").mkdir(parents=True, exist_ok=True)
+        self._write_summary()
+
+    async def run(self) -> Dict[str, Any]:
+        """Process every file and return the final summary."""
+        self.started_at = time.time()
+        self.prepare()
+
+        semaphore = asyncio.Semaphore(self.parallelism)
+
+        async def run_one(index: int, file_path: str):
+            async with semaphore:
+                await self._process_file(index, file_path)
+
+        await asyncio.gather(*(run_one(i, f) for i, f in enumerate(self.files)))
+
+        self.finished_at = time.time()
+        summary = self._write_summary()
+        logger.info(
+            f"Batch {self.batch_id} finished: {self.completed} completed, "
+            f"{self.failed} failed in {summary['elapsed_seconds']}s"
+        )
+        return summary
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate progress: throughput, failures and ETA."""
+        now = self.finished_at or time.time()
+        elapsed = now - self.started_at if self.started_at else 0.0
+        done = self.completed + self.failed
+        remaining = len(self.files) - done
+
+        books_per_sec = done / elapsed if elapsed > 0 else 0.0
+        eta = remaining / books_per_sec if books_per_sec > 0 else None
+
+        if self.finished_at:
+            if not self.failed:
+                status = "COMPLETED"
+            elif self.completed:
+                status = "PARTIAL"  # Some files failed, see manifest.jsonl
+            else:
+                status = "FAILED"
+        elif self.started_at:
+            status = "RUNNING"
+        else:
+            status = "PENDING"
+
+        return {
+            "batch_id": self.batch_id,
+            "status": status,
+            "total_files": len(self.files),
+            "completed": self.completed,
+            "failed": self.failed,
+            "remaining": remaining,
+            "pages": self.pages,
+            "elapsed_seconds": round(elapsed, 1),
+            "books_per_sec": round(books_per_sec, 3),
+            "pages_per_sec": round(self.pages / elapsed, 2) if elapsed > 0 else 0.0,
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "output_dir": str(self.output_dir),
+        }
+
+    async def _process_file(self, index: int, file_path: str):
+        """Run one file through the executor and record its outcome."""
+        upload_id = f"batch-{self.batch_id}-{index:05d}"
+        self.status_store.create(upload_id, {
+            "status": ProcessingStatus.PENDING,
+            "progress": 0,
+            "current_step": None,
+            "logs": [],
+            "page_count": None,
+            "error_message": None,
+        })
+
+        start_time = time.time()
+        while True:
+            try:
+                await self.executor.run(upload_id, file_path, self.options)
+                break
+            except QueueFullError:
+                # Other clients are using the queue; wait for room
+                await asyncio.sleep(1.0)
+
+        job = self.status_store.get_summary(upload_id) or {}
+        status = job.get('status')
+        entry = {
+            "upload_id": upload_id,
+            "file_path": file_path,
+            "status": status,
+            "pages": job.get('page_count') or 0,
+            "duration_ms": int((time.time() - start_time) * 1000),
+            "error": job.get('error_message'),
+        }
+
+        result_path = self.output_dir / "results" / f"{upload_id}.json.gz"
+        chapters = None
+        if status == ProcessingStatus.COMPLETED:
+            # Reading and compressing a book's result takes a while; keep it off the event loop
+            chapters = await asyncio.to_thread(self._save_result, upload_id, result_path)
+
+        if chapters is not None:
+            entry["result_path"] = str(result_path)
+            entry["chapters"] = chapters
+            self.completed += 1
+            self.pages += entry["pages"]
+        else:
+            self.failed += 1
+
+        # The batch output is the durable record; keep the job store small
+        self.status_store.delete(upload_id)
+
+        with open(self.output_dir / "manifest.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+        summary = self._write_summary()
+        if self.on_progress:
+            self.on_progress({**summary, "last": entry})
+
+    def _save_result(self, upload_id: str, result_path: Path) -> Optional[int]:
+        """Write a job's result to result_path; returns its chapter count, or None if it has no result."""
+        result = self.status_store.get_result(upload_id)
+        if result is None:
+            return None
+        with gzip.open(result_path, "wt", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, default=str)
+        return len(result.get('chapters', []))
+
+    def _write_summary(self) -> Dict[str, Any]:
+        """Atomically rewrite summary.json so any worker can serve progress."""
+        summary = self.summary()
+        tmp_path = self.summary_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(summary, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.summary_path)
+        return summary
+
+
+def read_batch_summary(batch_id: str, output_dir: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Read the latest summary of a batch, or None if it does not exist."""
+    if Path(batch_id).name != batch_id:
+        return None
+
+    summary_path = Path(output_dir or settings.BATCH_OUTPUT_DIR) / batch_id / "summary.json"
+    try:
+        return json.loads(summary_path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,67 @@
+"""
+Job Cancellation
+Cooperative cancellation for processing jobs.
+Long loops call CancellationToken.check() at page boundaries and between stages.
+"""
+
+import time
+from typing import Optional
+
+from config import settings
+from .job_store import JobStore
+
+
+class JobCancelledError(Exception):
+    """Raised inside a job when cancellation was requested."""
+
+
+class CancellationToken:
+    """
+    Tells a running job whether it should stop.
+
+    Cancellation is requested by setting 'cancel_requested' on the job
+    (POST /status/{upload_id}/cancel) or by deleting it. The job store is
+    polled at most once per interval, so calling check() once per page is cheap.
+    """
+
+    def __init__(
+        self,
+        status_store: Optional[JobStore] = None,
+        upload_id: Optional[str] = None,
+        interval: Optional[float] = None
+    ):
+        self.status_store = status_store
+        self.upload_id = upload_id
+        self.interval = settings.CANCEL_CHECK_INTERVAL if interval is None else interval
+
+        self._cancelled = False
+        self._last_check = 0.0
+
+    def cancel(self):
+        """Cancel locally (without the job store)."""
+        self._cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        """True if the job should stop."""
+        if self._cancelled or self.status_store is None:
+            return self._cancelled
+
+        now = time.monotonic()
+        if now - self._last_check >= self.interval:
+            self._last_check = now
+            summary = self.status_store.get_summary(self.upload_id)
+            self._cancelled = summary is None or bool(summary.get('cancel_requested'))
+
+        return self._cancelled
+
+    def check(self):
+        """Raise JobCancelledError if the job should stop."""
+        if self.cancelled:
+            raise JobCancelledError(f"Job {self.upload_id} was cancelled" if self.upload_id else "Job was cancelled")
+
+
+def check_cancelled(token: Optional[CancellationToken]):
+    """Check an optional token (extractors accept None when run outside a job)."""
+    if token is not None:
+        token.check()
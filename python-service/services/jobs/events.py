@@ -0,0 +1,104 @@
+"""
+Job Events
+Server-Sent Events stream of processing progress.
+Sends only new log entries and status changes instead of the full job.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+from models import ProcessingLog
+from config import settings
+from .job_store import JobStore, TERMINAL_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# Fields sent in 'status' events (everything except logs and result)
+STATUS_FIELDS = [
+    'status', 'progress', 'current_step',
+    'detected_title', 'detected_author', 'page_count', 'error_message',
+]
+
+
+def status_fields(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """Pick the client-visible status fields from a job summary."""
+    return {
+        field: _plain(summary.get(field))
+        for field in STATUS_FIELDS
+    }
+
+
+def format_sse(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    """Format one Server-Sent Event."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def stream_job_events(
+    store: JobStore,
+    upload_id: str,
+    cursor: int = 0,
+    interval: Optional[float] = None,
+    heartbeat: Optional[float] = None
+) -> AsyncIterator[str]:
+    """
+    Yield SSE messages for a job until it finishes.
+
+    Events:
+        status: status/progress fields, sent when any of them changes
+        log: one new log entry (event id is the log cursor, for Last-Event-ID)
+        end: final status, after which the stream closes
+
+    Args:
+        store: Job store to watch
+        upload_id: Job to watch
+        cursor: Number of log entries the client already has
+        interval: Seconds between store checks
+        heartbeat: Seconds between keep-alive comments
+    """
+    interval = interval or settings.STATUS_STREAM_INTERVAL
+    heartbeat = heartbeat or settings.STATUS_STREAM_HEARTBEAT
+
+    last_status = None
+    last_sent = time.monotonic()
+
+    while True:
+        summary = store.get_summary(upload_id)
+        if summary is None:
+            yield format_sse("end", {"status": None, "error_message": "Upload not found"})
+            return
+
+        if summary['log_count'] > cursor:
+            for entry in store.get_logs(upload_id, cursor):
+                cursor += 1
+                log = ProcessingLog(**entry).model_dump(mode="json")
+                yield format_sse("log", log, event_id=cursor)
+            last_sent = time.monotonic()
+
+        current = status_fields(summary)
+        if current != last_status:
+            last_status = current
+            yield format_sse("status", current, event_id=cursor)
+            last_sent = time.monotonic()
+
+        if current['status'] in TERMINAL_STATUSES:
+            yield format_sse("end", current, event_id=cursor)
+            return
+
+        if time.monotonic() - last_sent >= heartbeat:
+            yield ": keep-alive\n\n"
+            last_sent = time.monotonic()
+
+        await asyncio.sleep(interval)
+
+
+def _plain(value: Any) -> Any:
+    """Get the JSON value of enums."""
+    return getattr(value, 'value', value)
@@ -0,0 +1,419 @@
+"""
+Job Executor
+Runs document processing jobs and interactive requests in a bounded worker
+pool, off the event loop, with priority for interactive requests.
+"""
+
+import asyncio
+import collections
+import enum
+import functools
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from models import ProcessingOptions, ProcessingStatus
+from config import settings
+from .job_store import JobStore, get_job_store
+from .. import metrics
+
+logger = logging.getLogger(__name__)
+
+# CPUs this process may keep busy with its own extraction and OCR pools
+# (set in job worker processes, see _init_job_worker)
+_worker_cpus: Optional[int] = None
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue cannot accept more work."""
+
+
+class Priority(enum.IntEnum):
+    """Scheduling class of queued work (lower runs first)."""
+    INTERACTIVE = 0  # Admin review UI: /extract-text, /detect-toc, /split-content
+    BULK = 1  # /process, /upload and batch jobs
+
+
+@dataclass
+class QueuedJob:
+    """A processing job waiting for a worker."""
+    upload_id: str
+    file_path: str
+    options: Dict[str, Any]
+    file_hash: Optional[str] = None
+    done: Optional[asyncio.Future] = None  # Resolved when the job has run
+
+
+@dataclass
+class QueuedCall:
+    """An interactive request waiting for a worker."""
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...]
+    done: asyncio.Future  # Resolved with the return value of fn
+
+
+def run_processing_job(
+    upload_id: str,
+    file_path: str,
+    options: Dict[str, Any],
+    file_hash: Optional[str] = None,
+    status_store: Optional[JobStore] = None,
+    collect_metrics: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    Run DocumentProcessor for one job.
+    Executed inside a pool worker, so it builds its own event loop.
+
+    Returns:
+        With collect_metrics (worker processes), the metrics recorded by the
+        job for the parent to merge; otherwise None
+    """
+    from services.document_processor import DocumentProcessor
+    from services.text_extractor import release_session
+
+    processor = DocumentProcessor()
+    try:
+        asyncio.run(processor.process(
+            upload_id,
+            file_path,
+            ProcessingOptions(**options),
+            status_store or get_job_store(),
+            file_hash=file_hash
+        ))
+    finally:
+        # The worker keeps the document open for the next job, not its text
+        release_session(file_path)
+
+    return metrics.registry.drain() if collect_metrics else None
+
+
+def run_interactive_call(fn: Callable[..., Any], *args: Any) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Run an interactive request in a worker process.
+
+    Returns:
+        The return value of fn and the metrics recorded in the worker, for
+        the parent to merge
+    """
+    return fn(*args), metrics.registry.drain()
+
+
+def worker_cpus() -> int:
+    """
+    CPUs the extraction and OCR pools of this process may use: the job
+    worker's share of the machine in a job worker process, every CPU
+    otherwise (thread workers share this process's pools).
+    """
+    return _worker_cpus or os.cpu_count() or 1
+
+
+def _init_job_worker(cpus: int) -> None:
+    """Job worker initializer: record the worker's share of the CPUs."""
+    global _worker_cpus
+    _worker_cpus = cpus
+
+
+def _warm_up_worker() -> None:
+    """Import the pipeline in a fresh worker so the first request does not pay for it."""
+    import services.document_processor  # noqa: F401
+
+    if settings.OCR_PRELOAD_PROVIDER:
+        from services.text_extractor import start_ocr_pool
+        start_ocr_pool(settings.OCR_PRELOAD_PROVIDER)
+
+
+class JobExecutor:
+    """
+    Two-class priority executor for processing jobs and interactive requests.
+
+    Bulk processing jobs wait in a FIFO queue of JOB_QUEUE_SIZE entries and
+    run on JOB_WORKERS workers. INTERACTIVE_WORKERS additional workers are
+    reserved for interactive requests, which also go first on the bulk
+    workers, so review-page calls stay fast while bulk imports saturate
+    the pool.
+
+    Workers are processes when the job store is shared across processes
+    (SQLite); with the in-memory store they fall back to threads, since a
+    child process could not update the parent's dict.
+    """
+
+    def __init__(
+        self,
+        status_store: JobStore,
+        max_workers: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
+        use_processes: Optional[bool] = None,
+        interactive_workers: Optional[int] = None,
+        max_interactive_queue_size: Optional[int] = None
+    ):
+        self.status_store = status_store
+        self.max_workers = max_workers or settings.JOB_WORKERS
+        self.max_queue_size = max_queue_size or settings.JOB_QUEUE_SIZE
+        self.interactive_workers = (
+            settings.INTERACTIVE_WORKERS if interactive_workers is None else interactive_workers
+        )
+        self.max_interactive_queue_size = (
+            max_interactive_queue_size or settings.INTERACTIVE_QUEUE_SIZE
+        )
+        self.use_processes = (
+            status_store.shared_across_processes if use_processes is None else use_processes
+        )
+
+        self._pool: Optional[Executor] = None
+        self._queues: Dict[Priority, Deque[Union[QueuedJob, QueuedCall]]] = {
+            priority: collections.deque() for priority in Priority
+        }
+        self._available: Optional[asyncio.Condition] = None
+        self._dispatchers: List[asyncio.Task] = []
+        self._running = {priority: 0 for priority in Priority}
+
+    def _create_pool(self) -> Executor:
+        pool_size = self.max_workers + self.interactive_workers
+        if self.use_processes:
+            # spawn avoids inheriting the parent's event loop and SQLite connections
+            # Each worker gets its share of the CPUs for its own pools, so
+            # parallel jobs do not start more busy processes than there are CPUs
+            return ProcessPoolExecutor(
+                max_workers=pool_size,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_job_worker,
+                initargs=(max(1, (os.cpu_count() or 1) // pool_size),)
+            )
+        return ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="job")
+
+    async def start(self):
+        """Create the worker pool and start dispatching queued work."""
+        if self._dispatchers:
+            return
+
+        self._pool = self._create_pool()
+        self._available = asyncio.Condition()
+        if self.use_processes:
+            for _ in range(self.max_workers + self.interactive_workers):
+                self._pool.submit(_warm_up_worker)
+        self._dispatchers = [
+            asyncio.create_task(self._dispatch(Priority.BULK))
+            for _ in range(self.max_workers)
+        ] + [
+            asyncio.create_task(self._dispatch(Priority.INTERACTIVE))
+            for _ in range(self.interactive_workers)
+        ]
+        logger.info(
+            f"Job executor started: {self.max_workers} + {self.interactive_workers} interactive "
+            f"{'process' if self.use_processes else 'thread'} workers, "
+            f"queue size {self.max_queue_size}"
+        )
+
+    async def shutdown(self):
+        """Stop dispatching and shut down the worker pool."""
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def submit(
+        self,
+        upload_id: str,
+        file_path: str,
+        options: ProcessingOptions,
+        file_hash: Optional[str] = None
+    ) -> int:
+        """
+        Queue a job for processing.
+        Pass file_hash when it is already known to skip re-hashing the file.
+
+        Returns:
+            Number of jobs ahead of this one in the queue
+
+        Raises:
+            QueueFullError: If the queue is full
+        """
+        position, _ = await self._enqueue(upload_id, file_path, options, file_hash)
+        return position
+
+    async def run(
+        self,
+        upload_id: str,
+        file_path: str,
+        options: ProcessingOptions,
+        file_hash: Optional[str] = None
+    ):
+        """
+        Queue a job and wait until it has run.
+        The outcome is in the job store.
+
+        Raises:
+            QueueFullError: If the queue is full
+        """
+        _, done = await self._enqueue(upload_id, file_path, options, file_hash)
+        await done
+
+    async def call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run an interactive request on the pool ahead of bulk jobs.
+        fn must be a picklable module-level function when workers are processes.
+
+        Returns:
+            The return value of fn (exceptions are re-raised)
+
+        Raises:
+            QueueFullError: If too many interactive requests are waiting
+        """
+        await self.start()
+
+        queue = self._queues[Priority.INTERACTIVE]
+        if len(queue) >= self.max_interactive_queue_size:
+            raise QueueFullError(
+                f"Interactive queue is full ({self.max_interactive_queue_size} requests waiting)"
+            )
+
+        done = asyncio.get_running_loop().create_future()
+        await self._put(Priority.INTERACTIVE, QueuedCall(fn, args, done))
+        return await done
+
+    async def _enqueue(
+        self,
+        upload_id: str,
+        file_path: str,
+        options: ProcessingOptions,
+        file_hash: Optional[str]
+    ) -> Tuple[int, asyncio.Future]:
+        await self.start()
+
+        queue = self._queues[Priority.BULK]
+        position = len(queue)
+        if position >= self.max_queue_size:
+            raise QueueFullError(f"Job queue is full ({self.max_queue_size} jobs waiting)")
+
+        done = asyncio.get_running_loop().create_future()
+        await self._put(Priority.BULK, QueuedJob(upload_id, file_path, options.model_dump(), file_hash, done))
+        return position, done
+
+    async def _put(self, priority: Priority, item: Union[QueuedJob, QueuedCall]):
+        async with self._available:
+            self._queues[priority].append(item)
+            self._available.notify_all()
+
+    async def _take(self, lowest_priority: Priority) -> Tuple[Priority, Union[QueuedJob, QueuedCall]]:
+        """Wait for the oldest item of the most urgent class a worker may run."""
+        async with self._available:
+            while True:
+                for priority in Priority:
+                    if priority <= lowest_priority and self._queues[priority]:
+                        return priority, self._queues[priority].popleft()
+                await self._available.wait()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get worker and queue statistics."""
+        return {
+            "workers": self.max_workers,
+            "interactive_workers": self.interactive_workers,
+            "worker_type": "process" if self.use_processes else "thread",
+            "running": self._running[Priority.BULK],
+            "queued": len(self._queues[Priority.BULK]),
+            "max_queue_size": self.max_queue_size,
+            "interactive_running": self._running[Priority.INTERACTIVE],
+            "interactive_queued": len(self._queues[Priority.INTERACTIVE]),
+        }
+
+    async def _dispatch(self, lowest_priority: Priority):
+        """
+        Take queued work in priority order (FIFO within a class) and run it
+        on the pool. Reserved interactive workers pass Priority.INTERACTIVE
+        and never pick up bulk jobs.
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            priority, item = await self._take(lowest_priority)
+            if isinstance(item, QueuedJob) and self._skip_cancelled(item):
+                continue
+
+            pool = self._pool
+            self._running[priority] += 1
+            try:
+                if isinstance(item, QueuedCall):
+                    if self.use_processes:
+                        result, delta = await loop.run_in_executor(pool, run_interactive_call, item.fn, *item.args)
+                        metrics.registry.merge(delta)
+                    else:
+                        result = await loop.run_in_executor(pool, item.fn, *item.args)
+                    if not item.done.done():
+                        item.done.set_result(result)
+                    continue
+
+                job = item
+                if self.use_processes:
+                    task = functools.partial(
+                        run_processing_job, job.upload_id, job.file_path, job.options,
+                        job.file_hash, collect_metrics=True
+                    )
+                else:
+                    task = functools.partial(
+                        run_processing_job, job.upload_id, job.file_path, job.options,
+                        job.file_hash, self.status_store
+                    )
+                metrics.registry.merge(await loop.run_in_executor(pool, task))
+
+            except BrokenProcessPool as e:
+                logger.error(f"Worker died while running {self._describe(item)}: {e}")
+                self._fail(item, "Worker process crashed", e)
+                # Other dispatchers see the same broken pool; replace it only once
+                if self._pool is pool:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    self._pool = self._create_pool()
+
+            except Exception as e:
+                if isinstance(item, QueuedJob):
+                    logger.error(f"Job {item.upload_id} failed in executor: {e}")
+                self._fail(item, str(e), e)
+
+            finally:
+                self._running[priority] -= 1
+                if item.done is not None and not item.done.done():
+                    item.done.set_result(None)
+
+    def _describe(self, item: Union[QueuedJob, QueuedCall]) -> str:
+        if isinstance(item, QueuedJob):
+            return item.upload_id
+        return getattr(item.fn, '__name__', 'interactive request')
+
+    def _fail(self, item: Union[QueuedJob, QueuedCall], message: str, error: Exception):
+        """Report a failure to whoever waits for the item."""
+        if isinstance(item, QueuedCall):
+            if not item.done.done():
+                item.done.set_exception(error)
+        else:
+            self._fail_job(item.upload_id, message)
+
+    def _skip_cancelled(self, job: QueuedJob) -> bool:
+        """Drop a queued job that was cancelled or deleted before it started."""
+        summary = self.status_store.get_summary(job.upload_id)
+        if summary is not None and not summary.get('cancel_requested'):
+            return False
+
+        logger.info(f"Skipping cancelled job {job.upload_id}")
+        if summary is not None:
+            self.status_store.update(job.upload_id, status=ProcessingStatus.CANCELLED)
+        if job.done is not None and not job.done.done():
+            job.done.set_result(None)
+        return True
+
+    def _fail_job(self, upload_id: str, message: str):
+        """Mark a job as failed if the worker could not do it itself."""
+        try:
+            self.status_store.update(
+                upload_id,
+                status=ProcessingStatus.FAILED,
+                error_message=message
+            )
+        except KeyError:
+            pass
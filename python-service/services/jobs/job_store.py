@@ -0,0 +1,510 @@
+"""
+Job Store
+Persistent storage for document processing job state.
+Replaces the module-level status dict so several workers share the same jobs.
+"""
+
+import copy
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from models import ProcessingStatus
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Jobs in these states never change again and can be evicted
+TERMINAL_STATUSES = {
+    ProcessingStatus.COMPLETED.value,
+    ProcessingStatus.FAILED.value,
+    ProcessingStatus.CANCELLED.value,
+}
+
+
+class JobStore(ABC):
+    """
+    Base class for job state backends.
+
+    A job is a dict with the fields of ProcessingStatusResponse
+    (status, progress, current_step, logs, ...) plus an optional 'result'.
+
+    Results of JOB_RESULT_SPILL_BYTES or more are written to a gzipped file in
+    result_dir instead of the job itself ('result_file'), and are only read
+    back when the job or its result is requested. 'result_bytes' holds the
+    serialized size either way and counts towards the retention budget.
+    """
+
+    # True if other processes (uvicorn workers, pool workers) see the same jobs
+    shared_across_processes: bool = False
+
+    def __init__(self, result_dir: Optional[Path] = None, spill_bytes: Optional[int] = None):
+        self.result_dir = Path(result_dir or settings.JOB_RESULT_DIR)
+        self.spill_bytes = settings.JOB_RESULT_SPILL_BYTES if spill_bytes is None else spill_bytes
+
+    @abstractmethod
+    def create(self, upload_id: str, data: Dict[str, Any]) -> None:
+        """Create (or reset) a job with its initial state."""
+
+    @abstractmethod
+    def get(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        """Get a snapshot of a job including its logs, or None."""
+
+    @abstractmethod
+    def get_summary(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job without its logs and result, or None.
+        Includes 'log_count' so callers can fetch only new logs.
+        """
+
+    @abstractmethod
+    def get_logs(self, upload_id: str, offset: int = 0) -> List[Dict[str, Any]]:
+        """Get the log entries of a job starting at offset."""
+
+    @abstractmethod
+    def update(self, upload_id: str, **fields: Any) -> None:
+        """Update top-level fields of a job."""
+
+    @abstractmethod
+    def append_log(self, upload_id: str, entry: Dict[str, Any]) -> None:
+        """Append a log entry to a job."""
+
+    @abstractmethod
+    def delete(self, upload_id: str) -> bool:
+        """Delete a job. Returns False if it did not exist."""
+
+    @abstractmethod
+    def count_by_status(self) -> Dict[str, int]:
+        """Count jobs grouped by status."""
+
+    @abstractmethod
+    def _finished_jobs(self) -> List[Tuple[str, float, int]]:
+        """List (upload_id, updated_at, result_bytes) of jobs in a terminal status."""
+
+    def __contains__(self, upload_id: str) -> bool:
+        return self.get_summary(upload_id) is not None
+
+    def get_result(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        """Get the result of a job (loading it from disk if spilled), or None."""
+        job = self.get(upload_id)
+        return job.get('result') if job else None
+
+    def result_path(self, upload_id: str) -> Optional[Path]:
+        """Path of the gzipped JSON result if it was spilled to disk."""
+        summary = self.get_summary(upload_id)
+        if summary is None or not summary.get('result_file'):
+            return None
+        path = self.result_dir / summary['result_file']
+        return path if path.exists() else None
+
+    def evict_finished(
+        self,
+        max_age: Optional[float] = None,
+        max_bytes: Optional[int] = None
+    ) -> int:
+        """
+        Delete finished jobs older than max_age seconds, then the oldest
+        finished jobs whose results do not fit in max_bytes.
+
+        Returns:
+            Number of jobs deleted
+        """
+        max_age = settings.JOB_RETENTION_SECONDS if max_age is None else max_age
+        max_bytes = settings.JOB_RETENTION_MAX_BYTES if max_bytes is None else max_bytes
+
+        now = time.time()
+        retained_bytes = 0
+        over_budget = False
+        evicted = 0
+
+        # Newest first, so the most recent results are the ones kept
+        for upload_id, updated_at, result_bytes in sorted(
+            self._finished_jobs(), key=lambda job: job[1], reverse=True
+        ):
+            if not over_budget and now - updated_at <= max_age:
+                retained_bytes += result_bytes or 0
+                over_budget = retained_bytes > max_bytes
+                if not over_budget:
+                    continue
+
+            if self.delete(upload_id):
+                evicted += 1
+
+        if evicted:
+            logger.info(f"Evicted {evicted} finished jobs")
+        return evicted
+
+    # ============================================
+    # RESULT SPILL
+    # ============================================
+
+    def _prepare_fields(self, upload_id: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Spill a large 'result' in an update to disk and record its size."""
+        result = fields.get('result')
+        if result is None:
+            return fields
+
+        fields = dict(fields)
+        data = _dumps(result).encode('utf-8')
+        fields['result_bytes'] = len(data)
+
+        if len(data) >= self.spill_bytes:
+            fields['result'] = None
+            fields['result_file'] = self._write_result(upload_id, data)
+        else:
+            fields['result_file'] = None
+            self._remove_result(upload_id)
+        return fields
+
+    def _load_result(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Read a spilled result back into a job snapshot."""
+        if job.get('result_file') and job.get('result') is None:
+            try:
+                with gzip.open(self.result_dir / job['result_file'], 'rt', encoding='utf-8') as f:
+                    job['result'] = json.load(f)
+            except FileNotFoundError:
+                logger.warning(f"Spilled result {job['result_file']} is missing")
+        return job
+
+    def artifact_dir(self, upload_id: str) -> Path:
+        """Directory for other files of a job (e.g. profiles); removed with the job."""
+        return self.result_dir / "artifacts" / self._file_key(upload_id)
+
+    def _file_key(self, upload_id: str) -> str:
+        # Hash the id so any upload_id maps to a safe file name
+        return hashlib.sha256(upload_id.encode('utf-8')).hexdigest()[:32]
+
+    def _result_file_name(self, upload_id: str) -> str:
+        return self._file_key(upload_id) + ".json.gz"
+
+    def _write_result(self, upload_id: str, data: bytes) -> str:
+        self.result_dir.mkdir(parents=True, exist_ok=True)
+        name = self._result_file_name(upload_id)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.result_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=5))
+            os.replace(tmp_path, self.result_dir / name)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        return name
+
+    def _remove_result(self, upload_id: str):
+        (self.result_dir / self._result_file_name(upload_id)).unlink(missing_ok=True)
+
+    def _remove_files(self, upload_id: str):
+        """Remove the spilled result and artifacts of a job."""
+        self._remove_result(upload_id)
+        shutil.rmtree(self.artifact_dir(upload_id), ignore_errors=True)
+
+
+class InMemoryJobStore(JobStore):
+    """
+    Process-local job store.
+    Fast and dependency-free, but jobs are lost on restart and are not
+    visible to other uvicorn workers.
+    """
+
+    shared_across_processes = False
+
+    def __init__(self, result_dir: Optional[Path] = None, spill_bytes: Optional[int] = None):
+        super().__init__(result_dir, spill_bytes)
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._updated_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def create(self, upload_id: str, data: Dict[str, Any]) -> None:
+        job = copy.deepcopy(data)
+        job.setdefault('logs', [])
+        self._remove_files(upload_id)
+        with self._lock:
+            self._jobs[upload_id] = job
+            self._updated_at[upload_id] = time.time()
+
+    def get(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(upload_id)
+            if job is None:
+                return None
+            snapshot = dict(job)
+            snapshot['logs'] = list(job['logs'])
+        return self._load_result(snapshot)
+
+    def get_summary(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(upload_id)
+            if job is None:
+                return None
+            summary = {k: v for k, v in job.items() if k not in ('logs', 'result')}
+            summary['log_count'] = len(job['logs'])
+            return summary
+
+    def get_logs(self, upload_id: str, offset: int = 0) -> List[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(upload_id)
+            return list(job['logs'][offset:]) if job else []
+
+    def update(self, upload_id: str, **fields: Any) -> None:
+        if upload_id not in self._jobs:
+            raise KeyError(upload_id)
+        fields = self._prepare_fields(upload_id, fields)
+        with self._lock:
+            if upload_id not in self._jobs:
+                raise KeyError(upload_id)
+            self._jobs[upload_id].update(fields)
+            self._updated_at[upload_id] = time.time()
+
+    def append_log(self, upload_id: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            if upload_id not in self._jobs:
+                raise KeyError(upload_id)
+            self._jobs[upload_id]['logs'].append(dict(entry))
+
+    def delete(self, upload_id: str) -> bool:
+        with self._lock:
+            self._updated_at.pop(upload_id, None)
+            existed = self._jobs.pop(upload_id, None) is not None
+        self._remove_files(upload_id)
+        return existed
+
+    def count_by_status(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for job in self._jobs.values():
+                status = _status_value(job.get('status'))
+                counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def _finished_jobs(self) -> List[Tuple[str, float, int]]:
+        with self._lock:
+            return [
+                (upload_id, self._updated_at.get(upload_id, 0.0), job.get('result_bytes') or 0)
+                for upload_id, job in self._jobs.items()
+                if _status_value(job.get('status')) in TERMINAL_STATUSES
+            ]
+
+
+class SQLiteJobStore(JobStore):
+    """
+    SQLite-backed job store in WAL mode.
+    Safe to share between uvicorn workers and pool processes on one machine,
+    and survives restarts.
+    """
+
+    shared_across_processes = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            upload_id TEXT PRIMARY KEY,
+            status TEXT,
+            data TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS job_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            upload_id TEXT NOT NULL,
+            entry TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_job_logs_upload ON job_logs (upload_id, id);
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        result_dir: Optional[Path] = None,
+        spill_bytes: Optional[int] = None
+    ):
+        super().__init__(result_dir, spill_bytes)
+        self.db_path = Path(db_path or settings.JOB_STORE_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._connect()
+        conn.executescript(self.SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the connection for the current thread."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def create(self, upload_id: str, data: Dict[str, Any]) -> None:
+        job = dict(data)
+        logs = job.pop('logs', None) or []
+        self._remove_files(upload_id)
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM job_logs WHERE upload_id = ?", (upload_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (upload_id, status, data, updated_at) VALUES (?, ?, ?, ?)",
+                (upload_id, _status_value(job.get('status')), _dumps(job), time.time())
+            )
+            conn.executemany(
+                "INSERT INTO job_logs (upload_id, entry) VALUES (?, ?)",
+                [(upload_id, _dumps(entry)) for entry in logs]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        row = conn.execute("SELECT data FROM jobs WHERE upload_id = ?", (upload_id,)).fetchone()
+        if row is None:
+            return None
+
+        job = json.loads(row[0])
+        job['logs'] = self.get_logs(upload_id)
+        return self._load_result(job)
+
+    def get_result(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        row = conn.execute("SELECT data FROM jobs WHERE upload_id = ?", (upload_id,)).fetchone()
+        if row is None:
+            return None
+        return self._load_result(json.loads(row[0])).get('result')
+
+    def get_summary(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        row = conn.execute("SELECT data FROM jobs WHERE upload_id = ?", (upload_id,)).fetchone()
+        if row is None:
+            return None
+
+        summary = json.loads(row[0])
+        summary.pop('result', None)
+        summary['log_count'] = conn.execute(
+            "SELECT COUNT(*) FROM job_logs WHERE upload_id = ?", (upload_id,)
+        ).fetchone()[0]
+        return summary
+
+    def get_logs(self, upload_id: str, offset: int = 0) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        return [
+            json.loads(entry)
+            for (entry,) in conn.execute(
+                "SELECT entry FROM job_logs WHERE upload_id = ? ORDER BY id LIMIT -1 OFFSET ?",
+                (upload_id, max(offset, 0))
+            )
+        ]
+
+    def update(self, upload_id: str, **fields: Any) -> None:
+        # Spill before taking the write lock; large results never enter the row
+        fields = self._prepare_fields(upload_id, fields)
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT data FROM jobs WHERE upload_id = ?", (upload_id,)).fetchone()
+            if row is None:
+                raise KeyError(upload_id)
+
+            job = json.loads(row[0])
+            job.update(fields)
+            conn.execute(
+                "UPDATE jobs SET status = ?, data = ?, updated_at = ? WHERE upload_id = ?",
+                (_status_value(job.get('status')), _dumps(job), time.time(), upload_id)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def append_log(self, upload_id: str, entry: Dict[str, Any]) -> None:
+        conn = self._connect()
+        conn.execute(
+            "INSERT INTO job_logs (upload_id, entry) VALUES (?, ?)",
+            (upload_id, _dumps(entry))
+        )
+
+    def delete(self, upload_id: str) -> bool:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute("DELETE FROM jobs WHERE upload_id = ?", (upload_id,))
+            conn.execute("DELETE FROM job_logs WHERE upload_id = ?", (upload_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._remove_files(upload_id)
+        return cursor.rowcount > 0
+
+    def count_by_status(self) -> Dict[str, int]:
+        conn = self._connect()
+        return {
+            status: count
+            for status, count in conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        }
+
+    def _finished_jobs(self) -> List[Tuple[str, float, int]]:
+        conn = self._connect()
+        statuses = sorted(TERMINAL_STATUSES)
+        return conn.execute(
+            "SELECT upload_id, updated_at, COALESCE(json_extract(data, '$.result_bytes'), 0) "
+            f"FROM jobs WHERE status IN ({', '.join('?' * len(statuses))})",
+            statuses
+        ).fetchall()
+
+
+def _status_value(status: Any) -> Optional[str]:
+    """Get the plain string value of a status enum."""
+    if status is None:
+        return None
+    return getattr(status, 'value', status)
+
+
+def _dumps(data: Any) -> str:
+    """Serialize job data (enums are str subclasses and dump as their value)."""
+    return json.dumps(data, ensure_ascii=False, default=str)
+
+
+# ============================================
+# FACTORY
+# ============================================
+
+_job_store: Optional[JobStore] = None
+
+
+def create_job_store(
+    backend: Optional[str] = None,
+    db_path: Optional[Path] = None,
+    result_dir: Optional[Path] = None
+) -> JobStore:
+    """Create a job store for the given backend (memory, sqlite)."""
+    backend = (backend or settings.JOB_STORE_BACKEND).lower()
+
+    if backend == "memory":
+        return InMemoryJobStore(result_dir)
+    elif backend == "sqlite":
+        return SQLiteJobStore(db_path, result_dir)
+    else:
+        raise ValueError(f"Unknown job store backend: {backend}")
+
+
+def get_job_store() -> JobStore:
+    """Get the configured job store (singleton per process)."""
+    global _job_store
+    if _job_store is None:
+        _job_store = create_job_store()
+        logger.info(f"Using {type(_job_store).__name__} for job state")
+    return _job_store
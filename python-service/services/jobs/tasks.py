@@ -0,0 +1,44 @@
+"""
+Interactive Tasks
+Module-level entry points for the interactive endpoints, run on the job
+executor's reserved workers (see JobExecutor.call). They return plain
+dicts so results can cross process boundaries.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+
+def extract_text_task(file_path: str, use_ocr: bool = False, ocr_provider: str = "easyocr") -> Dict[str, Any]:
+    """Extract text from a document (POST /extract-text)."""
+    from services.text_extractor import TextExtractor, release_session
+
+    try:
+        extracted = asyncio.run(TextExtractor().extract(
+            file_path,
+            use_ocr=use_ocr,
+            ocr_provider=ocr_provider
+        ))
+    finally:
+        release_session(file_path)
+    return extracted.model_dump()
+
+
+def detect_toc_task(
+    text: str,
+    pages: Optional[List[Dict[str, Any]]] = None,
+    ai_provider: str = "local"
+) -> Dict[str, Any]:
+    """Detect the table of contents of a text (POST /detect-toc)."""
+    from services.toc_detector import TocDetector
+
+    result = asyncio.run(TocDetector(ai_provider=ai_provider).detect(text, pages))
+    return result.model_dump()
+
+
+def split_content_task(pages: List[Dict[str, Any]], toc_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Split pages into chapters along a TOC (POST /split-content)."""
+    from services.content_splitter import ContentSplitter
+
+    chapters = asyncio.run(ContentSplitter().split(pages, toc_items))
+    return [chapter.model_dump() for chapter in chapters]
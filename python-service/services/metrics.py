@@ -0,0 +1,316 @@
+"""
+Service Metrics
+In-process counters, gauges and histograms rendered at /metrics in the
+Prometheus text exposition format, without any external dependency.
+
+Jobs running in worker processes record into the worker's own registry and
+send the accumulated values back with the job (see drain/merge), so the
+parent process serves the totals of all workers.
+"""
+
+import math
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+LabelKey = Tuple[str, ...]
+
+# Seconds; covers quick ABX splits up to long OCR runs
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+CONFIDENCE_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 1.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    """Base class: a named metric with optional labels."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelKey, Any] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+    def drain(self) -> Dict[LabelKey, float]:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: Dict[LabelKey, float]):
+        with self._lock:
+            for key, value in values.items():
+                key = tuple(key)
+                self._values[key] = self._values.get(key, 0) + value
+
+
+class Gauge(_Metric):
+    """Value that is set to the current state (e.g. queue depth)."""
+
+    type_name = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (the last one is +Inf), sum, count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            index = len(self.buckets)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    index = i
+                    break
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return state[2] if state else 0
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        bounds = self.buckets + (math.inf,)
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(bounds, counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+    def drain(self) -> Dict[LabelKey, list]:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: Dict[LabelKey, list]):
+        with self._lock:
+            for key, (counts, total, count) in values.items():
+                key = tuple(key)
+                state = self._values.get(key)
+                if state is None:
+                    state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                state[0] = [a + b for a, b in zip(state[0], counts)]
+                state[1] += total
+                state[2] += count
+
+
+class MetricsRegistry:
+    """A set of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format (version 0.0.4)."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def drain(self) -> Dict[str, Dict[LabelKey, Any]]:
+        """
+        Take and reset all counter and histogram values.
+        Used by worker processes to hand their metrics to the parent.
+        """
+        delta = {}
+        for name, metric in self._metrics.items():
+            if isinstance(metric, (Counter, Histogram)):
+                values = metric.drain()
+                if values:
+                    delta[name] = values
+        return delta
+
+    def merge(self, delta: Optional[Dict[str, Dict[LabelKey, Any]]]):
+        """Add values drained from another process."""
+        for name, values in (delta or {}).items():
+            metric = self._metrics.get(name)
+            if isinstance(metric, (Counter, Histogram)):
+                metric.merge(values)
+
+    def clear(self):
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+# ============================================
+# SERVICE METRICS
+# ============================================
+
+registry = MetricsRegistry()
+
+STEP_DURATION = registry.histogram(
+    "docproc_step_duration_seconds",
+    "Duration of completed processing steps.",
+    ["step"]
+)
+JOBS_FINISHED = registry.counter(
+    "docproc_jobs_finished_total",
+    "Processing jobs that reached a final status.",
+    ["status"]
+)
+PAGES_EXTRACTED = registry.counter(
+    "docproc_pages_extracted_total",
+    "Pages extracted; divide its rate by docproc_extraction_seconds_total for pages/s.",
+    ["method"]
+)
+CHARS_EXTRACTED = registry.counter(
+    "docproc_characters_extracted_total",
+    "Characters extracted; divide its rate by docproc_extraction_seconds_total for chars/s.",
+    ["method"]
+)
+EXTRACTION_SECONDS = registry.counter(
+    "docproc_extraction_seconds_total",
+    "Time spent extracting text.",
+    ["method"]
+)
+OCR_PAGE_CONFIDENCE = registry.histogram(
+    "docproc_ocr_page_confidence",
+    "Average OCR confidence per page.",
+    ["provider"],
+    buckets=CONFIDENCE_BUCKETS
+)
+OCR_CACHE_LOOKUPS = registry.counter(
+    "docproc_ocr_cache_lookups_total",
+    "OCR page cache lookups.",
+    ["result"]
+)
+AI_REQUEST_DURATION = registry.histogram(
+    "docproc_ai_request_duration_seconds",
+    "Latency of AI provider requests.",
+    ["provider"]
+)
+AI_REQUEST_ERRORS = registry.counter(
+    "docproc_ai_request_errors_total",
+    "AI provider requests that failed or returned unusable output.",
+    ["provider"]
+)
+QUEUE_DEPTH = registry.gauge(
+    "docproc_queue_depth",
+    "Jobs and interactive requests waiting for a worker.",
+    ["priority"]
+)
+RUNNING_JOBS = registry.gauge(
+    "docproc_running_jobs",
+    "Jobs and interactive requests currently running on a worker.",
+    ["priority"]
+)
+JOBS_BY_STATUS = registry.gauge(
+    "docproc_jobs",
+    "Jobs in the job store by status.",
+    ["status"]
+)
@@ -0,0 +1,169 @@
+"""
+Stage Profiler
+Per-job profiling mode (ProcessingOptions.profile). Each pipeline stage runs
+under cProfile and tracemalloc; the report keeps the top functions and the
+peak traced allocation of every stage, and the full profiles are written as
+pstats and collapsed-stack files (for flamegraph.pl or speedscope).
+
+cProfile only sees the thread running the job; work handed to other threads
+(e.g. the AI request during TOC detection) shows up as waiting time.
+tracemalloc is process-wide, so peaks of jobs profiled at the same time in
+one process overlap.
+"""
+
+import cProfile
+import logging
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+FuncKey = Tuple[str, int, str]
+
+# Collapsed stacks deeper than this are cut (recursive parsers)
+MAX_STACK_DEPTH = 64
+
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+
+
+def _start_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracemalloc_users += 1
+        tracemalloc.reset_peak()
+
+
+def _stop_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0:
+            tracemalloc.stop()
+
+
+def _function_name(func: FuncKey) -> str:
+    file_name, line, name = func
+    if file_name == "~":
+        return name  # Built-in, e.g. "<built-in method builtins.len>"
+    return f"{Path(file_name).name}:{line}({name})"
+
+
+class StageProfiler:
+    """
+    Profiles the stages of one job.
+
+    Usage:
+        profiler = StageProfiler(output_dir)
+        with profiler.stage("toc_detection"):
+            ...
+        profiler.reports  # One dict per stage
+    """
+
+    def __init__(self, output_dir: Path, top_n: Optional[int] = None):
+        self.output_dir = Path(output_dir)
+        self.top_n = settings.PROFILE_TOP_FUNCTIONS if top_n is None else top_n
+        self.reports: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile the code inside the block as one stage (also when it raises)."""
+        profile = cProfile.Profile()
+        _start_tracemalloc()
+        start_time = time.time()
+        profile.enable()
+
+        try:
+            yield
+        finally:
+            profile.disable()
+            duration = time.time() - start_time
+            _, peak = tracemalloc.get_traced_memory()
+            _stop_tracemalloc()
+
+            try:
+                self.reports.append(self._report(name, profile, duration, peak))
+            except Exception as e:
+                logger.warning(f"Failed to write profile of stage {name}: {e}")
+
+    def _report(self, name: str, profile: cProfile.Profile, duration: float, peak: int) -> Dict[str, Any]:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        order = len(self.reports) + 1
+        pstats_file = f"{order:02d}_{name}.pstats"
+        collapsed_file = f"{order:02d}_{name}.collapsed"
+
+        profile.dump_stats(str(self.output_dir / pstats_file))
+        stats = pstats.Stats(profile)
+        (self.output_dir / collapsed_file).write_text(collapsed_stacks(stats), encoding="utf-8")
+
+        return {
+            "stage": name,
+            "seconds": round(duration, 4),
+            "peak_memory_bytes": peak,
+            "top_functions": top_functions(stats, self.top_n),
+            "pstats_file": pstats_file,
+            "collapsed_file": collapsed_file,
+        }
+
+
+def top_functions(stats: pstats.Stats, limit: int) -> List[Dict[str, Any]]:
+    """Functions with the most time spent in themselves (not their callees)."""
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+    return [
+        {
+            "function": _function_name(func),
+            "calls": calls,
+            "self_seconds": round(self_time, 6),
+            "cumulative_seconds": round(cumulative, 6),
+        }
+        for func, (_, calls, self_time, cumulative, _) in rows
+    ]
+
+
+def collapsed_stacks(stats: pstats.Stats) -> str:
+    """
+    Render a profile as collapsed stacks ("a;b;c <microseconds>" per line).
+
+    cProfile only records caller/callee pairs, so the time of a function
+    called from several places is split between its stacks in proportion
+    to the time spent through each caller.
+    """
+    callees: Dict[FuncKey, Dict[FuncKey, float]] = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[func] = edge[3]
+
+    totals: Dict[str, float] = {}
+
+    def walk(func: FuncKey, stack: List[str], share: float, path: set):
+        self_time = stats.stats[func][2]
+        stack = stack + [_function_name(func).replace(";", ":")]
+        key = ";".join(stack)
+        totals[key] = totals.get(key, 0.0) + self_time * share
+
+        if len(stack) >= MAX_STACK_DEPTH:
+            return
+        for callee, edge_time in callees.get(func, {}).items():
+            callee_total = stats.stats[callee][3]
+            if callee in path or callee_total <= 0:
+                continue
+            callee_share = share * edge_time / callee_total
+            if callee_share * callee_total < 1e-6:
+                continue
+            walk(callee, stack, callee_share, path | {callee})
+
+    roots = [func for func, value in stats.stats.items() if not value[4]]
+    for root in roots:
+        walk(root, [], 1.0, {root})
+
+    lines = [f"{key} {round(seconds * 1e6)}" for key, seconds in totals.items() if round(seconds * 1e6) > 0]
+    return "\n".join(lines) + ("\n" if lines else "")
@@ -0,0 +1,130 @@
+"""
+Result Cache
+Content-addressed on-disk cache of finished pipeline results.
+Re-uploading the same file with the same options skips extraction, OCR and TOC parsing.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from models import ProcessingOptions
+from config import settings
+from .text_extractor.ocr_processor import PREPROCESS_VERSION
+
+logger = logging.getLogger(__name__)
+
+# Bump when extraction, TOC detection or splitting output changes,
+# so results produced by older code are not reused.
+# 2: per-page OCR classification, normalization profiles, pdfplumber page
+#    fallback, adaptive OCR resolution (ocr_dpi)
+EXTRACTOR_VERSION = "2"
+
+# Settings that change the pipeline's output, part of every cache key
+OUTPUT_SETTINGS = (
+    "MIN_TEXT_LENGTH_FOR_OCR",
+    "OCR_MIN_IMAGE_COVERAGE",
+    "OCR_MAX_BAD_GLYPH_RATIO",
+    "OCR_CONFIDENCE_THRESHOLD",
+    "OCR_DPI",
+    "OCR_DRAFT_DPI",
+    "OCR_DRAFT_MIN_TEXT_LENGTH",
+    "TOC_CONFIDENCE_THRESHOLD",
+)
+
+
+class ResultCache:
+    """
+    Cache pipeline results by SHA-256 of the file plus the processing options
+    and OUTPUT_SETTINGS that affect the output. Entries are gzipped JSON files; when the cache
+    grows past max_bytes the least recently used entries are evicted.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir or settings.RESULT_CACHE_DIR)
+        self.max_bytes = max_bytes or settings.RESULT_CACHE_MAX_BYTES
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(file_hash: str, options: ProcessingOptions) -> str:
+        """Build the cache key for a file hash and processing options."""
+        relevant = {
+            "version": EXTRACTOR_VERSION,
+            "file": file_hash,
+            "use_ocr": options.use_ocr,
+            "ocr_provider": options.ocr_provider,
+            "use_ai_parsing": options.use_ai_parsing,
+            "ai_provider": options.ai_provider if options.use_ai_parsing else None,
+            "preprocess_version": PREPROCESS_VERSION,
+            "settings": {name: getattr(settings, name) for name in OUTPUT_SETTINGS},
+        }
+        return hashlib.sha256(json.dumps(relevant, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached result, or None on a miss."""
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                result = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def set(self, key: str, result: Dict[str, Any]):
+        """Store a result and evict old entries if the cache is too large."""
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as f:
+                f.write(json.dumps(result, ensure_ascii=False, default=str).encode("utf-8"))
+            os.replace(tmp_name, self._path(key))
+        except Exception:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        self._evict()
+
+    def clear(self):
+        """Remove all cached results."""
+        for entry in self.cache_dir.glob("*.json.gz"):
+            entry.unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json.gz"
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits max_bytes."""
+        entries = []
+        total = 0
+        for entry in self.cache_dir.glob("*.json.gz"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            logger.info(f"Evicted cached result {entry.name}")
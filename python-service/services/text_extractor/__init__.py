@@ -1,5 +1,8 @@
-from .text_extractor import TextExtractor
-from .pdf_extractor import PDFExtractor
-from .ocr_processor import OCRProcessor
+from .text_extractor import TextExtractor, PageStream
+from .pdf_extractor import PDFExtractor, shutdown_extraction_pool
+from .ocr_processor import OCRProcessor, start_ocr_pool, shutdown_ocr_pool
+from .tesseract_engine import TesseractEngine, TesseractPage, TesseractWord
+from .page_classifier import PageClassifier, PageClassification
+from .document_session import DocumentSession, SessionCache, get_session, release_session, clear_sessions
 
-__all__ = ["TextExtractor", "PDFExtractor", "OCRProcessor"]
+__all__ = ["TextExtractor", "PageStream", "PDFExtractor", "OCRProcessor", "TesseractEngine", "TesseractPage", "TesseractWord", "PageClassifier", "PageClassification", "DocumentSession", "SessionCache", "get_session", "release_session", "clear_sessions", "shutdown_extraction_pool", "start_ocr_pool", "shutdown_ocr_pool"]
@@ -0,0 +1,235 @@
+"""
+Document Session
+One open document shared by every stage that reads it.
+
+A PDF is opened with PyMuPDF once per session; its metadata, outline, page
+count and page text are read on first use and kept. Whole-file extractions
+(ABX, DOCX) are kept the same way. Sessions live in a small LRU keyed by
+path, so back-to-back /extract-text and /process calls on the same file
+(in the same worker) reuse the open document.
+
+The text a session holds is only kept for the job reading it: jobs call
+release_session() when they finish, which drops the page text and
+whole-file extraction and leaves the document open.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from models import ExtractedText
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _file_signature(file_path: str) -> Tuple[int, int]:
+    """Size and modification time, to notice files replaced under the same path."""
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+class DocumentSession:
+    """
+    Lazily opened document with cached metadata and page text.
+
+    PyMuPDF documents are not thread-safe, so every access to the open
+    document goes through the session lock.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = str(file_path)
+        self.signature = _file_signature(self.file_path)
+        self.lock = threading.RLock()
+
+        self._doc: Optional[fitz.Document] = None
+        self._metadata: Optional[dict] = None
+        self._toc: Optional[List[list]] = None
+        self._page_text: Dict[int, str] = {}
+        self._image_coverage: Dict[int, float] = {}
+        self._file_hash: Optional[str] = None
+
+        # Whole-file extraction of non-PDF documents (ABX, DOCX)
+        self.extracted: Optional[ExtractedText] = None
+
+    @property
+    def file_hash(self) -> str:
+        """SHA-256 of the file (computed once, outside the session lock)."""
+        if self._file_hash is None:
+            sha256 = hashlib.sha256()
+            with open(self.file_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    sha256.update(chunk)
+            self._file_hash = sha256.hexdigest()
+        return self._file_hash
+
+    @property
+    def doc(self) -> fitz.Document:
+        """The open PDF (opened on first use)."""
+        with self.lock:
+            if self._doc is None:
+                logger.debug(f"Opening document session for {self.file_path}")
+                self._doc = fitz.open(self.file_path)
+            return self._doc
+
+    @property
+    def page_count(self) -> int:
+        with self.lock:
+            return len(self.doc)
+
+    @property
+    def metadata(self) -> dict:
+        with self.lock:
+            if self._metadata is None:
+                self._metadata = dict(self.doc.metadata or {})
+            return self._metadata
+
+    def get_toc(self) -> List[list]:
+        """Embedded outline as [level, title, page] entries."""
+        with self.lock:
+            if self._toc is None:
+                self._toc = self.doc.get_toc()
+            return [list(entry) for entry in self._toc]
+
+    def page_text(self, index: int, cache: bool = True) -> str:
+        """Raw text of a page (0-based), extracted once unless cache is False."""
+        with self.lock:
+            text = self._page_text.get(index)
+            if text is None:
+                text = self.doc[index].get_text("text")
+                if cache:
+                    self._page_text[index] = text
+            return text
+
+    def image_coverage(self, index: int) -> float:
+        """Share of a page (0-based) covered by images, 0 to 1 (overlaps are not subtracted)."""
+        with self.lock:
+            coverage = self._image_coverage.get(index)
+            if coverage is None:
+                page = self.doc[index]
+                page_area = abs(page.rect)
+                covered = 0.0
+                if page_area:
+                    for image in page.get_images():
+                        for rect in page.get_image_rects(image[0]):
+                            covered += abs(rect & page.rect)
+                coverage = min(covered / page_area, 1.0) if page_area else 0.0
+                self._image_coverage[index] = coverage
+            return coverage
+
+    def get_pixmap(self, index: int, dpi: int, grayscale: bool = False) -> fitz.Pixmap:
+        """Render a page (0-based) for OCR, in RGB or grayscale (one byte per pixel)."""
+        with self.lock:
+            colorspace = fitz.csGRAY if grayscale else fitz.csRGB
+            return self.doc[index].get_pixmap(dpi=dpi, colorspace=colorspace, alpha=False)
+
+    def is_current(self) -> bool:
+        """False if the file changed or disappeared since the session was opened."""
+        try:
+            return _file_signature(self.file_path) == self.signature
+        except OSError:
+            return False
+
+    def release(self):
+        """Drop the cached page text and whole-file extraction, keeping the document open."""
+        with self.lock:
+            self._page_text.clear()
+            self.extracted = None
+
+    def close(self):
+        """Close the document and drop everything cached (reopened on next use)."""
+        with self.lock:
+            if self._doc is not None:
+                self._doc.close()
+                self._doc = None
+            self._page_text.clear()
+            self._image_coverage.clear()
+            self.extracted = None
+
+
+class SessionCache:
+    """
+    Least recently used sessions, keyed by resolved path.
+
+    Evicted and replaced sessions are closed. A job that still holds one
+    can keep using it: the document is reopened on its next access.
+    """
+
+    def __init__(self, max_sessions: Optional[int] = None):
+        self.max_sessions = settings.DOCUMENT_SESSION_CACHE_SIZE if max_sessions is None else max_sessions
+        self._sessions: "OrderedDict[str, DocumentSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, file_path: str) -> DocumentSession:
+        """Get the session of a file, opening a new one if needed."""
+        key = str(Path(file_path).resolve())
+
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None and session.is_current():
+                self._sessions.move_to_end(key)
+                return session
+            if session is not None:
+                session.close()  # File replaced under the same path
+
+            session = DocumentSession(file_path)
+            if self.max_sessions > 0:
+                self._sessions[key] = session
+                self._sessions.move_to_end(key)
+                while len(self._sessions) > self.max_sessions:
+                    _, evicted = self._sessions.popitem(last=False)
+                    evicted.close()
+            return session
+
+    def release(self, file_path: str):
+        """Drop the cached text of a file's session, if it has one."""
+        with self._lock:
+            session = self._sessions.get(str(Path(file_path).resolve()))
+        if session is not None:
+            session.release()
+
+    def discard(self, file_path: str):
+        """Forget the session of a file."""
+        with self._lock:
+            session = self._sessions.pop(str(Path(file_path).resolve()), None)
+        if session is not None:
+            session.close()
+
+    def clear(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+_session_cache: Optional[SessionCache] = None
+
+
+def get_session(file_path: str) -> DocumentSession:
+    """Get the shared session of a file (one cache per process)."""
+    global _session_cache
+    if _session_cache is None:
+        _session_cache = SessionCache()
+    return _session_cache.get(file_path)
+
+
+def release_session(file_path: str):
+    """Drop the text cached for a file once the job reading it has finished."""
+    if _session_cache is not None:
+        _session_cache.release(file_path)
+
+
+def clear_sessions():
+    """Forget all shared sessions of this process (e.g. between benchmark runs)."""
+    if _session_cache is not None:
+        _session_cache.clear()
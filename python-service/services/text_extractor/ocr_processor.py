@@ -3,18 +3,41 @@ OCR Processor
 Extracts text from scanned/image-based PDFs using EasyOCR and Tesseract.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
 from PIL import Image
-import io
-import fitz  # PyMuPDF for PDF to image conversion
+import fitz  # PyMuPDF
 
 from models import PageContent
 from config import settings
+from ..jobs.cancellation import CancellationToken, JobCancelledError, check_cancelled
+from ..jobs.executor import worker_cpus
+from .. import metrics
+from .document_session import get_session
+from .tesseract_engine import TesseractEngine
 
 logger = logging.getLogger(__name__)
 
+# Bump when page rendering or image preprocessing changes,
+# so pages OCRed by older code are not reused from the OCR cache.
+PREPROCESS_VERSION = "2"
+
+# Pages smaller than this on their short side (in pixels) are upscaled before OCR
+MIN_OCR_DIMENSION = 1000
+
 # Lazy load OCR libraries (they're heavy)
 _easyocr_reader = None
 _tesseract_available = None
@@ -54,68 +77,461 @@ def check_tesseract():
     return _tesseract_available
 
 
+# OCR worker pools, one per provider (per process, created on first use)
+_pools: Dict[str, Tuple[ProcessPoolExecutor, int]] = {}
+_pool_lock = threading.Lock()
+
+
+def _init_ocr_worker(provider: str, threads: int):
+    """Pool worker initializer: load the OCR engine once, for the worker's lifetime."""
+    # Share the CPUs between workers instead of every engine using all of them
+    os.environ.setdefault("OMP_NUM_THREADS", str(threads))
+    _preload_engine(provider)
+
+
+def _preload_engine(provider: str):
+    """Load a provider's OCR engine in this process (failures are only logged)."""
+    try:
+        if provider == "tesseract":
+            check_tesseract()
+        elif provider != "google":
+            get_easyocr_reader()
+    except Exception as e:
+        logger.warning(f"Could not preload the {provider} OCR engine: {e}")
+
+
+def _ocr_pages_worker(
+    file_path: str,
+    page_indexes: List[int],
+    provider: str,
+    dpi: int
+) -> List[Tuple[str, float]]:
+    """Pool worker: render and OCR a batch of pages, returning (text, confidence) per page."""
+    processor = OCRProcessor(provider, workers=0)
+    return asyncio.run(processor._recognize_pages(file_path, page_indexes, dpi))
+
+
+def _get_pool(provider: str, workers: int) -> ProcessPoolExecutor:
+    with _pool_lock:
+        pool, pool_workers = _pools.get(provider, (None, 0))
+        if pool is None or pool_workers != workers:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+            # spawn: workers must not inherit open documents or the event loop
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_ocr_worker,
+                initargs=(provider, max(1, worker_cpus() // workers))
+            )
+            _pools[provider] = (pool, workers)
+        return pool
+
+
+def _discard_pool(provider: str, pool: ProcessPoolExecutor):
+    """Drop a pool whose worker died; the next _get_pool() starts fresh workers."""
+    with _pool_lock:
+        if _pools.get(provider, (None, 0))[0] is pool:
+            del _pools[provider]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def start_ocr_pool(provider: str, workers: Optional[int] = None):
+    """
+    Start the OCR workers of a provider ahead of the first OCR request, or
+    load its engine in this process when OCR runs here (one worker or none).
+    """
+    workers = OCRProcessor(provider, workers).workers
+    if workers > 1:
+        pool = _get_pool(provider, workers)
+        for _ in range(workers):
+            pool.submit(os.getpid)
+    else:
+        _preload_engine(provider)
+
+
+def shutdown_ocr_pool():
+    """Stop the OCR workers of this process."""
+    with _pool_lock:
+        pools = [pool for pool, _ in _pools.values()]
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _pixmap_image(pix: fitz.Pixmap) -> Image.Image:
+    """A grayscale pixmap as a PIL image reading its samples in place (the pixmap must outlive it)."""
+    return Image.frombuffer("L", (pix.width, pix.height), pix.samples_mv, "raw", "L", pix.stride, 1)
+
+
+def _pixmap_array(pix: fitz.Pixmap):
+    """A grayscale pixmap as a NumPy array viewing its samples (the pixmap must outlive it)."""
+    import numpy as np
+
+    rows = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.stride)
+    return rows[:, :pix.width]
+
+
+def _drop(in_flight: Deque[Tuple[List[int], asyncio.Task]]):
+    """Cancel queued batches and consume the errors of failed ones."""
+    while in_flight:
+        _, future = in_flight.popleft()
+        if future.done() and not future.cancelled():
+            future.exception()
+        else:
+            future.cancel()
+
+
 class OCRProcessor:
     """
     Process scanned PDFs using OCR.
     Supports EasyOCR (primary) and Tesseract (fallback).
+
+    Pages are OCRed on a pool of OCR_WORKERS worker processes (at most the
+    job worker's share of the CPUs), each with its engine loaded once:
+    whole documents in parallel, pages still coming out in order, and the
+    single pages of hybrid extraction one at a time. A
+    worker that dies takes the pool down with it, so the pool is restarted
+    (up to OCR_WORKER_MAX_RESTARTS times per document) and the pages that
+    were in flight are OCRed again.
+
+    With Tesseract, pages go through the engine in batches of
+    OCR_TESSERACT_BATCH_PAGES (one Tesseract run per batch); the other
+    engines take one page at a time.
+
+    Pages are first rendered at OCR_DRAFT_DPI and only rendered again at
+    OCR_DPI when the draft's confidence is below OCR_CONFIDENCE_THRESHOLD or
+    it has fewer than OCR_DRAFT_MIN_TEXT_LENGTH characters; the resolution
+    each page's text came from is kept in PageContent.ocr_dpi. Results are
+    cached per resolution, and pages found in the OCR cache are not rendered
+    or OCRed at all.
     """
 
-    def __init__(self, provider: str = "easyocr"):
+    def __init__(self, provider: str = "easyocr", workers: Optional[int] = None):
         """
         Initialize OCR processor.
 
         Args:
             provider: OCR provider to use (easyocr, tesseract, google)
+            workers: OCR worker processes (default OCR_WORKERS; 0 or 1 = OCR in this process)
         """
         self.provider = provider
-        self.dpi = 300  # Resolution for PDF to image conversion
-
-    async def process_pdf(self, file_path: str) -> List[PageContent]:
+        self.dpi = settings.OCR_DPI  # Resolution for PDF to image conversion
+        self.draft_dpi = settings.OCR_DRAFT_DPI  # Tried first; 0 = always self.dpi
+        workers = settings.OCR_WORKERS if workers is None else workers
+        self.workers = min(workers, worker_cpus())
+        self.cache = get_ocr_cache() if settings.OCR_CACHE_ENABLED else None
+        self.batch_pages = max(1, settings.OCR_TESSERACT_BATCH_PAGES) if provider == "tesseract" else 1
+
+    async def process_pdf(
+        self,
+        file_path: str,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> List[PageContent]:
         """
         Process all pages of a PDF using OCR.
 
         Args:
             file_path: Path to the PDF file
+            cancel_token: Checked before each page; raises JobCancelledError
 
         Returns:
             List of PageContent with OCR text
         """
+        return [page async for page in self.iter_pages(file_path, cancel_token)]
+
+    async def iter_pages(
+        self,
+        file_path: str,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> AsyncIterator[PageContent]:
+        """
+        OCR a PDF page by page, yielding each page when it is done.
+
+        Args:
+            file_path: Path to the PDF file
+            cancel_token: Checked before each page; raises JobCancelledError
+        """
         logger.info(f"Processing PDF with OCR: {file_path}")
-        pages = []
+        page_num = 0
 
         try:
-            doc = fitz.open(file_path)
-            total_pages = len(doc)
+            session = get_session(file_path)
+            total_pages = session.page_count
+
+            if self.workers > 1 and total_pages > self.batch_pages:
+                async for page in self._iter_parallel(file_path, total_pages, cancel_token):
+                    page_num = page.page_number
+                    yield page
+            else:
+                recognize = self._local_recognizer(file_path)
+                for start in range(0, total_pages, self.batch_pages):
+                    check_cancelled(cancel_token)
+                    indexes = list(range(start, min(start + self.batch_pages, total_pages)))
+                    logger.info(f"OCR processing pages {start + 1}-{indexes[-1] + 1}/{total_pages}")
+                    for page in await self._ocr_adaptive(file_path, indexes, recognize):
+                        page_num = page.page_number
+                        yield page
 
-            for page_num in range(total_pages):
-                logger.info(f"OCR processing page {page_num + 1}/{total_pages}")
+            logger.info(f"OCR completed for {total_pages} pages")
 
-                # Convert PDF page to image
-                page = doc[page_num]
-                pix = page.get_pixmap(dpi=self.dpi)
-                img_data = pix.tobytes("png")
-                image = Image.open(io.BytesIO(img_data))
+        except JobCancelledError:
+            logger.info(f"OCR cancelled after {page_num} pages")
+            raise
 
-                # Preprocess image
-                image = self._preprocess_image(image)
+        except Exception as e:
+            logger.error(f"OCR processing failed: {e}")
+            raise
 
-                # Run OCR
-                text, confidence = await self._run_ocr(image)
+    async def _iter_parallel(
+        self,
+        file_path: str,
+        total_pages: int,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> AsyncIterator[PageContent]:
+        """
+        OCR pages on the worker pool, yielding them in page order.
 
-                pages.append(PageContent(
-                    page_number=page_num + 1,
-                    text=text,
-                    confidence=confidence,
-                    is_ocr=True
-                ))
+        At most two pages per worker are in flight, so finished pages do not
+        pile up ahead of a slow consumer.
+        """
+        pending = deque(
+            list(range(start, min(start + self.batch_pages, total_pages)))
+            for start in range(0, total_pages, self.batch_pages)
+        )
+        in_flight: Deque[Tuple[List[int], asyncio.Task]] = deque()
+        restarts = 0
+        logger.info(f"OCR of {total_pages} pages on {self.workers} workers")
+        recognize = self._pool_recognizer(file_path)
 
-            doc.close()
-            logger.info(f"OCR completed for {total_pages} pages")
-            return pages
+        try:
+            while pending or in_flight:
+                while pending and len(in_flight) < 2 * self.workers:
+                    check_cancelled(cancel_token)
+                    indexes = pending.popleft()
+                    task = asyncio.ensure_future(self._ocr_adaptive(file_path, indexes, recognize))
+                    in_flight.append((indexes, task))
+
+                try:
+                    pages = await in_flight[0][1]
+                except BrokenProcessPool:
+                    # Pages that finished in the meantime come back from the cache
+                    restarts += 1
+                    if restarts > settings.OCR_WORKER_MAX_RESTARTS:
+                        raise
+                    logger.warning(
+                        f"OCR worker died with {len(in_flight)} batches in flight, "
+                        f"restarting the pool ({restarts}/{settings.OCR_WORKER_MAX_RESTARTS})"
+                    )
+                    pending.extendleft(reversed([indexes for indexes, _ in in_flight]))
+                    _drop(in_flight)
+                    continue
+
+                in_flight.popleft()
+                for page in pages:
+                    check_cancelled(cancel_token)
+                    yield page
+
+        finally:
+            _drop(in_flight)
+
+    @property
+    def max_in_flight(self) -> int:
+        """Page groups worth keeping in flight: two per pool worker, so none idles; one without a pool."""
+        return 2 * self.workers if self.workers > 1 else 1
+
+    async def ocr_page(self, file_path: str, page_index: int) -> PageContent:
+        """
+        OCR a single PDF page.
 
-        except Exception as e:
-            logger.error(f"OCR processing failed: {e}")
-            raise
+        Args:
+            file_path: Path to the PDF file
+            page_index: Page index (0-based)
+        """
+        pages = await self.ocr_pages(file_path, [page_index])
+        return pages[0]
+
+    async def ocr_pages(self, file_path: str, page_indexes: List[int]) -> List[PageContent]:
+        """
+        OCR a group of PDF pages (hybrid extraction), on the worker pool when
+        there is one so the engine is not loaded in the job process. Several
+        groups can be OCRed at once; keep at most max_in_flight of them
+        running.
+
+        Args:
+            file_path: Path to the PDF file
+            page_indexes: Pages (0-based)
+
+        Returns:
+            PageContent per page, in the order given
+        """
+        if self.workers <= 1:
+            return await self._ocr_adaptive(file_path, page_indexes, self._local_recognizer(file_path))
+
+        recognize = self._pool_recognizer(file_path)
+        restarts = 0
+        while True:
+            try:
+                return await self._ocr_adaptive(file_path, page_indexes, recognize)
+            except BrokenProcessPool:
+                # Pages finished by other workers come back from the cache
+                restarts += 1
+                if restarts > settings.OCR_WORKER_MAX_RESTARTS:
+                    raise
+                logger.warning(
+                    f"OCR worker died on page {page_indexes[0] + 1}, "
+                    f"restarting the pool ({restarts}/{settings.OCR_WORKER_MAX_RESTARTS})"
+                )
+
+    def _local_recognizer(
+        self,
+        file_path: str
+    ) -> Callable[[List[int], int], Awaitable[List[Tuple[str, float]]]]:
+        """Recognize callback for _ocr_adaptive OCRing in this process."""
+        async def recognize(indexes: List[int], dpi: int) -> List[Tuple[str, float]]:
+            return await self._recognize_pages(file_path, indexes, dpi)
+        return recognize
+
+    def _pool_recognizer(
+        self,
+        file_path: str
+    ) -> Callable[[List[int], int], Awaitable[List[Tuple[str, float]]]]:
+        """Recognize callback for _ocr_adaptive OCRing on the worker pool."""
+        async def recognize(indexes: List[int], dpi: int) -> List[Tuple[str, float]]:
+            pool = _get_pool(self.provider, self.workers)
+            try:
+                future = pool.submit(_ocr_pages_worker, file_path, indexes, self.provider, dpi)
+                return await asyncio.wrap_future(future)
+            except BrokenProcessPool:
+                _discard_pool(self.provider, pool)
+                raise
+        return recognize
+
+    def resolutions(self) -> Tuple[int, ...]:
+        """Resolutions a page is tried at, in order."""
+        if 0 < self.draft_dpi < self.dpi:
+            return self.draft_dpi, self.dpi
+        return (self.dpi,)
+
+    def _good_enough(self, text: str, confidence: float) -> bool:
+        """Whether a draft OCR result can be kept without rendering the page again."""
+        return (
+            confidence >= settings.OCR_CONFIDENCE_THRESHOLD
+            and len(text.strip()) >= settings.OCR_DRAFT_MIN_TEXT_LENGTH
+        )
+
+    async def _ocr_adaptive(
+        self,
+        file_path: str,
+        page_indexes: List[int],
+        recognize: Callable[[List[int], int], Awaitable[List[Tuple[str, float]]]]
+    ) -> List[PageContent]:
+        """
+        OCR pages, each at the first resolution giving a good enough result.
+
+        Args:
+            file_path: Path to the PDF file
+            page_indexes: Pages (0-based) OCRed together
+            recognize: Renders and OCRs (page indexes, dpi), here or on a pool worker
+        """
+        resolutions = self.resolutions()
+        results: Dict[int, Tuple[str, float, int, bool]] = {}  # text, confidence, dpi, freshly OCRed
+        remaining = list(page_indexes)
+
+        for dpi in resolutions:
+            keys = {index: self._cache_key(file_path, index, dpi) for index in remaining}
+            found = {index: self._cache_get(keys[index]) for index in remaining}
+            missing = [index for index in remaining if found[index] is None]
+            if missing:
+                for index, (text, confidence) in zip(missing, await recognize(missing, dpi)):
+                    self._cache_set(keys[index], index, text, confidence)
+                    found[index] = (text, confidence)
+
+            for index in remaining:
+                results[index] = (*found[index], dpi, index in missing)
+
+            if dpi == resolutions[-1]:
+                break
+            remaining = [index for index in remaining if not self._good_enough(*found[index])]
+            if not remaining:
+                break
+            logger.info(
+                f"Pages {', '.join(str(index + 1) for index in remaining)}: too little text or "
+                f"confidence at {dpi} DPI, rendering again at {resolutions[-1]} DPI"
+            )
+
+        pages = []
+        for index in page_indexes:
+            text, confidence, dpi, fresh = results[index]
+            if fresh:
+                # Recorded here so pages OCRed in pool workers count in this process
+                metrics.OCR_PAGE_CONFIDENCE.observe(confidence, provider=self.provider)
+            pages.append(self._page_content(index, text, confidence, dpi))
+        return pages
+
+    def _cache_key(self, file_path: str, page_index: int, dpi: int) -> Optional[str]:
+        if self.cache is None:
+            return None
+        file_hash = get_session(file_path).file_hash
+        return OCRCache.make_key(file_hash, page_index + 1, self.provider, dpi)
+
+    def _cache_get(self, cache_key: Optional[str]) -> Optional[Tuple[str, float]]:
+        if cache_key is None:
+            return None
+        cached = self.cache.get(cache_key)
+        metrics.OCR_CACHE_LOOKUPS.inc(result="miss" if cached is None else "hit")
+        return cached
+
+    def _cache_set(self, cache_key: Optional[str], page_index: int, text: str, confidence: float):
+        if cache_key is None:
+            return
+        try:
+            self.cache.set(cache_key, text, confidence)
+        except OSError as e:
+            logger.warning(f"Could not cache OCR of page {page_index + 1}: {e}")
+
+    async def _recognize_pages(self, file_path: str, page_indexes: List[int], dpi: int) -> List[tuple[str, float]]:
+        """Render, preprocess and OCR pages; Tesseract reads a whole batch in one run."""
+        if self.provider != "tesseract" or len(page_indexes) == 1:
+            return [await self._recognize_page(file_path, index, dpi) for index in page_indexes]
+
+        session = get_session(file_path)
+
+        def images():
+            # Rendered one by one as the engine takes them: each pixmap stays
+            # referenced until the engine asks for the next page, so only one
+            # page raster is alive at a time
+            for index in page_indexes:
+                pix = session.get_pixmap(index, dpi, grayscale=True)
+                yield self._preprocess_image(_pixmap_image(pix))
+                del pix  # Freed before the next page is rendered
+
+        return await self._run_ocr_batch(images())
+
+    async def _recognize_page(self, file_path: str, page_index: int, dpi: int) -> tuple[str, float]:
+        """Render, preprocess and OCR one page."""
+        # Rendered in grayscale, which every engine takes, and handed over
+        # without a PNG encode / decode or colour conversion. pix is kept
+        # referenced here while the engine reads its samples.
+        pix = get_session(file_path).get_pixmap(page_index, dpi, grayscale=True)
+
+        if self.provider == "easyocr" and min(pix.width, pix.height) >= MIN_OCR_DIMENSION:
+            # EasyOCR works on arrays: skip the PIL image and its copy
+            page = _pixmap_array(pix)
+        else:
+            page = self._preprocess_image(_pixmap_image(pix))
+
+        # Run OCR
+        return await self._run_ocr(page)
+
+    def _page_content(self, page_index: int, text: str, confidence: float, dpi: int) -> PageContent:
+        return PageContent(
+            page_number=page_index + 1,
+            text=text,
+            confidence=confidence,
+            is_ocr=True,
+            ocr_dpi=dpi
+        )
 
     async def process_image(self, image: Image.Image) -> tuple[str, float]:
         """
@@ -134,14 +550,13 @@ class OCRProcessor:
         """
         Preprocess image for better OCR results.
         """
-        # Convert to RGB if necessary
-        if image.mode != "RGB":
+        # Grayscale stays as it is; other modes are converted to RGB
+        if image.mode not in ("L", "RGB"):
             image = image.convert("RGB")
 
         # Resize if too small
-        min_dimension = 1000
-        if min(image.size) < min_dimension:
-            scale = min_dimension / min(image.size)
+        if min(image.size) < MIN_OCR_DIMENSION:
+            scale = MIN_OCR_DIMENSION / min(image.size)
             new_size = (int(image.size[0] * scale), int(image.size[1] * scale))
             image = image.resize(new_size, Image.Resampling.LANCZOS)
 
@@ -150,6 +565,8 @@ class OCRProcessor:
     async def _run_ocr(self, image: Image.Image) -> tuple[str, float]:
         """
         Run OCR on an image using the configured provider.
+        With EasyOCR, rendered pages arrive as a NumPy array (which the
+        Tesseract fallback also accepts).
         """
         if self.provider == "easyocr":
             return await self._ocr_easyocr(image)
@@ -161,6 +578,15 @@ class OCRProcessor:
             # Default to EasyOCR
             return await self._ocr_easyocr(image)
 
+    async def _run_ocr_batch(self, images: Iterable[Image.Image]) -> List[tuple[str, float]]:
+        """
+        Run OCR on several images: in one engine run with Tesseract, one by
+        one with the other providers.
+        """
+        if self.provider == "tesseract":
+            return await self._ocr_tesseract_batch(images)
+        return [await self._run_ocr(image) for image in images]
+
     async def _ocr_easyocr(self, image: Image.Image) -> tuple[str, float]:
         """Run OCR using EasyOCR."""
         try:
@@ -168,8 +594,8 @@ class OCRProcessor:
 
             reader = get_easyocr_reader()
 
-            # Convert PIL Image to numpy array
-            img_array = np.array(image)
+            # PIL images are converted; arrays (rendered pages) are used as they are
+            img_array = image if isinstance(image, np.ndarray) else np.asarray(image)
 
             # Run OCR
             results = reader.readtext(img_array, detail=1)
@@ -204,35 +630,19 @@ class OCRProcessor:
 
     async def _ocr_tesseract(self, image: Image.Image) -> tuple[str, float]:
         """Run OCR using Tesseract."""
-        try:
-            import pytesseract
-
-            pytesseract.pytesseract.tesseract_cmd = settings.TESSERACT_CMD
-
-            # Run OCR with Arabic language
-            text = pytesseract.image_to_string(
-                image,
-                lang='ara+eng',  # Arabic + English
-                config='--psm 6'  # Assume uniform block of text
-            )
-
-            # Get confidence data
-            data = pytesseract.image_to_data(
-                image,
-                lang='ara+eng',
-                output_type=pytesseract.Output.DICT
-            )
-
-            # Calculate average confidence
-            confidences = [int(c) for c in data['conf'] if int(c) > 0]
-            avg_confidence = sum(confidences) / len(confidences) / 100 if confidences else 0.0
-
-            return text.strip(), avg_confidence
+        results = await self._ocr_tesseract_batch([image])
+        return results[0]
 
+    async def _ocr_tesseract_batch(self, images: Iterable[Image.Image]) -> List[tuple[str, float]]:
+        """Run OCR on several images in one Tesseract run (TSV: text and confidences in one pass)."""
+        try:
+            pages = TesseractEngine().recognize(images)
         except Exception as e:
             logger.error(f"Tesseract OCR failed: {e}")
             raise
 
+        return [(page.text, page.confidence) for page in pages]
+
     async def _ocr_google(self, image: Image.Image) -> tuple[str, float]:
         """Run OCR using Google Cloud Vision."""
         if not settings.GOOGLE_CLOUD_KEY:
@@ -294,29 +704,141 @@ class OCRProcessor:
 
 class OCRCache:
     """
-    Cache OCR results to avoid re-processing.
-    Uses file hash and page number as key.
+    Cache OCR results of PDF pages, so re-running a job (after a crash, or
+    with other TOC options) does not OCR the same pages again.
+
+    Keys are built from the SHA-256 of the file, the page, the provider, the
+    DPI and PREPROCESS_VERSION. Entries are small JSON files (text and
+    confidence) sharded into subdirectories by the first two characters of
+    the key. When the cache grows past max_bytes the least recently used
+    entries are evicted down to 90% of it.
+
+    The size on disk is counted by scanning the directory on the first write
+    and again every OCR_CACHE_SCAN_INTERVAL seconds; in between, only this
+    process's writes are added. The limit is therefore approximate: the
+    cache can exceed max_bytes by what other processes wrote since the last
+    scan. Use get_ocr_cache() to share one instance (and one count) per
+    process.
     """
 
-    def __init__(self, cache_dir: Optional[Path] = None):
-        self.cache_dir = cache_dir or settings.TEMP_DIR / "ocr_cache"
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_bytes: Optional[int] = None,
+        scan_interval: Optional[float] = None
+    ):
+        self.cache_dir = Path(cache_dir or settings.OCR_CACHE_DIR)
+        self.max_bytes = max_bytes or settings.OCR_CACHE_MAX_BYTES
+        self.scan_interval = settings.OCR_CACHE_SCAN_INTERVAL if scan_interval is None else scan_interval
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._size: Optional[int] = None  # Bytes on disk as of the last scan, plus our writes since
+        self._scanned_at = 0.0
+        self._size_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(file_hash: str, page_number: int, provider: str, dpi: int) -> str:
+        """Build the cache key of one OCRed page."""
+        relevant = {
+            "version": PREPROCESS_VERSION,
+            "file": file_hash,
+            "page": page_number,
+            "provider": provider,
+            "dpi": dpi,
+        }
+        return hashlib.sha256(json.dumps(relevant, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Get a cached (text, confidence), or None on a miss."""
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            result = entry["text"], float(entry["confidence"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Dropping unreadable OCR cache entry {key}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def set(self, key: str, text: str, confidence: float):
+        """Store the OCR result of a page and evict old entries if the cache is too large."""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        data = json.dumps({"text": text, "confidence": confidence}, ensure_ascii=False).encode("utf-8")
+
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, path)
+        except Exception:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
 
-    def get(self, file_hash: str, page_number: int) -> Optional[str]:
-        """Get cached OCR result."""
-        cache_file = self.cache_dir / f"{file_hash}_{page_number}.txt"
-        if cache_file.exists():
-            return cache_file.read_text(encoding="utf-8")
-        return None
-
-    def set(self, file_hash: str, page_number: int, text: str):
-        """Cache OCR result."""
-        cache_file = self.cache_dir / f"{file_hash}_{page_number}.txt"
-        cache_file.write_text(text, encoding="utf-8")
+        with self._size_lock:
+            if self._size is None or time.monotonic() - self._scanned_at >= self.scan_interval:
+                # Also picks up what other processes wrote
+                self._size = sum(size for _, size, _ in self._entries())
+                self._scanned_at = time.monotonic()
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
 
     def clear(self):
         """Clear all cached results."""
-        import shutil
         if self.cache_dir.exists():
             shutil.rmtree(self.cache_dir)
             self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._size = None
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for entry in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        return entries
+
+    def _evict(self):
+        """Delete least recently used entries until the cache is under 90% of max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+
+        if total > self.max_bytes:
+            target = self.max_bytes * 0.9
+            evicted = 0
+            entries.sort()
+            for _, size, entry in entries:
+                if total <= target:
+                    break
+                entry.unlink(missing_ok=True)
+                total -= size
+                evicted += 1
+            logger.info(f"Evicted {evicted} cached OCR pages")
+
+        self._size = total
+        self._scanned_at = time.monotonic()
+
+
+_ocr_cache: Optional[OCRCache] = None
+
+
+def get_ocr_cache() -> OCRCache:
+    """Get the shared OCR cache of this process."""
+    global _ocr_cache
+    if _ocr_cache is None or _ocr_cache.cache_dir != Path(settings.OCR_CACHE_DIR):
+        _ocr_cache = OCRCache()
+    return _ocr_cache
@@ -0,0 +1,95 @@
+"""
+Page Classifier
+Decides per PDF page whether its text layer can be used or the page has to
+be OCRed, so mixed books (scanned cover and front matter, then real text)
+only OCR the pages that need it.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from config import settings
+from .document_session import DocumentSession
+
+logger = logging.getLogger(__name__)
+
+# Glyphs a PDF font without a usable Unicode mapping extracts to:
+# replacement characters, private use code points and control characters
+_BAD_GLYPHS = re.compile(r"[\ufffd\ue000-\uf8ff\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class PageClassification:
+    """Whether a page needs OCR, and why."""
+    needs_ocr: bool
+    reason: str  # text, garbled, image, sparse
+    text_length: int
+    bad_glyph_ratio: float = 0.0
+    image_coverage: Optional[float] = None  # Only measured for short pages
+
+
+def bad_glyph_ratio(text: str) -> float:
+    """Share of non-whitespace characters that are unmapped glyphs."""
+    visible = len(_WHITESPACE.sub("", text))
+    if not visible:
+        return 0.0
+    return len(_BAD_GLYPHS.findall(text)) / visible
+
+
+class PageClassifier:
+    """
+    Classify PDF pages from their extracted text and image coverage.
+
+    A page is OCRed when its text is mostly unmapped glyphs, or when it has
+    less than MIN_TEXT_LENGTH_FOR_OCR characters and images cover at least
+    OCR_MIN_IMAGE_COVERAGE of it. Short pages without images (blank pages,
+    title pages) keep their text.
+    """
+
+    def __init__(
+        self,
+        min_text_length: Optional[int] = None,
+        min_image_coverage: Optional[float] = None,
+        max_bad_glyph_ratio: Optional[float] = None
+    ):
+        self.min_text_length = settings.MIN_TEXT_LENGTH_FOR_OCR if min_text_length is None else min_text_length
+        self.min_image_coverage = (
+            settings.OCR_MIN_IMAGE_COVERAGE if min_image_coverage is None else min_image_coverage
+        )
+        self.max_bad_glyph_ratio = (
+            settings.OCR_MAX_BAD_GLYPH_RATIO if max_bad_glyph_ratio is None else max_bad_glyph_ratio
+        )
+
+    def classify(self, session: DocumentSession, index: int, text: str) -> PageClassification:
+        """
+        Classify one page.
+
+        Args:
+            session: Session of the PDF
+            index: Page index (0-based)
+            text: Text extracted from the page's text layer
+        """
+        text_length = len(text.strip())
+
+        ratio = bad_glyph_ratio(text)
+        if ratio > self.max_bad_glyph_ratio:
+            return PageClassification(True, "garbled", text_length, ratio)
+
+        if text_length >= self.min_text_length:
+            return PageClassification(False, "text", text_length, ratio)
+
+        # Images are only looked at for short pages
+        try:
+            coverage = session.image_coverage(index)
+        except Exception as e:
+            # Pages PyMuPDF cannot read (pdfplumber fallback) cannot be rendered for OCR either
+            logger.warning(f"Could not measure images on page {index + 1}: {e}")
+            return PageClassification(False, "sparse", text_length, ratio)
+
+        if coverage >= self.min_image_coverage:
+            return PageClassification(True, "image", text_length, ratio, coverage)
+
+        return PageClassification(False, "sparse", text_length, ratio, coverage)
@@ -3,35 +3,102 @@ PDF Text Extractor
 Extracts text from PDF files using PyMuPDF and pdfplumber.
 """
 
-import fitz  # PyMuPDF
+import asyncio
+import multiprocessing
+import threading
 import pdfplumber
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import AsyncIterator, Deque, List, Tuple, Optional
 import logging
-import re
 
 from models import PageContent, ExtractedText
 from config import settings
+from ..jobs.cancellation import CancellationToken, check_cancelled
+from ..jobs.executor import worker_cpus
+from ..normalization import STORAGE, normalize, normalize_many
+from ..threads import run_in_daemon_thread
+from .document_session import DocumentSession, get_session
 
 logger = logging.getLogger(__name__)
 
+# Worker pool for parallel extraction (one per process, created on first use)
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            # spawn: workers must not inherit open documents or the event loop
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_extraction_pool():
+    """Stop the parallel extraction workers of this process."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def _extract_range(file_path: str, start: int, end: int) -> List[Optional[str]]:
+    """Pool worker: extract and clean pages [start, end) of a PDF (None for pages that failed)."""
+    # The worker's own session keeps the document open between chunks
+    session = get_session(file_path)
+    texts: List[Optional[str]] = []
+    for index in range(start, end):
+        try:
+            texts.append(session.page_text(index, cache=False))
+        except Exception as e:
+            logger.error(f"PyMuPDF failed on page {index + 1}: {e}")
+            texts.append(None)
+
+    cleaned = iter(normalize_many(text for text in texts if text is not None))
+    return [None if text is None else next(cleaned) for text in texts]
+
+
+def _pdfplumber_page_text(file_path: str, index: int) -> str:
+    """Text of one page (0-based) with pdfplumber."""
+    with pdfplumber.open(file_path, pages=[index + 1]) as pdf:
+        return pdf.pages[0].extract_text() or ""
+
 
 class PDFExtractor:
     """
     Extract text from PDF files.
     Uses PyMuPDF as primary method, falls back to pdfplumber if needed.
     Automatically detects if PDF is scanned (image-based).
+
+    Large PDFs (PDF_PARALLEL_MIN_PAGES pages or more) are extracted by page
+    ranges in a pool of worker processes; pages still come out in order.
     """
 
-    def __init__(self):
+    def __init__(self, workers: Optional[int] = None):
         self.min_text_for_non_ocr = settings.MIN_TEXT_LENGTH_FOR_OCR
-
-    async def extract(self, file_path: str) -> Tuple[ExtractedText, bool]:
+        workers = settings.PDF_EXTRACTION_WORKERS if workers is None else workers
+        self.workers = min(workers, worker_cpus())
+
+    async def extract(
+        self,
+        file_path: str,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> Tuple[ExtractedText, bool]:
         """
         Extract text from a PDF file.
 
         Args:
             file_path: Path to the PDF file
+            cancel_token: Checked before each page; raises JobCancelledError
 
         Returns:
             Tuple of (ExtractedText, is_scanned)
@@ -43,115 +110,207 @@ class PDFExtractor:
 
         logger.info(f"Extracting text from PDF: {file_path}")
 
-        # Try PyMuPDF first (faster)
-        pages, total_pages = await self._extract_with_pymupdf(file_path)
+        # PyMuPDF first (faster), pdfplumber as fallback for the pages it fails on
+        fallback_pages: List[int] = []
+        pages = [page async for page in self.iter_pages(file_path, cancel_token, fallback_pages)]
+        total_pages = len(pages)
+
+        extracted = ExtractedText.from_pages(
+            pages,
+            separator="",
+            extraction_method="pymupdf",
+            fallback_pages=fallback_pages
+        )
+        del pages
 
         # Check if PDF is scanned (very little text)
-        total_text = "".join(p.text for p in pages)
+        total_text = extracted.text
         is_scanned = len(total_text.strip()) < self.min_text_for_non_ocr * total_pages
+        extracted.is_scanned = is_scanned
 
         if is_scanned:
             logger.info("PDF appears to be scanned (image-based)")
         else:
             logger.info(f"Extracted {len(total_text)} characters from {total_pages} pages")
 
-        return ExtractedText(
-            text=total_text,
-            pages=pages,
-            total_pages=total_pages,
-            is_scanned=is_scanned,
-            extraction_method="pymupdf"
-        ), is_scanned
-
-    async def _extract_with_pymupdf(self, file_path: str) -> Tuple[List[PageContent], int]:
-        """Extract text using PyMuPDF (fitz)."""
-        pages = []
+        return extracted, is_scanned
 
-        try:
-            doc = fitz.open(file_path)
-            total_pages = len(doc)
-
-            for page_num in range(total_pages):
-                page = doc[page_num]
-                text = page.get_text("text")
-
-                # Clean up text
-                text = self._clean_text(text)
-
-                pages.append(PageContent(
-                    page_number=page_num + 1,
-                    text=text,
-                    is_ocr=False
-                ))
+    async def iter_pages(
+        self,
+        file_path: str,
+        cancel_token: Optional[CancellationToken] = None,
+        fallback_pages: Optional[List[int]] = None
+    ) -> AsyncIterator[PageContent]:
+        """
+        Yield the cleaned text of each page as it is extracted.
 
-            doc.close()
-            return pages, total_pages
+        Uses PyMuPDF (in parallel for large documents). Pages PyMuPDF fails
+        on, or finds no text on without being scans, are retried one by one
+        with pdfplumber under PDF_FALLBACK_PAGE_TIMEOUT seconds each. If
+        PyMuPDF cannot open the document at all, every page goes through
+        pdfplumber.
 
+        Args:
+            file_path: Path to the PDF file
+            cancel_token: Checked before each page; raises JobCancelledError
+            fallback_pages: Numbers of the pages whose text came from
+                pdfplumber are appended to this list
+        """
+        try:
+            session = get_session(file_path)
+            page_count = session.page_count
         except Exception as e:
-            logger.error(f"PyMuPDF extraction failed: {e}")
-            # Fallback to pdfplumber
-            return await self._extract_with_pdfplumber(file_path)
-
-    async def _extract_with_pdfplumber(self, file_path: str) -> Tuple[List[PageContent], int]:
-        """Extract text using pdfplumber (more accurate for some PDFs)."""
-        pages = []
+            logger.error(f"PyMuPDF could not open {file_path}: {e}")
+            async for page in self._iter_with_pdfplumber(file_path, cancel_token, fallback_pages):
+                yield page
+            return
 
+        if self._runs_parallel(page_count):
+            texts = self._iter_parallel(file_path, page_count, cancel_token)
+        else:
+            texts = self._iter_with_pymupdf(file_path, cancel_token)
+
+        async for index, text in texts:
+            if not text and self._needs_fallback(session, index, failed=text is None):
+                fallback = await self._pdfplumber_page(file_path, index)
+                # An empty pdfplumber page only replaces a failed one
+                if fallback or (fallback is not None and text is None):
+                    text = fallback
+                    if fallback_pages is not None:
+                        fallback_pages.append(index + 1)
+
+            yield PageContent(
+                page_number=index + 1,
+                text=text or "",
+                is_ocr=False
+            )
+
+    async def _iter_with_pymupdf(
+        self,
+        file_path: str,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> AsyncIterator[Tuple[int, Optional[str]]]:
+        """
+        Extract text using PyMuPDF (fitz), through the file's shared session.
+        Yields (page index, cleaned text), with None for pages that failed.
+        """
+        session = get_session(file_path)
+
+        for page_num in range(session.page_count):
+            check_cancelled(cancel_token)
+            try:
+                text = session.page_text(page_num, cache=False)
+            except Exception as e:
+                logger.error(f"PyMuPDF failed on page {page_num + 1}: {e}")
+                yield page_num, None
+                continue
+
+            # Clean up text
+            yield page_num, normalize(text, STORAGE)
+
+    def _needs_fallback(self, session: DocumentSession, index: int, failed: bool) -> bool:
+        """Whether a page without PyMuPDF text is worth a pdfplumber pass (scans are not)."""
+        if failed:
+            return True
         try:
-            with pdfplumber.open(file_path) as pdf:
-                total_pages = len(pdf.pages)
+            return session.image_coverage(index) < settings.OCR_MIN_IMAGE_COVERAGE
+        except Exception:
+            return True
 
-                for page_num, page in enumerate(pdf.pages):
-                    text = page.extract_text() or ""
-                    text = self._clean_text(text)
+    async def _pdfplumber_page(self, file_path: str, index: int) -> Optional[str]:
+        """Cleaned pdfplumber text of one page, or None if it failed or timed out."""
+        timeout = settings.PDF_FALLBACK_PAGE_TIMEOUT
+        try:
+            text = await asyncio.wait_for(run_in_daemon_thread(_pdfplumber_page_text, file_path, index, name="pdfplumber-page"), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"pdfplumber gave up on page {index + 1} after {timeout}s")
+            return None
+        except Exception as e:
+            logger.error(f"pdfplumber failed on page {index + 1}: {e}")
+            return None
+
+        logger.info(f"Page {index + 1} extracted with pdfplumber")
+        return normalize(text, STORAGE)
+
+    def _runs_parallel(self, page_count: int) -> bool:
+        """Whether a document is large enough to be worth the worker processes."""
+        return (
+            self.workers > 1
+            and page_count >= settings.PDF_PARALLEL_MIN_PAGES
+            and page_count > settings.PDF_PARALLEL_CHUNK_PAGES
+        )
+
+    async def _iter_parallel(
+        self,
+        file_path: str,
+        page_count: int,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> AsyncIterator[Tuple[int, Optional[str]]]:
+        """
+        Extract page ranges in worker processes, yielding
+        (page index, cleaned text or None) in page order.
 
-                    pages.append(PageContent(
-                        page_number=page_num + 1,
-                        text=text,
-                        is_ocr=False
-                    ))
+        At most two chunks per worker are in flight, so pages do not pile up
+        ahead of a slow consumer.
+        """
+        chunk_size = max(1, settings.PDF_PARALLEL_CHUNK_PAGES)
+        chunks = deque((start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size))
+        in_flight: Deque[Tuple[int, asyncio.Future]] = deque()
+        pool = _get_pool(self.workers)
+        logger.info(f"Extracting {page_count} pages in {len(chunks)} chunks on {self.workers} workers")
 
-            return pages, total_pages
+        try:
+            while chunks or in_flight:
+                while chunks and len(in_flight) < 2 * self.workers:
+                    start, end = chunks.popleft()
+                    future = pool.submit(_extract_range, file_path, start, end)
+                    in_flight.append((start, asyncio.wrap_future(future)))
+
+                start, future = in_flight.popleft()
+                for offset, text in enumerate(await future):
+                    check_cancelled(cancel_token)
+                    yield start + offset, text
+
+        except BrokenProcessPool:
+            shutdown_extraction_pool()
+            raise
 
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+    async def _iter_with_pdfplumber(
+        self,
+        file_path: str,
+        cancel_token: Optional[CancellationToken] = None,
+        fallback_pages: Optional[List[int]] = None
+    ) -> AsyncIterator[PageContent]:
+        """Extract every page with pdfplumber (for PDFs PyMuPDF cannot open)."""
+        try:
+            with pdfplumber.open(file_path) as pdf:
+                page_count = len(pdf.pages)
         except Exception as e:
             logger.error(f"pdfplumber extraction failed: {e}")
             raise
 
-    def _clean_text(self, text: str) -> str:
-        """Clean and normalize extracted text."""
-        if not text:
-            return ""
-
-        # Remove excessive whitespace
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        text = re.sub(r' {2,}', ' ', text)
-
-        # Fix common Arabic text issues
-        # Remove zero-width characters
-        text = re.sub(r'[\u200b\u200c\u200d\ufeff]', '', text)
-
-        # Normalize Arabic characters
-        text = self._normalize_arabic(text)
-
-        return text.strip()
-
-    def _normalize_arabic(self, text: str) -> str:
-        """Normalize Arabic text for consistency."""
-        # Normalize alef variations
-        text = re.sub(r'[آأإا]', 'ا', text)
-
-        # Normalize yaa variations
-        text = re.sub(r'[يى]', 'ي', text)
-
-        # Normalize taa marbuta
-        text = re.sub(r'ة', 'ه', text)
+        for page_num in range(page_count):
+            check_cancelled(cancel_token)
+            text = await self._pdfplumber_page(file_path, page_num)
+            if text is not None and fallback_pages is not None:
+                fallback_pages.append(page_num + 1)
 
-        return text
+            yield PageContent(
+                page_number=page_num + 1,
+                text=text or "",
+                is_ocr=False
+            )
 
     async def get_pdf_info(self, file_path: str) -> dict:
         """Get PDF metadata and information."""
         try:
-            doc = fitz.open(file_path)
-            metadata = doc.metadata
+            session = get_session(file_path)
+            metadata = session.metadata
+            toc = session.get_toc()
 
             info = {
                 "title": metadata.get("title", ""),
@@ -159,12 +318,11 @@ class PDFExtractor:
                 "subject": metadata.get("subject", ""),
                 "creator": metadata.get("creator", ""),
                 "producer": metadata.get("producer", ""),
-                "page_count": len(doc),
-                "has_toc": len(doc.get_toc()) > 0,
-                "toc": doc.get_toc()  # Built-in table of contents
+                "page_count": session.page_count,
+                "has_toc": len(toc) > 0,
+                "toc": toc  # Built-in table of contents
             }
 
-            doc.close()
             return info
 
         except Exception as e:
@@ -177,9 +335,7 @@ class PDFExtractor:
         Many PDFs have a built-in TOC that can be used directly.
         """
         try:
-            doc = fitz.open(file_path)
-            toc = doc.get_toc()
-            doc.close()
+            toc = get_session(file_path).get_toc()
 
             if not toc:
                 return []
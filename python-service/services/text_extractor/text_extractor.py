@@ -3,18 +3,70 @@ Text Extractor - Main Module
 Unified interface for extracting text from PDF, DOCX, and ABX files.
 """
 
+import asyncio
 import logging
+import time
+from collections import deque
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Awaitable, Callable, Deque, List, Optional, Tuple, Union
 
-from models import ExtractedText, PageContent
 from config import settings
+from models import ExtractedText, PageContent
 from .pdf_extractor import PDFExtractor
 from .ocr_processor import OCRProcessor
 from .abx_extractor import ABXExtractor
+from .page_classifier import PageClassification, PageClassifier
+from .document_session import get_session
+from ..jobs.cancellation import CancellationToken
 
 logger = logging.getLogger(__name__)
 
+# Pages extracted ahead of an OCR group that is still running, at most
+MAX_QUEUED_PAGES = 64
+
+
+class PageStream:
+    """
+    Pages of a document as an async iterator.
+
+    Extraction metadata that depends on the pages (scanned detection, method,
+    full text) is filled in while iterating and is final once iteration ends.
+    """
+
+    def __init__(
+        self,
+        produce: Callable[["PageStream"], AsyncIterator[PageContent]],
+        extraction_method: str,
+        separator: str = "\n\n"
+    ):
+        self._produce = produce
+        self.extraction_method = extraction_method
+        self.separator = separator  # How the extractor joins pages into the full text
+        self.is_scanned = False
+        self.fallback_pages: List[int] = []  # Filled by the PDF extractor
+        self.ocr_pages = 0  # Pages OCRed because their text layer was unusable (hybrid OCR)
+        self.ocr_seconds = 0.0  # Time spent OCRing them
+        self.extracted: Optional[ExtractedText] = None  # Set by extractors that read the whole file first
+
+    def __aiter__(self) -> AsyncIterator[PageContent]:
+        return self._produce(self)
+
+    def join(self, pages: List[PageContent]) -> str:
+        """Join pages the way the extractor builds its full text."""
+        return self.separator.join(p.text for p in pages)
+
+    def to_extracted(self, pages: List[PageContent]) -> ExtractedText:
+        """Build the ExtractedText of a fully consumed stream."""
+        if self.extracted is not None:
+            return self.extracted
+        return ExtractedText.from_pages(
+            pages,
+            separator=self.separator,
+            is_scanned=self.is_scanned,
+            extraction_method=self.extraction_method,
+            fallback_pages=self.fallback_pages
+        )
+
 
 class TextExtractor:
     """
@@ -25,13 +77,15 @@ class TextExtractor:
     def __init__(self):
         self.pdf_extractor = PDFExtractor()
         self.abx_extractor = ABXExtractor()
+        self.page_classifier = PageClassifier()
         self.ocr_processor = None  # Lazy loaded
 
     async def extract(
         self,
         file_path: str,
         use_ocr: bool = False,
-        ocr_provider: str = "easyocr"
+        ocr_provider: str = "easyocr",
+        cancel_token: Optional[CancellationToken] = None
     ) -> ExtractedText:
         """
         Extract text from a document file.
@@ -40,6 +94,7 @@ class TextExtractor:
             file_path: Path to the document
             use_ocr: Force OCR even for text-based PDFs
             ocr_provider: OCR provider (easyocr, tesseract, google)
+            cancel_token: Checked between pages of long extractions
 
         Returns:
             ExtractedText with all pages and metadata
@@ -52,45 +107,230 @@ class TextExtractor:
         file_ext = path.suffix.lower()
 
         if file_ext == ".pdf":
-            return await self._extract_from_pdf(file_path, use_ocr, ocr_provider)
+            return await self._extract_from_pdf(file_path, use_ocr, ocr_provider, cancel_token)
         elif file_ext in [".docx", ".doc"]:
-            return await self._extract_from_docx(file_path)
+            return await self._extract_whole(file_path, self._extract_from_docx)
         elif file_ext == ".abx":
-            return await self.abx_extractor.extract(file_path)
+            return await self._extract_whole(file_path, self.abx_extractor.extract)
         else:
             raise ValueError(f"Unsupported file type: {file_ext}")
 
-    async def _extract_from_pdf(
+    def stream(
         self,
         file_path: str,
-        use_ocr: bool,
-        ocr_provider: str
-    ) -> ExtractedText:
-        """Extract text from PDF, using OCR if needed."""
+        use_ocr: bool = False,
+        ocr_provider: str = "easyocr",
+        cancel_token: Optional[CancellationToken] = None
+    ) -> PageStream:
+        """
+        Extract a document page by page.
+        PDF pages are yielded as soon as they are extracted (or OCRed);
+        DOCX and ABX files are read whole and then yielded.
 
-        # First try normal text extraction
-        extracted, is_scanned = await self.pdf_extractor.extract(file_path)
+        Args:
+            file_path: Path to the document
+            use_ocr: Force OCR even for text-based PDFs
+            ocr_provider: OCR provider (easyocr, tesseract, google)
+            cancel_token: Checked between pages
 
-        # Use OCR if:
-        # 1. PDF is scanned (image-based)
-        # 2. User explicitly requested OCR
-        if is_scanned or use_ocr:
-            logger.info("Using OCR for text extraction")
+        Returns:
+            PageStream yielding PageContent in page order
+        """
+        path = Path(file_path)
 
-            if self.ocr_processor is None:
-                self.ocr_processor = OCRProcessor(provider=ocr_provider)
+        if not path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        file_ext = path.suffix.lower()
 
-            ocr_pages = await self.ocr_processor.process_pdf(file_path)
+        if file_ext == ".pdf":
+            async def produce(stream: PageStream) -> AsyncIterator[PageContent]:
+                async for page in self._stream_pdf(stream, file_path, use_ocr, ocr_provider, cancel_token):
+                    yield page
+            return PageStream(produce, "pymupdf", separator="")
+
+        if file_ext in [".docx", ".doc", ".abx"]:
+            async def produce(stream: PageStream) -> AsyncIterator[PageContent]:
+                extracted = await self.extract(file_path)
+                stream.extraction_method = extracted.extraction_method
+                stream.extracted = extracted
+                for page in extracted.pages:
+                    yield page
+            return PageStream(produce, "abx" if file_ext == ".abx" else "python-docx")
+
+        raise ValueError(f"Unsupported file type: {file_ext}")
+
+    async def _stream_pdf(
+        self,
+        stream: PageStream,
+        file_path: str,
+        use_ocr: bool,
+        ocr_provider: str,
+        cancel_token: Optional[CancellationToken]
+    ) -> AsyncIterator[PageContent]:
+        """
+        Stream PDF pages, OCRing only the pages that need it.
+
+        Every page's text layer is classified (see PageClassifier); pages
+        without usable text are replaced by their OCR, the others keep the
+        PyMuPDF text. With use_ocr, or when most of the first
+        OCR_SCAN_PROBE_PAGES pages need OCR (a scanned book), every page is
+        OCRed through the processor's document path instead.
+
+        Consecutive pages to OCR are grouped by the processor's batch_pages
+        (Tesseract reads a group in one run) and sent to the OCR processor,
+        up to its max_in_flight groups at a time, while extraction goes on;
+        pages still come out in order.
+        """
+        if use_ocr:
+            logger.info("Using OCR for text extraction")
+            async for page in self._ocr_document(stream, file_path, ocr_provider, cancel_token):
+                yield page
+            return
+
+        session = get_session(file_path)
+        pages = self.pdf_extractor.iter_pages(file_path, cancel_token, fallback_pages=stream.fallback_pages)
+
+        probe: List[Tuple[PageContent, PageClassification]] = []
+        async for page in pages:
+            probe.append((page, self.page_classifier.classify(session, page.page_number - 1, page.text)))
+            if len(probe) >= settings.OCR_SCAN_PROBE_PAGES:
+                break
+
+        flagged = sum(1 for _, classification in probe if classification.needs_ocr)
+        if flagged * 2 > len(probe):
+            await pages.aclose()
+            logger.info(f"{flagged} of the first {len(probe)} pages need OCR, OCRing the whole document")
+            stream.fallback_pages.clear()  # Their text is replaced by OCR
+            async for page in self._ocr_document(stream, file_path, ocr_provider, cancel_token):
+                yield page
+            return
+
+        async def classified() -> AsyncIterator[Tuple[PageContent, PageClassification]]:
+            for entry in probe:
+                yield entry
+            async for page in pages:
+                yield page, self.page_classifier.classify(session, page.page_number - 1, page.text)
+
+        total_pages = 0
+        # Pages in order: text pages as they are, OCR groups as tasks
+        queue: Deque[Union[PageContent, asyncio.Task]] = deque()
+        # Consecutive flagged pages not yet queued, OCRed together up to the processor's batch_pages
+        run: List[int] = []
+
+        async def ocr_group(indexes: List[int]) -> List[PageContent]:
+            start_time = time.monotonic()
+            ocr_pages = await self._get_ocr_processor(ocr_provider).ocr_pages(file_path, indexes)
+            stream.ocr_seconds += time.monotonic() - start_time
+            return ocr_pages
+
+        def flush_run():
+            """Queue the flagged pages read since the last text page as one OCR group."""
+            if run:
+                queue.append(asyncio.ensure_future(ocr_group(list(run))))
+                run.clear()
+
+        async def release(max_running: int) -> AsyncIterator[PageContent]:
+            """
+            Yield the pages at the head of the queue, waiting for the oldest
+            OCR group while more than max_running groups run or too many
+            pages wait behind it.
+            """
+            while queue:
+                head = queue[0]
+                if isinstance(head, asyncio.Task):
+                    running = sum(1 for item in queue if isinstance(item, asyncio.Task) and not item.done())
+                    if not head.done() and running <= max_running and len(queue) <= MAX_QUEUED_PAGES:
+                        return
+                    ocr_pages = await head
+                    queue.popleft()
+                    stream.ocr_pages += len(ocr_pages)
+                    stream.separator = "\n\n"
+                    for ocr_page in ocr_pages:
+                        yield ocr_page
+                else:
+                    yield queue.popleft()
 
-            return ExtractedText(
-                text="\n\n".join(p.text for p in ocr_pages),
-                pages=ocr_pages,
-                total_pages=len(ocr_pages),
-                is_scanned=True,
-                extraction_method=f"ocr_{ocr_provider}"
+        try:
+            async for page, classification in classified():
+                total_pages += 1
+
+                if classification.needs_ocr:
+                    logger.info(f"OCR processing page {page.page_number} ({classification.reason})")
+                    run.append(page.page_number - 1)
+                    if len(run) >= self._get_ocr_processor(ocr_provider).batch_pages:
+                        flush_run()
+                else:
+                    flush_run()
+                    queue.append(page)
+
+                max_running = self.ocr_processor.max_in_flight if self.ocr_processor is not None else 0
+                async for ready in release(max_running):
+                    yield ready
+
+            flush_run()
+            async for ready in release(0):
+                yield ready
+
+        finally:
+            for item in queue:
+                if not isinstance(item, asyncio.Task):
+                    continue
+                if item.done() and not item.cancelled():
+                    item.exception()  # Consumed: the error that stopped the stream is already raised
+                else:
+                    item.cancel()
+
+        if stream.fallback_pages:
+            logger.info(f"{len(stream.fallback_pages)} of {total_pages} pages extracted with pdfplumber")
+        if stream.ocr_pages:
+            logger.info(f"OCRed {stream.ocr_pages} of {total_pages} pages")
+            stream.is_scanned = stream.ocr_pages * 2 > total_pages
+            stream.extraction_method = (
+                f"ocr_{ocr_provider}" if stream.ocr_pages == total_pages else f"hybrid_{ocr_provider}"
             )
 
-        return extracted
+    async def _ocr_document(
+        self,
+        stream: PageStream,
+        file_path: str,
+        ocr_provider: str,
+        cancel_token: Optional[CancellationToken]
+    ) -> AsyncIterator[PageContent]:
+        """OCR every page of a PDF, in page batches (on the pool when there is one)."""
+        stream.is_scanned = True
+        stream.extraction_method = f"ocr_{ocr_provider}"
+        stream.separator = "\n\n"
+        async for page in self._get_ocr_processor(ocr_provider).iter_pages(file_path, cancel_token):
+            yield page
+
+    def _get_ocr_processor(self, ocr_provider: str) -> OCRProcessor:
+        if self.ocr_processor is None:
+            self.ocr_processor = OCRProcessor(provider=ocr_provider)
+        return self.ocr_processor
+
+    async def _extract_whole(
+        self,
+        file_path: str,
+        extract: Callable[[str], Awaitable[ExtractedText]]
+    ) -> ExtractedText:
+        """Extract a non-PDF document once per session and reuse the result."""
+        session = get_session(file_path)
+        if session.extracted is None:
+            session.extracted = await extract(file_path)
+        return session.extracted
+
+    async def _extract_from_pdf(
+        self,
+        file_path: str,
+        use_ocr: bool,
+        ocr_provider: str,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> ExtractedText:
+        """Extract text from PDF, OCRing the pages without a usable text layer."""
+        stream = self.stream(file_path, use_ocr, ocr_provider, cancel_token)
+        pages = [page async for page in stream]
+        return stream.to_extracted(pages)
 
     async def _extract_from_docx(self, file_path: str) -> ExtractedText:
         """Extract text from DOCX file."""
@@ -128,12 +368,8 @@ class TextExtractor:
                     is_ocr=False
                 ))
 
-            full_text = "\n\n".join(p.text for p in pages)
-
-            return ExtractedText(
-                text=full_text,
-                pages=pages,
-                total_pages=len(pages),
+            return ExtractedText.from_pages(
+                pages,
                 is_scanned=False,
                 extraction_method="python-docx"
             )
@@ -203,7 +439,7 @@ class TextExtractor:
         """Get ABX metadata."""
         try:
             # Extract content to get basic info
-            extracted = await self.abx_extractor.extract(file_path)
+            extracted = await self._extract_whole(file_path, self.abx_extractor.extract)
 
             return {
                 "title": "",  # Could be extracted from metadata
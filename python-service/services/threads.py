@@ -0,0 +1,42 @@
+"""
+Daemon Threads
+Blocking calls that may have to be abandoned (a pdfplumber page that never
+finishes, an AI request past its timeout) run in their own daemon threads
+instead of the event loop's default executor: asyncio.run() waits for the
+default executor's threads on shutdown, so an abandoned call there would
+still hold up the job until it returned.
+"""
+
+import asyncio
+import threading
+
+
+def run_in_daemon_thread(function, *args, name: str = "blocking-call") -> asyncio.Future:
+    """
+    Run a blocking call in its own daemon thread. Unlike the default
+    executor, a call that never returns can be abandoned after a timeout
+    without blocking event loop shutdown or process exit.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(result, error):
+        if not future.done():
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def run():
+        result, error = None, None
+        try:
+            result = function(*args)
+        except Exception as e:
+            error = e
+        try:
+            loop.call_soon_threadsafe(resolve, result, error)
+        except RuntimeError:
+            pass  # Loop closed after the caller gave up
+
+    threading.Thread(target=run, name=name, daemon=True).start()
+    return future
@@ -1,5 +1,6 @@
 from .toc_detector import TocDetector
 from .arabic_patterns import ArabicTOCPatterns
 from .ai_parser import AiTocParser
+from .strategy_runner import TocStrategyRunner
 
-__all__ = ["TocDetector", "ArabicTOCPatterns", "AiTocParser"]
+__all__ = ["TocDetector", "ArabicTOCPatterns", "AiTocParser", "TocStrategyRunner"]
@@ -5,11 +5,13 @@ Uses LLMs (Ollama, Claude, OpenAI) to understand and parse complex table of cont
 
 import json
 import logging
+import time
 from typing import List, Optional
 import re
 
 from models import TocItem, AiTocParseResult
 from config import settings
+from .. import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -85,6 +87,7 @@ class AiTocParser:
             text = text[:max_chars]
 
         logger.info(f"Parsing TOC with AI provider: {self.provider}")
+        start_time = time.time()
 
         try:
             if self.provider == "local":
@@ -97,6 +100,8 @@ class AiTocParser:
                 logger.warning(f"Unknown provider {self.provider}, falling back to local")
                 response = await self._parse_with_ollama(text)
 
+            metrics.AI_REQUEST_DURATION.observe(time.time() - start_time, provider=self.provider)
+
             # Parse response
             result = self._parse_response(response)
             result.provider = self.provider
@@ -105,6 +110,8 @@ class AiTocParser:
 
         except Exception as e:
             logger.error(f"AI parsing failed: {e}")
+            metrics.AI_REQUEST_DURATION.observe(time.time() - start_time, provider=self.provider)
+            metrics.AI_REQUEST_ERRORS.inc(provider=self.provider)
             return AiTocParseResult(
                 toc_items=[],
                 confidence=0.0,
@@ -202,6 +209,7 @@ class AiTocParser:
             data = json.loads(response)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON response: {e}")
+            metrics.AI_REQUEST_ERRORS.inc(provider=self.provider)
             logger.debug(f"Response was: {response[:500]}")
             return AiTocParseResult(
                 toc_items=[],
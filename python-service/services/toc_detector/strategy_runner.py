@@ -0,0 +1,200 @@
+"""
+TOC Strategy Runner
+Runs the TOC detection strategies concurrently and returns as soon as one
+result is good enough.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+from models import AiTocParseResult
+from config import settings
+from .. import metrics
+from ..threads import run_in_daemon_thread
+
+logger = logging.getLogger(__name__)
+
+# Strategies in order of preference
+STRATEGIES = ("embedded", "pattern", "ai", "structure")
+
+# TocDetector provider value that means "no AI" (ProcessingOptions.use_ai_parsing=False)
+NO_AI_PROVIDER = "pattern"
+
+
+class TocStrategyRunner:
+    """
+    Race embedded TOC, pattern matching, AI parsing and page structure analysis.
+
+    Pattern matching and page structure analysis run in daemon threads. The
+    AI request, limited to TOC_AI_TIMEOUT, starts once the embedded TOC and
+    pattern matching have failed, or alongside them with TOC_AI_SPECULATIVE.
+    Page structure analysis, the costliest of the local strategies, starts
+    only when every other strategy came back empty. A result is
+    returned once its confidence clears the threshold and every preferred
+    strategy has finished without doing so, so the answer is the same as
+    trying the strategies one after another. Strategies still running are
+    cancelled; an AI request already sent is abandoned, never repeated.
+    """
+
+    def __init__(
+        self,
+        detector,
+        confidence_threshold: Optional[float] = None,
+        ai_timeout: Optional[float] = None,
+        speculative_ai: Optional[bool] = None
+    ):
+        """
+        Args:
+            detector: TocDetector providing the individual strategies
+            confidence_threshold: Minimum confidence for an early exit
+            ai_timeout: Seconds to wait for the AI provider
+            speculative_ai: Start the AI together with the cheap strategies
+                instead of only after they failed
+        """
+        self.detector = detector
+        self.confidence_threshold = (
+            settings.TOC_CONFIDENCE_THRESHOLD if confidence_threshold is None else confidence_threshold
+        )
+        self.ai_timeout = settings.TOC_AI_TIMEOUT if ai_timeout is None else ai_timeout
+        self.speculative_ai = settings.TOC_AI_SPECULATIVE if speculative_ai is None else speculative_ai
+
+    async def run(
+        self,
+        text: str,
+        pages: Optional[List[dict]] = None,
+        embedded_toc: Optional[List[dict]] = None
+    ) -> AiTocParseResult:
+        """
+        Detect the TOC with all applicable strategies.
+
+        Args:
+            text: Full document text or TOC section
+            pages: Optional list of pages (enables page structure analysis)
+            embedded_toc: Optional embedded TOC from PDF
+
+        Returns:
+            AiTocParseResult of the preferred strategy that succeeded
+        """
+        detector = self.detector
+
+        # Converting an embedded TOC is instant and wins over everything else
+        results: Dict[str, Optional[AiTocParseResult]] = {
+            "embedded": detector._embedded_result(embedded_toc)
+        }
+        if self._clears(results["embedded"]):
+            return results["embedded"]
+
+        toc_section = detector.patterns.find_toc_section(text)
+
+        use_ai = detector.ai_provider != NO_AI_PROVIDER
+        # Prioritize the TOC section if found
+        ai_text = toc_section if toc_section else text[:20000]
+
+        pattern = run_in_daemon_thread(
+            lambda: detector._pattern_result(text, toc_section) if toc_section else None,
+            name="toc-pattern"
+        )
+        tasks: Dict[asyncio.Future, str] = {pattern: "pattern"}
+        if use_ai and self.speculative_ai:
+            tasks[asyncio.create_task(self._run_ai(ai_text, pages))] = "ai"
+
+        pending = set(tasks)
+        expected = {"embedded", "pattern"} | ({"ai"} if use_ai else set())
+
+        try:
+            while True:
+                result = self._decide(results, expected)
+                if self._clears(result):
+                    logger.info(f"TOC detected by {result.provider} with confidence {result.confidence}")
+                    return result
+
+                # Without speculation the AI starts once the preferred strategies failed
+                if use_ai and "ai" not in tasks.values() and "pattern" in results:
+                    task = asyncio.create_task(self._run_ai(ai_text, pages))
+                    tasks[task] = "ai"
+                    pending.add(task)
+
+                if pages and "structure" not in expected and self._all_empty(results, expected):
+                    task = run_in_daemon_thread(detector._analyze_page_structure, pages, name="toc-structure")
+                    tasks[task] = "structure"
+                    pending.add(task)
+                    expected.add("structure")
+
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    results[tasks[task]] = task.result()
+
+            return self._fallback(results, pages)
+
+        finally:
+            for task in pending:
+                task.cancel()
+            # Returns promptly: cancelling stops waiting for the threads, not
+            # the threads; daemon threads are left to finish on their own
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def _all_empty(self, results: Dict[str, Optional[AiTocParseResult]], expected) -> bool:
+        """Whether every expected strategy finished without finding a TOC."""
+        return all(
+            name in results and (results[name] is None or not results[name].toc_items)
+            for name in expected
+        )
+
+    def _clears(self, result: Optional[AiTocParseResult]) -> bool:
+        return result is not None and bool(result.toc_items) and result.confidence >= self.confidence_threshold
+
+    def _decide(self, results: Dict[str, Optional[AiTocParseResult]], expected) -> Optional[AiTocParseResult]:
+        """
+        The most preferred result that clears the threshold, or None if a
+        preferred strategy is still running.
+        """
+        for name in STRATEGIES:
+            if name not in expected:
+                continue
+            if name not in results:
+                return None
+            if self._clears(results[name]):
+                return results[name]
+        return None
+
+    def _fallback(self, results: Dict[str, Optional[AiTocParseResult]], pages: Optional[List[dict]]) -> AiTocParseResult:
+        """Best result once every strategy finished below the threshold."""
+        for name in STRATEGIES:
+            result = results.get(name)
+            if result is not None and result.toc_items:
+                return result
+
+        if pages and results.get("structure") is not None:
+            return results["structure"]
+
+        return results.get("ai") or AiTocParseResult(
+            toc_items=[],
+            confidence=0.0,
+            provider=self.detector.ai_provider
+        )
+
+    async def _run_ai(self, text: str, pages: Optional[List[dict]]) -> Optional[AiTocParseResult]:
+        """
+        Run the AI parser in a daemon thread (provider clients block). An
+        abandoned request does not hold up the job's event loop on shutdown.
+        """
+        logger.info("Using AI for TOC detection")
+        parser = self.detector.ai_parser
+        start_time = time.monotonic()
+
+        try:
+            return await asyncio.wait_for(
+                run_in_daemon_thread(lambda: asyncio.run(parser.parse(text, pages)), name="ai-toc"),
+                self.ai_timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"AI TOC detection timed out after {self.ai_timeout}s")
+            metrics.AI_REQUEST_ERRORS.inc(provider=self.detector.ai_provider)
+            return None
+        finally:
+            self.detector.ai_seconds = time.monotonic() - start_time
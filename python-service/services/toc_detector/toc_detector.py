@@ -6,10 +6,10 @@ Detects and parses table of contents from documents.
 import logging
 from typing import List, Optional
 
-from models import TocItem, AiTocParseResult, PageContent
-from config import settings
+from models import TocItem, AiTocParseResult
 from .arabic_patterns import ArabicTOCPatterns
 from .ai_parser import AiTocParser
+from .strategy_runner import TocStrategyRunner
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +30,7 @@ class TocDetector:
         self.patterns = ArabicTOCPatterns()
         self.ai_parser = AiTocParser(provider=ai_provider)
         self.ai_provider = ai_provider
+        self.ai_seconds: Optional[float] = None  # Time the last detect() waited for the AI (None if not sent)
 
     async def detect(
         self,
@@ -40,10 +41,14 @@ class TocDetector:
         """
         Detect TOC from document text.
 
-        Strategy:
-        1. First check for embedded PDF TOC
-        2. Then try pattern matching
-        3. Finally use AI for complex cases
+        Strategies, in order of preference:
+        1. Embedded PDF TOC
+        2. Pattern matching
+        3. AI for complex cases
+        4. Page structure analysis
+
+        They run concurrently (see TocStrategyRunner); the preferred result
+        that clears TOC_CONFIDENCE_THRESHOLD is returned.
 
         Args:
             text: Full document text or TOC section
@@ -54,52 +59,40 @@ class TocDetector:
             AiTocParseResult with detected TOC
         """
         logger.info("Starting TOC detection")
+        return await TocStrategyRunner(self).run(text, pages, embedded_toc)
 
-        # 1. Check embedded TOC (from PDF metadata)
-        if embedded_toc and len(embedded_toc) >= 3:
-            logger.info(f"Using embedded TOC with {len(embedded_toc)} items")
-            toc_items = self._convert_embedded_toc(embedded_toc)
-            return AiTocParseResult(
-                toc_items=toc_items,
-                confidence=0.95,
-                provider="embedded"
-            )
-
-        # 2. Find TOC section in text
-        toc_section = self.patterns.find_toc_section(text)
-
-        if toc_section:
-            # 3. Try pattern matching first
-            pattern_items = self.patterns.parse_toc(toc_section)
-
-            if len(pattern_items) >= 3:
-                logger.info(f"Pattern matching found {len(pattern_items)} items")
-
-                # Detect book info
-                book_info = self.patterns.detect_book_info(text[:5000])
+    def _embedded_result(self, embedded_toc: Optional[List[dict]]) -> Optional[AiTocParseResult]:
+        """Use the embedded PDF TOC if it has at least 3 entries."""
+        if not embedded_toc or len(embedded_toc) < 3:
+            return None
 
-                return AiTocParseResult(
-                    toc_items=pattern_items,
-                    detected_title=book_info.get('title'),
-                    detected_author=book_info.get('author'),
-                    confidence=0.8,
-                    provider="pattern"
-                )
+        logger.info(f"Using embedded TOC with {len(embedded_toc)} items")
+        toc_items = self._convert_embedded_toc(embedded_toc)
+        return AiTocParseResult(
+            toc_items=toc_items,
+            confidence=0.95,
+            provider="embedded"
+        )
 
-        # 4. Use AI for complex cases
-        logger.info("Using AI for TOC detection")
+    def _pattern_result(self, text: str, toc_section: str) -> Optional[AiTocParseResult]:
+        """Pattern-match a TOC section; None if fewer than 3 entries are found."""
+        pattern_items = self.patterns.parse_toc(toc_section)
 
-        # Prepare text for AI (prioritize TOC section if found)
-        ai_text = toc_section if toc_section else text[:20000]
+        if len(pattern_items) < 3:
+            return None
 
-        result = await self.ai_parser.parse(ai_text, pages)
+        logger.info(f"Pattern matching found {len(pattern_items)} items")
 
-        # If AI found nothing, try analyzing page structure
-        if not result.toc_items and pages:
-            logger.info("Trying page structure analysis")
-            result = await self._analyze_page_structure(pages)
+        # Detect book info
+        book_info = self.patterns.detect_book_info(text[:5000])
 
-        return result
+        return AiTocParseResult(
+            toc_items=pattern_items,
+            detected_title=book_info.get('title'),
+            detected_author=book_info.get('author'),
+            confidence=0.8,
+            provider="pattern"
+        )
 
     def _convert_embedded_toc(self, embedded_toc: List[dict]) -> List[TocItem]:
         """Convert embedded PDF TOC to our format."""
@@ -115,7 +108,7 @@ class TocDetector:
 
         return items
 
-    async def _analyze_page_structure(self, pages: List[dict]) -> AiTocParseResult:
+    def _analyze_page_structure(self, pages: List[dict]) -> AiTocParseResult:
         """
         Analyze page structure to detect chapter breaks.
         Used as fallback when no explicit TOC is found.
@@ -0,0 +1,208 @@
+"""
+Streaming Uploads
+Writes multipart/form-data file uploads straight to UPLOAD_DIR in chunks,
+hashing and size-checking as the bytes arrive.
+"""
+
+import hashlib
+import logging
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+
+from multipart.multipart import MultipartParser, parse_options_header
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class UploadError(Exception):
+    """Raised when an upload request is malformed or not allowed."""
+
+
+class UploadTooLargeError(UploadError):
+    """Raised when an upload exceeds MAX_FILE_SIZE."""
+
+
+@dataclass
+class StoredUpload:
+    """A file written to UPLOAD_DIR plus the other form fields."""
+    upload_id: str
+    file_path: str
+    file_name: str
+    file_size: int
+    file_hash: str
+    fields: Dict[str, str] = field(default_factory=dict)
+
+
+class StreamingUploadWriter:
+    """
+    Parse a multipart/form-data body from a byte stream.
+
+    The single file part is written to disk as it is parsed, so memory use
+    does not depend on file size. Other parts are collected as text fields.
+    """
+
+    FILE_FIELD = "file"
+
+    def __init__(
+        self,
+        content_type: str,
+        upload_dir: Optional[Path] = None,
+        max_size: Optional[int] = None
+    ):
+        mime, params = parse_options_header(content_type or "")
+        boundary = params.get(b"boundary")
+        if mime != b"multipart/form-data" or not boundary:
+            raise UploadError("Expected multipart/form-data with a boundary")
+
+        self.upload_dir = Path(upload_dir or settings.UPLOAD_DIR)
+        self.max_size = max_size or settings.MAX_FILE_SIZE
+
+        self._parser = MultipartParser(boundary, callbacks={
+            "on_part_begin": self._on_part_begin,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+        })
+
+        self._fields: Dict[str, str] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._part_headers: Dict[bytes, bytes] = {}
+        self._part_name: Optional[str] = None
+        self._part_value: List[bytes] = []
+        self._is_file_part = False
+
+        self._file = None
+        self._temp_path: Optional[Path] = None
+        self._file_name: Optional[str] = None
+        self._file_size = 0
+        self._sha256 = hashlib.sha256()
+        self._pending: List[bytes] = []
+
+    async def consume(self, stream: AsyncIterator[bytes]) -> StoredUpload:
+        """
+        Read the whole request body and store the file.
+
+        Raises:
+            UploadTooLargeError: If the file exceeds max_size
+            UploadError: If the body has no allowed file part
+        """
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            async for chunk in stream:
+                self._parser.write(chunk)
+                self._flush()
+            self._parser.finalize()
+            self._flush()
+        except Exception:
+            self._discard()
+            raise
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+        if self._temp_path is None:
+            self._discard()
+            raise UploadError(f"Missing '{self.FILE_FIELD}' file part")
+
+        upload_id = self._fields.get("upload_id") or str(uuid.uuid4())
+        if Path(upload_id).name != upload_id:
+            self._discard()
+            raise UploadError("Invalid upload_id")
+
+        final_path = self.upload_dir / f"{upload_id}{Path(self._file_name).suffix.lower()}"
+        self._temp_path.replace(final_path)
+
+        logger.info(f"Stored upload {upload_id}: {self._file_size} bytes at {final_path}")
+        return StoredUpload(
+            upload_id=upload_id,
+            file_path=str(final_path),
+            file_name=self._file_name,
+            file_size=self._file_size,
+            file_hash=self._sha256.hexdigest(),
+            fields=dict(self._fields),
+        )
+
+    def _flush(self):
+        """Write file data collected by the parser callbacks."""
+        if not self._pending:
+            return
+
+        data = b"".join(self._pending)
+        self._pending.clear()
+
+        self._file_size += len(data)
+        if self._file_size > self.max_size:
+            raise UploadTooLargeError(
+                f"File exceeds maximum size of {self.max_size // (1024 * 1024)}MB"
+            )
+
+        self._sha256.update(data)
+        self._file.write(data)
+
+    def _discard(self):
+        """Remove a partially written file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._temp_path is not None:
+            self._temp_path.unlink(missing_ok=True)
+            self._temp_path = None
+
+    # ============================================
+    # PARSER CALLBACKS
+    # ============================================
+
+    def _on_part_begin(self):
+        self._part_headers = {}
+        self._part_name = None
+        self._part_value = []
+        self._is_file_part = False
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._part_headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, params = parse_options_header(self._part_headers.get(b"content-disposition", b""))
+        self._part_name = params.get(b"name", b"").decode("utf-8", "replace")
+        filename = params.get(b"filename")
+
+        if filename is None:
+            return
+        if self._part_name != self.FILE_FIELD or self._temp_path is not None:
+            raise UploadError("Expected exactly one file part named 'file'")
+
+        self._file_name = Path(filename.decode("utf-8", "replace")).name
+        suffix = Path(self._file_name).suffix.lower()
+        if suffix not in settings.ALLOWED_EXTENSIONS:
+            raise UploadError(f"Unsupported file type: {suffix or self._file_name}")
+
+        self._is_file_part = True
+        self._temp_path = self.upload_dir / f".{uuid.uuid4().hex}.part"
+        self._file = open(self._temp_path, "wb")
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if self._is_file_part:
+            self._pending.append(data[start:end])
+        else:
+            self._part_value.append(data[start:end])
+
+    def _on_part_end(self):
+        if not self._is_file_part and self._part_name:
+            self._fields[self._part_name] = b"".join(self._part_value).decode("utf-8", "replace")
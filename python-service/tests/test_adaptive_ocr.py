@@ -0,0 +1,69 @@
+"""
+Tests for adaptive-resolution OCR
+"""
+
+import pytest
+import fitz
+
+from config import settings
+from services.text_extractor import OCRProcessor, clear_sessions
+
+
+@pytest.fixture
+def scan_pdf(tmp_path):
+    path = tmp_path / "scan.pdf"
+    doc = fitz.open()
+    for _ in range(3):
+        doc.new_page()
+    doc.save(str(path))
+    doc.close()
+    yield str(path)
+    clear_sessions()
+
+
+@pytest.mark.asyncio
+async def test_only_weak_drafts_are_rendered_again(scan_pdf, monkeypatch):
+    """Test that clean pages keep their draft and weak ones are re-rendered at full resolution."""
+    monkeypatch.setattr(settings, "OCR_CONFIDENCE_THRESHOLD", 0.5)
+    monkeypatch.setattr(settings, "OCR_DRAFT_MIN_TEXT_LENGTH", 20)
+    calls = []
+    drafts = {
+        0: ("نص واضح من صفحة مطبوعة نظيفة", 0.9),  # Kept
+        1: ("نص غير واضح من صفحة باهتة", 0.3),  # Low confidence
+        2: ("قصير", 0.9),  # Too little text
+    }
+
+    async def fake_recognize(file_path, page_indexes, dpi):
+        calls.append((page_indexes, dpi))
+        if dpi == 150:
+            return [drafts[index] for index in page_indexes]
+        return [(f"full resolution text of page {index + 1}", 0.8) for index in page_indexes]
+
+    processor = OCRProcessor("tesseract", workers=0)
+    processor.cache = None
+    processor.dpi, processor.draft_dpi = 300, 150
+    processor._recognize_pages = fake_recognize
+
+    pages = await processor.process_pdf(scan_pdf)
+
+    # One batch: drafts of every page, then only the weak pages again
+    assert calls == [([0, 1, 2], 150), ([1, 2], 300)]
+    assert [p.ocr_dpi for p in pages] == [150, 300, 300]
+    assert pages[0].text == drafts[0][0] and pages[1].confidence == 0.8
+
+
+def test_draft_disabled():
+    """Test that a draft DPI of 0 (or not below the full DPI) renders once."""
+    processor = OCRProcessor("tesseract", workers=0)
+    processor.dpi = 300
+
+    processor.draft_dpi = 0
+    assert processor.resolutions() == (300,)
+    processor.draft_dpi = 300
+    assert processor.resolutions() == (300,)
+    processor.draft_dpi = 200
+    assert processor.resolutions() == (200, 300)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,89 @@
+"""
+Tests for batch ingestion
+"""
+
+import json
+import pytest
+
+from services.jobs import (
+    InMemoryJobStore,
+    JobExecutor,
+    BatchRunner,
+    collect_batch_files,
+    read_batch_summary,
+)
+from models import ProcessingOptions
+
+
+@pytest.fixture
+def library(tmp_path):
+    """Create a directory with two ABX books and an unsupported file."""
+    books = tmp_path / "books"
+    (books / "nested").mkdir(parents=True)
+    for name in ("a.abx", "nested/b.abx"):
+        (books / name).write_text("الفصل الأول\n\nمحتوى الفصل الأول\n" * 20, encoding="utf-8")
+    (books / "notes.json").write_text("{}", encoding="utf-8")
+    return books
+
+
+def test_collect_batch_files(library):
+    """Test expanding directories and glob patterns."""
+    assert [p.split("/")[-1] for p in collect_batch_files([str(library)])] == ["a.abx"]
+    assert len(collect_batch_files([str(library)], recursive=True)) == 2
+    assert len(collect_batch_files([f"{library}/**/*.abx"])) == 2
+    assert collect_batch_files([str(library / "notes.json")]) == []
+
+
+@pytest.mark.asyncio
+async def test_batch_runner(library, tmp_path):
+    """Test that a batch writes per-file results and an aggregate summary."""
+    store = InMemoryJobStore()
+    executor = JobExecutor(store, max_workers=2)
+    files = collect_batch_files([str(library)], recursive=True)
+    progress = []
+
+    runner = BatchRunner(
+        store, executor, files,
+        ProcessingOptions(use_ai_parsing=False, use_cache=False),
+        parallelism=2,
+        output_dir=tmp_path / "out",
+        on_progress=progress.append
+    )
+    summary = await runner.run()
+    await executor.shutdown()
+
+    assert summary["status"] == "COMPLETED"
+    assert summary["completed"] == 2
+    assert summary["failed"] == 0
+    assert summary["pages"] > 0
+    assert len(progress) == 2
+
+    manifest = (runner.output_dir / "manifest.jsonl").read_text(encoding="utf-8").splitlines()
+    assert {json.loads(line)["file_path"] for line in manifest} == set(files)
+    assert len(list((runner.output_dir / "results").iterdir())) == 2
+    assert read_batch_summary(runner.batch_id, tmp_path / "out")["completed"] == 2
+
+    # Batch jobs are not kept in the job store
+    assert store.count_by_status() == {}
+
+
+@pytest.mark.asyncio
+async def test_batch_summary_reports_failures(library, tmp_path):
+    """Test that a finished batch with failed files is not reported as COMPLETED."""
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+    store = InMemoryJobStore()
+    executor = JobExecutor(store, max_workers=2)
+    options = ProcessingOptions(use_ai_parsing=False, use_cache=False)
+
+    statuses = []
+    for files in ([str(library / "a.abx"), str(broken)], [str(broken)]):
+        runner = BatchRunner(store, executor, files, options, output_dir=tmp_path / "out")
+        statuses.append((await runner.run())["status"])
+    await executor.shutdown()
+
+    assert statuses == ["PARTIAL", "FAILED"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,58 @@
+"""
+Tests for the benchmark runner and regression gate
+"""
+
+import asyncio
+import pytest
+
+from benchmarks import Benchmark, measure, compare, load_baseline, save_baseline
+from benchmarks.__main__ import main
+
+
+def test_measure_reports_throughput_and_memory():
+    """Test the measured fields of a small benchmark."""
+    async def run():
+        data = [bytes(1024) for _ in range(200)]
+        return len(data) // 100
+
+    loop = asyncio.new_event_loop()
+    try:
+        result = measure(Benchmark("alloc", run), loop, min_time=0.01, min_rounds=3)
+    finally:
+        loop.close()
+
+    assert result["rounds"] >= 3
+    assert result["ops_per_sec"] > 0
+    assert result["pages_per_sec"] == pytest.approx(2 * result["ops_per_sec"], rel=0.01)
+    assert result["peak_memory_bytes"] >= 200 * 1024
+
+
+def test_compare_flags_regressions(tmp_path):
+    """Test the gate on throughput and memory, and baseline merging."""
+    path = tmp_path / "baseline.json"
+    save_baseline(path, {
+        "fast": {"ops_per_sec": 100.0, "peak_memory_bytes": 10_000_000},
+        "other": {"ops_per_sec": 5.0, "peak_memory_bytes": 1_000},
+    })
+    save_baseline(path, {"fast": {"ops_per_sec": 100.0, "peak_memory_bytes": 10_000_000}})
+    baseline = load_baseline(path)
+    assert set(baseline["results"]) == {"fast", "other"}
+
+    assert compare({"fast": {"ops_per_sec": 80.0, "peak_memory_bytes": 10_000_000}}, baseline, 0.25) == []
+
+    regressions = compare({"fast": {"ops_per_sec": 50.0, "peak_memory_bytes": 20_000_000}}, baseline, 0.25)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("fast: 50.000 ops/s")
+
+    # Tiny absolute memory growth is noise
+    assert compare({"other": {"ops_per_sec": 5.0, "peak_memory_bytes": 5_000}}, baseline, 0.25) == []
+    assert load_baseline(tmp_path / "missing.json") is None
+
+
+def test_gate_fails_without_baseline(tmp_path):
+    """Test that a missing baseline fails the gate instead of passing it."""
+    assert main(["--baseline", str(tmp_path / "missing.json")]) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
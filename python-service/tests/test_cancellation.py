@@ -0,0 +1,105 @@
+"""
+Tests for cooperative job cancellation
+"""
+
+import pytest
+import fitz
+
+from services.jobs import (
+    InMemoryJobStore,
+    JobExecutor,
+    CancellationToken,
+    JobCancelledError,
+)
+from services.document_processor import DocumentProcessor
+from services.text_extractor import PDFExtractor
+from models import ProcessingOptions, ProcessingStatus, StepStatus
+
+
+def _new_job(store, upload_id="job-1", **fields):
+    store.create(upload_id, {
+        "status": ProcessingStatus.PENDING,
+        "progress": 0,
+        "current_step": None,
+        "logs": [],
+        **fields,
+    })
+    return upload_id
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    path = tmp_path / "book.pdf"
+    doc = fitz.open()
+    for i in range(5):
+        doc.new_page().insert_text((72, 72), f"Page {i + 1}")
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_token_polls_job_store():
+    """Test that the token sees cancel_requested and deleted jobs."""
+    store = InMemoryJobStore()
+    upload_id = _new_job(store)
+    token = CancellationToken(store, upload_id, interval=0)
+
+    token.check()
+    store.update(upload_id, cancel_requested=True)
+    with pytest.raises(JobCancelledError):
+        token.check()
+
+    other = CancellationToken(store, "missing", interval=0)
+    assert other.cancelled
+
+    local = CancellationToken()
+    assert not local.cancelled
+    local.cancel()
+    assert local.cancelled
+
+
+@pytest.mark.asyncio
+async def test_pdf_extractor_stops_between_pages(sample_pdf):
+    """Test that extraction raises instead of falling back to pdfplumber."""
+    token = CancellationToken()
+    token.cancel()
+
+    with pytest.raises(JobCancelledError):
+        await PDFExtractor().extract(sample_pdf, token)
+
+
+@pytest.mark.asyncio
+async def test_processor_marks_job_cancelled(sample_pdf):
+    """Test that a cancelled job ends as CANCELLED, not FAILED."""
+    store = InMemoryJobStore()
+    upload_id = _new_job(store, cancel_requested=True)
+
+    await DocumentProcessor().process(
+        upload_id, sample_pdf,
+        ProcessingOptions(use_ai_parsing=False, use_cache=False),
+        store
+    )
+
+    job = store.get(upload_id)
+    assert job["status"] == ProcessingStatus.CANCELLED
+    assert job.get("result") is None
+    assert job["logs"][-1]["status"] == StepStatus.SKIPPED
+
+
+@pytest.mark.asyncio
+async def test_executor_skips_cancelled_queued_job(sample_pdf):
+    """Test that jobs cancelled while queued never start."""
+    store = InMemoryJobStore()
+    upload_id = _new_job(store, cancel_requested=True)
+    executor = JobExecutor(store, max_workers=1)
+
+    await executor.run(upload_id, sample_pdf, ProcessingOptions(use_ai_parsing=False, use_cache=False))
+    await executor.shutdown()
+
+    job = store.get(upload_id)
+    assert job["status"] == ProcessingStatus.CANCELLED
+    assert job["logs"] == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
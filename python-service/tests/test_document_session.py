@@ -0,0 +1,104 @@
+"""
+Tests for shared document sessions
+"""
+
+import os
+import pytest
+import fitz
+
+from services.text_extractor import SessionCache, DocumentSession, PDFExtractor, TextExtractor
+from services.text_extractor import document_session
+
+
+def _write_pdf(path, pages=3, title="Book"):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"Page {i + 1}")
+    doc.set_toc([[1, f"Chapter {i + 1}", i + 1] for i in range(pages)])
+    doc.set_metadata({"title": title})
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    cache = SessionCache(max_sessions=2)
+    monkeypatch.setattr(document_session, "_session_cache", cache)
+    return cache
+
+
+def test_session_caches_document_data(tmp_path):
+    """Test lazy opening and cached metadata, outline and page text."""
+    session = DocumentSession(_write_pdf(tmp_path / "book.pdf"))
+    assert session._doc is None
+
+    assert session.page_count == 3
+    assert session.metadata["title"] == "Book"
+    assert [entry[1] for entry in session.get_toc()] == ["Chapter 1", "Chapter 2", "Chapter 3"]
+    assert "Page 2" in session.page_text(1)
+    assert session._page_text.keys() == {1}
+
+    session.close()
+    assert session._doc is None
+
+
+def test_cache_reuses_and_evicts(tmp_path):
+    """Test LRU reuse, eviction and reopening of replaced files."""
+    cache = SessionCache(max_sessions=2)
+    paths = [_write_pdf(tmp_path / f"{name}.pdf") for name in "abc"]
+
+    first = cache.get(paths[0])
+    assert cache.get(paths[0]) is first
+    assert first.page_count == 3
+
+    cache.get(paths[1])
+    cache.get(paths[2])
+    assert len(cache) == 2
+    assert first._doc is None  # Closed on eviction
+    assert cache.get(paths[0]) is not first
+
+    # A file replaced under the same path gets a fresh session
+    session = cache.get(paths[1])
+    _write_pdf(paths[1], pages=5)
+    os.utime(paths[1], ns=(0, session.signature[1] + 1))
+    assert cache.get(paths[1]).page_count == 5
+
+
+@pytest.mark.asyncio
+async def test_stages_share_one_open(tmp_path, sessions, monkeypatch):
+    """Test that info, outline and text extraction open the PDF once."""
+    path = _write_pdf(tmp_path / "book.pdf")
+    opened = []
+    real_open = fitz.open
+    monkeypatch.setattr(document_session.fitz, "open", lambda *a, **k: opened.append(a) or real_open(*a, **k))
+
+    info = await TextExtractor().get_document_info(path)
+    toc = await PDFExtractor().get_embedded_toc(path)
+    extracted, _ = await PDFExtractor().extract(path)
+
+    assert info["page_count"] == 3
+    assert len(toc) == 3
+    assert extracted.total_pages == 3
+    assert len(opened) == 1
+
+
+@pytest.mark.asyncio
+async def test_job_leaves_no_text_behind(tmp_path, sessions):
+    """Test that extraction does not keep page text and release drops what was cached."""
+    path = _write_pdf(tmp_path / "book.pdf")
+
+    await PDFExtractor(workers=0).extract(path)
+    session = sessions.get(path)
+    assert session._page_text == {}
+
+    session.page_text(0)
+    session.extracted = object()
+    document_session.release_session(path)
+
+    assert session._page_text == {} and session.extracted is None
+    assert session._doc is not None  # Still open for the next job
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
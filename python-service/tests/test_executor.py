@@ -0,0 +1,152 @@
+"""
+Tests for Job Executor
+"""
+
+import asyncio
+import threading
+import pytest
+
+from services.jobs import InMemoryJobStore, JobExecutor, QueueFullError
+from services.jobs import executor as executor_module
+from services import metrics
+from models import ProcessingOptions, ProcessingStatus
+
+
+@pytest.fixture
+def job_store():
+    """Create an in-memory job store."""
+    return InMemoryJobStore()
+
+
+@pytest.fixture
+def temp_abx_text(tmp_path):
+    """Create a small plain text ABX file."""
+    abx_path = tmp_path / "book.abx"
+    abx_path.write_text("الفصل الأول\n\nمحتوى الفصل الأول\n" * 20, encoding="utf-8")
+    return abx_path
+
+
+def count_pages(pages):
+    """Interactive call recording a metric in the worker process."""
+    metrics.PAGES_EXTRACTED.inc(pages, method="test")
+    return pages
+
+
+def _new_job(job_store, upload_id):
+    job_store.create(upload_id, {"status": ProcessingStatus.PENDING, "progress": 0, "logs": []})
+
+
+async def _wait_finished(job_store, upload_id, timeout=10.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        status = job_store.get(upload_id)["status"]
+        if status in (ProcessingStatus.COMPLETED, ProcessingStatus.FAILED):
+            return status
+        await asyncio.sleep(0.05)
+    raise TimeoutError(upload_id)
+
+
+@pytest.mark.asyncio
+async def test_executor_runs_job(job_store, temp_abx_text):
+    """Test that a queued job is processed by a thread worker."""
+    executor = JobExecutor(job_store, max_workers=1, max_queue_size=5)
+    assert executor.use_processes is False
+
+    _new_job(job_store, "job-1")
+    options = ProcessingOptions(use_ai_parsing=False)
+    position = await executor.submit("job-1", str(temp_abx_text), options)
+
+    assert position == 0
+    assert await _wait_finished(job_store, "job-1") == ProcessingStatus.COMPLETED
+    assert executor.stats()["running"] == 0
+    await executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_queue_full(job_store, temp_abx_text):
+    """Test admission control when the queue is full."""
+    executor = JobExecutor(job_store, max_workers=1, max_queue_size=1)
+    options = ProcessingOptions(use_ai_parsing=False)
+
+    for upload_id in ("a", "b"):
+        _new_job(job_store, upload_id)
+
+    await executor.submit("a", str(temp_abx_text), options)
+    with pytest.raises(QueueFullError):
+        await executor.submit("b", str(temp_abx_text), options)
+
+    assert executor.stats()["queued"] == 1
+    await executor.shutdown()
+
+
+@pytest.fixture
+def blocking_jobs(monkeypatch):
+    """Replace the processing job with one that waits for a release event."""
+    release = threading.Event()
+    order = []
+
+    def fake_job(upload_id, *args, **kwargs):
+        order.append(upload_id)
+        release.wait(timeout=10)
+
+    monkeypatch.setattr(executor_module, "run_processing_job", fake_job)
+    return release, order
+
+
+@pytest.mark.asyncio
+async def test_interactive_uses_reserved_worker(job_store, blocking_jobs):
+    """Test that interactive calls run while bulk jobs occupy every bulk worker."""
+    release, _ = blocking_jobs
+    executor = JobExecutor(job_store, max_workers=1, interactive_workers=1)
+    options = ProcessingOptions(use_ai_parsing=False)
+
+    for upload_id in ("a", "b"):
+        _new_job(job_store, upload_id)
+        await executor.submit(upload_id, "book.abx", options)
+    await asyncio.sleep(0.05)
+
+    assert await asyncio.wait_for(executor.call(sum, [2, 3]), timeout=2) == 5
+    stats = executor.stats()
+    assert (stats["running"], stats["queued"]) == (1, 1)
+
+    release.set()
+    await executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_interactive_runs_before_queued_bulk(job_store, blocking_jobs):
+    """Test priority order on shared workers: interactive first, FIFO within a class."""
+    release, order = blocking_jobs
+    executor = JobExecutor(job_store, max_workers=1, interactive_workers=0)
+    options = ProcessingOptions(use_ai_parsing=False)
+
+    for upload_id in ("a", "b", "c"):
+        _new_job(job_store, upload_id)
+        await executor.submit(upload_id, "book.abx", options)
+    await asyncio.sleep(0.05)
+
+    call = asyncio.create_task(executor.call(order.append, "interactive"))
+    await asyncio.sleep(0.05)
+    release.set()
+    await asyncio.wait_for(call, timeout=2)
+
+    while len(order) < 4:
+        await asyncio.sleep(0.01)
+    assert order == ["a", "interactive", "b", "c"]
+    await executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_interactive_call_metrics_reach_the_parent(job_store):
+    """Test that metrics recorded by an interactive call in a worker process are merged."""
+    executor = JobExecutor(job_store, max_workers=1, interactive_workers=1, use_processes=True)
+    before = metrics.PAGES_EXTRACTED.value(method="test")
+
+    assert await asyncio.wait_for(executor.call(count_pages, 7), timeout=60) == 7
+    assert metrics.PAGES_EXTRACTED.value(method="test") == before + 7
+    await executor.shutdown()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,166 @@
+"""
+Tests for per-page OCR of mixed PDFs
+"""
+
+import io
+import numpy as np
+import pytest
+import fitz
+from PIL import Image
+
+from services.text_extractor import TextExtractor, OCRProcessor, PageClassifier, get_session
+
+
+def _scan_image() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("L", (200, 280), 255).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def mixed_pdf(tmp_path):
+    """Scanned cover, four text pages, then a blank page."""
+    path = tmp_path / "mixed.pdf"
+    doc = fitz.open()
+    cover = doc.new_page()
+    cover.insert_image(cover.rect, stream=_scan_image())
+    for i in range(4):
+        page = doc.new_page()
+        for line in range(10):
+            page.insert_text((72, 72 + line * 14), f"Page {i + 2} line {line + 1} of the sample book")
+    doc.new_page()
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def extractor():
+    ocr_calls = []
+    ocr_batches = []
+
+    async def fake_ocr(image):
+        ocr_calls.append(image.size)
+        return "نص الغلاف", 0.9
+
+    async def fake_ocr_batch(images):
+        results = [await fake_ocr(image) for image in images]
+        ocr_batches.append(len(results))
+        return results
+
+    extractor = TextExtractor()
+    extractor.ocr_processor = OCRProcessor(provider="tesseract", workers=0)
+    extractor.ocr_processor._run_ocr = fake_ocr
+    extractor.ocr_processor._run_ocr_batch = fake_ocr_batch
+    extractor.ocr_processor.cache = None  # Every test OCRs its pages
+    extractor.ocr_processor.draft_dpi = 0  # Once per page
+    extractor.ocr_calls = ocr_calls
+    extractor.ocr_batches = ocr_batches
+    return extractor
+
+
+@pytest.mark.asyncio
+async def test_only_pages_without_text_are_ocred(mixed_pdf, extractor):
+    """Test that the scanned cover is OCRed and the text pages keep their text layer."""
+    extracted = await extractor.extract(mixed_pdf, ocr_provider="tesseract")
+
+    assert len(extractor.ocr_calls) == 1
+    assert [p.is_ocr for p in extracted.pages] == [True, False, False, False, False, False]
+    assert extracted.pages[0].text == "نص الغلاف"
+    assert extracted.pages[1].text.startswith("Page 2 line 1")
+    assert extracted.extraction_method == "hybrid_tesseract"
+    assert not extracted.is_scanned
+
+
+@pytest.mark.asyncio
+async def test_forced_ocr_covers_every_page(mixed_pdf, extractor):
+    """Test that use_ocr still OCRs the whole document."""
+    extracted = await extractor.extract(mixed_pdf, use_ocr=True, ocr_provider="tesseract")
+
+    assert len(extractor.ocr_calls) == 6
+    assert extracted.is_scanned
+    assert extracted.extraction_method == "ocr_tesseract"
+
+
+@pytest.mark.asyncio
+async def test_detected_scan_is_batched(tmp_path, extractor):
+    """Test that consecutive pages the classifier flags reach Tesseract in batches."""
+    path = tmp_path / "scan.pdf"
+    doc = fitz.open()
+    for _ in range(7):
+        page = doc.new_page()
+        page.insert_image(page.rect, stream=_scan_image())
+    doc.save(str(path))
+    doc.close()
+    extractor.ocr_processor.batch_pages = 3
+
+    extracted = await extractor.extract(str(path), ocr_provider="tesseract")
+
+    assert extractor.ocr_batches == [3, 3]  # The seventh page alone is OCRed unbatched
+    assert len(extractor.ocr_calls) == 7
+    assert [p.page_number for p in extracted.pages] == list(range(1, 8))
+    assert all(p.is_ocr for p in extracted.pages)
+
+
+@pytest.mark.asyncio
+async def test_mostly_scanned_pdf_is_ocred_whole(tmp_path, extractor):
+    """Test that a PDF whose first pages mostly need OCR goes through the document OCR path."""
+    path = tmp_path / "scan.pdf"
+    doc = fitz.open()
+    for i in range(8):
+        page = doc.new_page()
+        if i == 3:
+            for line in range(10):
+                page.insert_text((72, 72 + line * 14), f"Line {line + 1} of a page with a text layer")
+        else:
+            page.insert_image(page.rect, stream=_scan_image())
+    doc.save(str(path))
+    doc.close()
+
+    extracted = await extractor.extract(str(path), ocr_provider="tesseract")
+
+    assert len(extractor.ocr_calls) == 8  # The page with text too: the whole document is OCRed
+    assert extractor.ocr_batches == [8]
+    assert all(p.is_ocr for p in extracted.pages)
+    assert extracted.is_scanned
+    assert extracted.extraction_method == "ocr_tesseract"
+
+
+@pytest.mark.asyncio
+async def test_pages_reach_the_engine_in_grayscale(mixed_pdf):
+    """Test that rendered pages are handed to the engines as grayscale, without a PNG round-trip."""
+    received = []
+
+    async def fake_ocr(image):
+        # Copied here: the page only lives as long as its pixmap
+        received.append((type(image), getattr(image, "mode", None), np.array(image)))
+        return "", 0.0
+
+    for provider in ("tesseract", "easyocr"):
+        processor = OCRProcessor(provider=provider, workers=0)
+        processor.cache = None
+        processor.dpi, processor.draft_dpi = 300, 0
+        processor._run_ocr = fake_ocr
+        await processor.ocr_page(mixed_pdf, 0)
+
+    (image_type, mode, pixels), (array_type, _, array) = received
+    assert issubclass(image_type, Image.Image) and mode == "L"
+    assert array_type is np.ndarray
+    assert pixels.shape == array.shape == (3509, 2480)  # A4 at 300 DPI
+    assert (pixels == array).all()
+
+
+def test_classifier_reasons(mixed_pdf):
+    """Test the classification of image, text, blank and garbled pages."""
+    session = get_session(mixed_pdf)
+    classifier = PageClassifier()
+
+    assert classifier.classify(session, 0, "").reason == "image"
+    assert classifier.classify(session, 1, session.page_text(1)).reason == "text"
+    assert classifier.classify(session, 5, "").reason == "sparse"
+    garbled = classifier.classify(session, 1, " �� ab" * 20)
+    assert garbled.needs_ocr and garbled.reason == "garbled"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
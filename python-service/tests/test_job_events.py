@@ -0,0 +1,71 @@
+"""
+Tests for the job progress event stream
+"""
+
+import asyncio
+import json
+import pytest
+
+from services.jobs import InMemoryJobStore, stream_job_events
+from models import ProcessingStatus, ProcessingStep, StepStatus
+
+
+def _parse_events(messages):
+    events = []
+    for message in messages:
+        if message.startswith(":"):
+            continue
+        fields = dict(line.split(": ", 1) for line in message.strip().split("\n"))
+        events.append((fields["event"], json.loads(fields["data"]), fields.get("id")))
+    return events
+
+
+def _log(message):
+    return {
+        "step": ProcessingStep.TEXT_EXTRACTION,
+        "status": StepStatus.COMPLETED,
+        "message": message,
+        "duration": 5,
+        "created_at": 1700000000.0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_only_new_events():
+    """Test that the stream sends new logs and status changes, then ends."""
+    store = InMemoryJobStore()
+    store.create("abc", {"status": ProcessingStatus.PENDING, "progress": 0, "logs": [_log("old")]})
+
+    async def run_job():
+        await asyncio.sleep(0.05)
+        store.update("abc", status=ProcessingStatus.EXTRACTING_TEXT, progress=10)
+        store.append_log("abc", _log("new"))
+        await asyncio.sleep(0.05)
+        store.update("abc", status=ProcessingStatus.COMPLETED, progress=100)
+
+    job = asyncio.create_task(run_job())
+    messages = [m async for m in stream_job_events(store, "abc", cursor=1, interval=0.01)]
+    await job
+
+    events = _parse_events(messages)
+    logs = [data["message"] for event, data, _ in events if event == "log"]
+    progress = [data["progress"] for event, data, _ in events if event == "status"]
+
+    assert logs == ["new"]
+    assert progress == [0, 10, 100]
+    assert events[-1][0] == "end"
+    assert events[-1][1]["status"] == "COMPLETED"
+    assert events[-1][2] == "2"
+
+
+@pytest.mark.asyncio
+async def test_stream_missing_job():
+    """Test that a missing job ends the stream immediately."""
+    store = InMemoryJobStore()
+    events = _parse_events([m async for m in stream_job_events(store, "missing")])
+
+    assert [event for event, _, _ in events] == ["end"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,137 @@
+"""
+Tests for Job Store backends
+"""
+
+import time
+import pytest
+from services.jobs.job_store import InMemoryJobStore, SQLiteJobStore, create_job_store
+from models import ProcessingStatus, ProcessingStep, StepStatus, ProcessingStatusResponse
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def job_store(request, tmp_path):
+    """Create a job store for each backend."""
+    return create_job_store(request.param, tmp_path / "jobs.db", tmp_path / "results")
+
+
+def _initial_job():
+    return {
+        "status": ProcessingStatus.PENDING,
+        "progress": 0,
+        "current_step": None,
+        "logs": [],
+        "detected_title": None,
+        "detected_author": None,
+        "page_count": None,
+        "error_message": None,
+    }
+
+
+def test_create_and_get(job_store):
+    """Test creating a job and reading it back."""
+    job_store.create("abc", _initial_job())
+
+    job = job_store.get("abc")
+    assert job["status"] == ProcessingStatus.PENDING
+    assert job["logs"] == []
+    assert "abc" in job_store
+    assert job_store.get("missing") is None
+
+
+def test_update_and_logs(job_store):
+    """Test updating fields and appending logs."""
+    job_store.create("abc", _initial_job())
+    job_store.update("abc", status=ProcessingStatus.EXTRACTING_TEXT, progress=10,
+                     current_step=ProcessingStep.TEXT_EXTRACTION)
+    job_store.append_log("abc", {
+        "step": ProcessingStep.TEXT_EXTRACTION,
+        "status": StepStatus.COMPLETED,
+        "message": "done",
+        "duration": 12,
+        "created_at": 1700000000.0,
+    })
+
+    job = job_store.get("abc")
+    response = ProcessingStatusResponse(upload_id="abc", **job)
+    assert response.status == ProcessingStatus.EXTRACTING_TEXT
+    assert response.progress == 10
+    assert response.logs[0].step == ProcessingStep.TEXT_EXTRACTION
+    assert response.logs[0].duration == 12
+
+
+def test_update_missing_job(job_store):
+    """Test updating a job that does not exist."""
+    with pytest.raises(KeyError):
+        job_store.update("missing", progress=50)
+
+
+def test_delete_and_counts(job_store):
+    """Test deleting jobs and counting by status."""
+    job_store.create("a", _initial_job())
+    job_store.create("b", _initial_job())
+    job_store.update("b", status=ProcessingStatus.COMPLETED)
+
+    assert job_store.count_by_status() == {"PENDING": 1, "COMPLETED": 1}
+    assert job_store.delete("a") is True
+    assert job_store.delete("a") is False
+    assert job_store.count_by_status() == {"COMPLETED": 1}
+
+
+def test_large_result_spills_to_disk(job_store):
+    """Test that large results are kept out of the job and loaded on request."""
+    result = {"chapters": [{"title": "الفصل", "content": "نص " * 50000}]}
+    job_store.create("big", _initial_job())
+    job_store.update("big", status=ProcessingStatus.COMPLETED, result=result)
+    job_store.create("small", _initial_job())
+    job_store.update("small", status=ProcessingStatus.COMPLETED, result={"chapters": []})
+
+    summary = job_store.get_summary("big")
+    assert "result" not in summary
+    assert summary["result_bytes"] > job_store.spill_bytes
+    assert job_store.result_path("big").exists()
+    assert job_store.get_result("big") == result
+    assert job_store.get("big")["result"] == result
+
+    assert job_store.result_path("small") is None
+    assert job_store.get_result("small") == {"chapters": []}
+
+    job_store.delete("big")
+    assert list(job_store.result_dir.iterdir()) == []
+
+
+def test_evict_finished_jobs(job_store):
+    """Test TTL and size-budget eviction of finished jobs only."""
+    for upload_id in ("old", "a", "b", "running"):
+        job_store.create(upload_id, _initial_job())
+    job_store.update("old", status=ProcessingStatus.FAILED)
+    time.sleep(0.05)
+    job_store.update("a", status=ProcessingStatus.COMPLETED, result={"text": "x" * 1000})
+    job_store.update("b", status=ProcessingStatus.COMPLETED, result={"text": "x" * 1000})
+
+    # Only "old" is past the TTL
+    assert job_store.evict_finished(max_age=0.04, max_bytes=10**9) == 1
+    assert job_store.get_summary("old") is None
+
+    # Only the newest result fits in the budget
+    assert job_store.evict_finished(max_age=3600, max_bytes=1500) == 1
+    assert job_store.get_summary("a") is None
+    assert job_store.get_summary("b") is not None
+    assert job_store.get_summary("running") is not None
+
+
+def test_sqlite_store_shared_between_instances(tmp_path):
+    """Test that two SQLite stores on the same file see the same jobs."""
+    db_path = tmp_path / "jobs.db"
+    writer = SQLiteJobStore(db_path)
+    reader = SQLiteJobStore(db_path)
+
+    writer.create("abc", _initial_job())
+    writer.update("abc", progress=70)
+
+    assert reader.get("abc")["progress"] == 70
+    assert SQLiteJobStore.shared_across_processes is True
+    assert InMemoryJobStore.shared_across_processes is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
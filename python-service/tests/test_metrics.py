@@ -0,0 +1,73 @@
+"""
+Tests for the in-process metrics registry
+"""
+
+import pickle
+import pytest
+
+from services.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+def test_render_text_format(registry):
+    """Test the Prometheus exposition format of each metric type."""
+    steps = registry.histogram("step_seconds", "Step duration.", ["step"], buckets=(0.1, 1.0))
+    pages = registry.counter("pages_total", "Pages.", ["method"])
+    depth = registry.gauge("queue_depth", "Queue depth.")
+
+    steps.observe(0.05, step="OCR")
+    steps.observe(0.5, step="OCR")
+    steps.observe(3, step="OCR")
+    pages.inc(10, method="text")
+    depth.set(4)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE step_seconds histogram" in lines
+    assert 'step_seconds_bucket{step="OCR",le="0.1"} 1' in lines
+    assert 'step_seconds_bucket{step="OCR",le="1"} 2' in lines
+    assert 'step_seconds_bucket{step="OCR",le="+Inf"} 3' in lines
+    assert 'step_seconds_sum{step="OCR"} 3.55' in lines
+    assert 'step_seconds_count{step="OCR"} 3' in lines
+    assert 'pages_total{method="text"} 10' in lines
+    assert "queue_depth 4" in lines
+
+
+def test_labels_are_validated_and_escaped(registry):
+    """Test label checking and escaping of label values."""
+    errors = registry.counter("errors_total", "Errors.", ["provider"])
+
+    with pytest.raises(ValueError):
+        errors.inc(provider="local", extra="x")
+
+    errors.inc(provider='a"b')
+    assert 'errors_total{provider="a\\"b"} 1' in registry.render()
+
+
+def test_drain_and_merge(registry):
+    """Test moving values from a worker registry to the parent."""
+    worker = MetricsRegistry()
+    worker_pages = worker.counter("pages_total", "Pages.", ["method"])
+    worker_steps = worker.histogram("step_seconds", "Steps.", ["step"], buckets=(1.0,))
+    worker_pages.inc(5, method="ocr")
+    worker_steps.observe(2.0, step="OCR")
+
+    pages = registry.counter("pages_total", "Pages.", ["method"])
+    steps = registry.histogram("step_seconds", "Steps.", ["step"], buckets=(1.0,))
+    pages.inc(1, method="ocr")
+
+    # Deltas cross process boundaries, so they must pickle
+    delta = pickle.loads(pickle.dumps(worker.drain()))
+    registry.merge(delta)
+    registry.merge(worker.drain())
+
+    assert pages.value(method="ocr") == 6
+    assert steps.count(step="OCR") == 1
+    assert worker_pages.value(method="ocr") == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
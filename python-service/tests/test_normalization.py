@@ -0,0 +1,49 @@
+"""
+Tests for the Arabic normalization profiles
+"""
+
+import pytest
+
+from services.normalization import normalize, normalize_many, get_profile, BATCH_CHARS
+
+
+PAGES = [
+    "  قال الإمام أبو حامد  رحمه الله:\n\n\n\nإنَّ المسألة\u200b الأولى  ",
+    "12\nنص الصفحة\n- 13 -\nآخر سطر",
+    "",
+    "\n\n\n",
+    "مكتبة إسلامية  ى",
+]
+
+
+def test_storage_profile():
+    """Test zero-width removal, letter folding and whitespace collapsing."""
+    assert normalize(PAGES[0], "storage") == "قال الامام ابو حامد رحمه الله:\n\nانَّ المساله الاولي"
+    assert normalize(PAGES[4]) == "مكتبه اسلاميه ي"
+
+
+def test_matching_and_search_profiles():
+    """Test diacritics, tatweel, whitespace and punctuation handling."""
+    assert normalize("الفَصْلُ  الأوّل\nفي   الكـتاب", "matching") == "الفصل الاول في الكتاب"
+    assert normalize("Chapter 1: الفصلُ، الأول!", "search") == "chapter 1 الفصل الاول"
+
+
+def test_display_profile():
+    """Test that page-number lines go and letters stay."""
+    assert normalize(PAGES[1], "display") == "نص الصفحة\n\nآخر سطر"
+
+
+@pytest.mark.parametrize("profile", ["storage", "matching", "search", "display"])
+def test_normalize_many_matches_normalize(profile):
+    """Test that batched normalization gives the per-text results."""
+    texts = PAGES * 50 + ["كلمة " * BATCH_CHARS] + ["separator \ue000 inside"] + PAGES
+    assert normalize_many(texts, profile) == [normalize(t, profile) for t in texts]
+
+
+def test_unknown_profile():
+    with pytest.raises(ValueError):
+        get_profile("latin")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
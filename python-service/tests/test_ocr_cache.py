@@ -0,0 +1,116 @@
+"""
+Tests for the OCR page cache
+"""
+
+import os
+
+import pytest
+import fitz
+
+from services.text_extractor import OCRProcessor, clear_sessions
+from services.text_extractor.ocr_processor import OCRCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return OCRCache(tmp_path / "ocr_cache", max_bytes=10 * 1024 * 1024)
+
+
+def test_key_depends_on_provider_and_dpi():
+    """Test that every setting affecting the OCR output changes the key."""
+    base = OCRCache.make_key("hash", 1, "tesseract", 300)
+
+    assert base == OCRCache.make_key("hash", 1, "tesseract", 300)
+    assert base != OCRCache.make_key("hash", 2, "tesseract", 300)
+    assert base != OCRCache.make_key("hash", 1, "easyocr", 300)
+    assert base != OCRCache.make_key("hash", 1, "tesseract", 150)
+
+
+def test_set_and_get_sharded(cache):
+    """Test that text and confidence are stored in a shard directory."""
+    key = OCRCache.make_key("hash", 1, "tesseract", 300)
+    cache.set(key, "نص الصفحة", 0.87)
+
+    assert cache.get(key) == ("نص الصفحة", 0.87)
+    assert (cache.cache_dir / key[:2] / f"{key}.json").exists()
+    assert cache.get(OCRCache.make_key("hash", 2, "tesseract", 300)) is None
+
+
+def test_lru_eviction(tmp_path):
+    """Test that the least recently used pages are evicted first."""
+    cache = OCRCache(tmp_path / "ocr_cache", max_bytes=2500)
+    text = "x" * 1000
+
+    cache.set("aa-old", text, 0.9)
+    os.utime(cache._path("aa-old"), (1, 1))
+    cache.set("bb-recent", text, 0.9)
+    os.utime(cache._path("bb-recent"), (2, 2))
+    cache.get("aa-old")  # Touch: now most recently used
+    cache.set("cc-new", text, 0.9)
+
+    assert cache.get("bb-recent") is None
+    assert cache.get("aa-old") is not None
+    assert cache.get("cc-new") is not None
+
+
+def test_size_counted_once_per_scan_interval(tmp_path, monkeypatch):
+    """Test that writes between scans are added up instead of rescanning the directory."""
+    cache = OCRCache(tmp_path / "ocr_cache", scan_interval=3600)
+    scans = []
+    entries = cache._entries
+    monkeypatch.setattr(cache, "_entries", lambda: scans.append(1) or entries())
+
+    for key in ("aa-one", "bb-two", "cc-three"):
+        cache.set(key, "نص", 0.9)
+
+    assert len(scans) == 1
+
+
+def test_rescan_sees_other_processes_writes(tmp_path):
+    """Test that another writer's entries count towards the limit once the size is recounted."""
+    text = "x" * 1000
+    cache = OCRCache(tmp_path / "ocr_cache", max_bytes=2500, scan_interval=0)
+    other = OCRCache(tmp_path / "ocr_cache", max_bytes=10 * 1024 * 1024)
+
+    cache.set("aa-one", text, 0.9)
+    other.set("bb-two", text, 0.9)
+    other.set("cc-three", text, 0.9)
+    cache.set("dd-four", text, 0.9)
+
+    assert len(cache._entries()) == 2
+
+
+@pytest.mark.asyncio
+async def test_ocr_page_uses_cache(tmp_path, cache):
+    """Test that a page OCRed once is served from the cache afterwards."""
+    path = tmp_path / "scan.pdf"
+    doc = fitz.open()
+    doc.new_page()
+    doc.save(str(path))
+    doc.close()
+
+    calls = []
+
+    async def fake_recognize(file_path, page_index, dpi):
+        calls.append(dpi)
+        return "نص", 0.75  # Too short to keep the draft
+
+    processor = OCRProcessor("tesseract", workers=0)
+    processor.cache = cache
+    processor.dpi, processor.draft_dpi = 300, 200
+    processor._recognize_page = fake_recognize
+
+    first = await processor.ocr_page(str(path), 0)
+    second = await processor.ocr_page(str(path), 0)
+    processor.dpi = 400
+    await processor.ocr_page(str(path), 0)
+    clear_sessions()
+
+    assert first == second
+    assert second.confidence == 0.75 and second.ocr_dpi == 300
+    # Both resolutions were cached by the first call; only the new DPI is OCRed again
+    assert calls == [200, 300, 400]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,129 @@
+"""
+Tests for the OCR worker pool
+"""
+
+import io
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+import fitz
+from PIL import Image
+
+from config import settings
+from services.text_extractor import OCRProcessor, TextExtractor, clear_sessions, shutdown_ocr_pool
+from services.text_extractor import ocr_processor
+
+
+def fake_worker(file_path, page_indexes, provider, dpi):
+    """Stands in for the OCR engine; kills its worker on page 3 until a marker file exists."""
+    marker = f"{file_path}.crashed"
+    if 2 in page_indexes and not os.path.exists(marker):
+        if "always" not in file_path:
+            open(marker, "w").close()
+        os._exit(1)
+    return [(f"page {index + 1} at {dpi} dpi", 0.9) for index in page_indexes]
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    monkeypatch.setattr(ocr_processor, "_ocr_pages_worker", fake_worker)
+    yield
+    shutdown_ocr_pool()
+    clear_sessions()
+
+
+def _blank_pdf(path, pages=6):
+    doc = fitz.open()
+    for _ in range(pages):
+        doc.new_page()
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def _mixed_pdf(path, pages=10):
+    """Text pages alternating with scanned pages, which hybrid extraction OCRs one by one."""
+    buffer = io.BytesIO()
+    Image.new("L", (200, 280), 255).save(buffer, "PNG")
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        if i % 2:
+            page.insert_image(page.rect, stream=buffer.getvalue())
+        else:
+            for line in range(10):
+                page.insert_text((72, 72 + line * 14), f"Page {i + 1} line {line + 1} of the sample book")
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def _processor():
+    processor = OCRProcessor("tesseract")
+    processor.workers = 2  # Regardless of the CPUs of the test machine
+    processor.cache = None
+    processor.batch_pages = 2
+    return processor
+
+
+@pytest.mark.asyncio
+async def test_pool_restarts_after_worker_death(tmp_path, fake_ocr):
+    """Test that pages come back in order after a worker dies mid-document."""
+    path = _blank_pdf(tmp_path / "scan.pdf")
+    pages = await _processor().process_pdf(path)
+
+    assert os.path.exists(f"{path}.crashed")
+    assert [p.text for p in pages] == [f"page {i} at 300 dpi" for i in range(1, 7)]
+    assert all(p.is_ocr and p.confidence == 0.9 for p in pages)
+
+
+@pytest.mark.asyncio
+async def test_single_pages_use_the_pool(tmp_path, fake_ocr):
+    """Test that hybrid extraction's single pages are OCRed on the pool, surviving a worker death."""
+    path = _blank_pdf(tmp_path / "scan.pdf")
+    page = await _processor().ocr_page(path, 2)
+
+    assert os.path.exists(f"{path}.crashed")
+    assert page.text == "page 3 at 300 dpi" and page.ocr_dpi == 300
+
+
+@pytest.mark.asyncio
+async def test_hybrid_pages_are_ocred_concurrently(tmp_path, fake_ocr, monkeypatch):
+    """Test that hybrid extraction keeps several flagged pages in flight and their order."""
+    in_flight, peak = 0, 0
+    ocr_pages = OCRProcessor.ocr_pages
+
+    async def counting_ocr_pages(self, file_path, page_indexes):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            return await ocr_pages(self, file_path, page_indexes)
+        finally:
+            in_flight -= 1
+
+    monkeypatch.setattr(OCRProcessor, "ocr_pages", counting_ocr_pages)
+    extractor = TextExtractor()
+    extractor.ocr_processor = _processor()
+    extracted = await extractor.extract(_mixed_pdf(tmp_path / "mixed.pdf"), ocr_provider="tesseract")
+
+    assert peak > 1
+    assert [p.page_number for p in extracted.pages] == list(range(1, 11))
+    assert [p.is_ocr for p in extracted.pages] == [False, True] * 5
+    assert extracted.pages[1].text == "page 2 at 300 dpi"
+    assert extracted.pages[2].text.startswith("Page 3 line 1")
+    assert extracted.extraction_method == "hybrid_tesseract"
+
+
+@pytest.mark.asyncio
+async def test_pool_gives_up_on_page_that_keeps_crashing(tmp_path, fake_ocr, monkeypatch):
+    """Test that restarts are bounded."""
+    monkeypatch.setattr(settings, "OCR_WORKER_MAX_RESTARTS", 1)
+
+    with pytest.raises(BrokenProcessPool):
+        await _processor().process_pdf(_blank_pdf(tmp_path / "always.pdf"))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
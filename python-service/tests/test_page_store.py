@@ -0,0 +1,67 @@
+"""
+Tests for the single-buffer page store
+"""
+
+import json
+import pytest
+
+from models import ExtractedText, PageContent, PageStore
+
+
+def _pages():
+    return [
+        PageContent(page_number=1, text="الصفحة الأولى"),
+        PageContent(page_number=2, text=""),
+        PageContent(page_number=3, text="الصفحة الثالثة", confidence=0.8, is_ocr=True),
+    ]
+
+
+def test_from_pages_joins_into_one_buffer():
+    """Test that the buffer is the full text and pages are views into it."""
+    store = PageStore.from_pages(_pages(), separator="\n\n")
+
+    assert store.text == "الصفحة الأولى\n\n\n\nالصفحة الثالثة"
+    assert len(store) == 3
+    assert list(store) == _pages()
+    assert store[-1].confidence == 0.8 and store[-1].is_ocr
+    assert store[1:] == _pages()[1:]
+    with pytest.raises(IndexError):
+        store[3]
+
+    views = store.dicts()
+    assert views[0]["text"] == "الصفحة الأولى"
+    assert dict(views[2]) == _pages()[2].model_dump()
+
+
+def test_from_text_locates_pages():
+    """Test that pages found in an existing text share it, and others are kept apart."""
+    text = "  first page  \n\nsecond page\n"
+    pages = [
+        {"page_number": 1, "text": "first page"},
+        {"page_number": 2, "text": "not in the text"},
+        {"page_number": 3, "text": "second page"},
+    ]
+    store = PageStore.from_text(text, pages)
+
+    assert store.text is text
+    assert [p.text for p in store] == ["first page", "not in the text", "second page"]
+
+
+def test_extracted_text_keeps_its_shape():
+    """Test that dumps and validation still use text / pages."""
+    extracted = ExtractedText.from_pages(_pages(), extraction_method="ocr_tesseract", is_scanned=True)
+
+    assert extracted.total_pages == 3
+    assert extracted.text is extracted.store.text
+
+    dumped = extracted.model_dump()
+    assert set(dumped) == {"text", "pages", "total_pages", "is_scanned", "extraction_method", "fallback_pages"}
+    assert dumped["pages"] == [p.model_dump() for p in _pages()]
+
+    restored = ExtractedText.model_validate(json.loads(extracted.model_dump_json()))
+    assert restored == extracted
+    assert ExtractedText(**dumped) == extracted
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,61 @@
+"""
+Tests for parallel PDF text extraction
+"""
+
+import pytest
+import fitz
+
+from config import settings
+from services.text_extractor import PDFExtractor, shutdown_extraction_pool
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    path = tmp_path / "book.pdf"
+    doc = fitz.open()
+    for i in range(23):
+        page = doc.new_page()
+        for line in range(10):
+            page.insert_text((72, 72 + line * 14), f"Page {i + 1}   line {line + 1}\n\n\n\nof the book")
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(settings, "PDF_PARALLEL_MIN_PAGES", 10)
+    monkeypatch.setattr(settings, "PDF_PARALLEL_CHUNK_PAGES", 4)
+    yield
+    shutdown_extraction_pool()
+
+
+@pytest.mark.asyncio
+async def test_parallel_matches_serial(sample_pdf, small_chunks):
+    """Test that chunks extracted in worker processes come back complete and in order."""
+    serial, _ = await PDFExtractor(workers=0).extract(sample_pdf)
+
+    extractor = PDFExtractor()
+    extractor.workers = 2  # Regardless of the CPUs of the test machine
+    assert extractor._runs_parallel(23)
+
+    parallel, _ = await extractor.extract(sample_pdf)
+
+    assert [p.page_number for p in parallel.pages] == list(range(1, 24))
+    assert parallel == serial
+
+
+def test_small_documents_stay_serial(small_chunks):
+    """Test the page thresholds of the parallel mode."""
+    extractor = PDFExtractor()
+    extractor.workers = 4
+
+    assert not extractor._runs_parallel(9)
+    assert extractor._runs_parallel(10)
+
+    extractor.workers = 1
+    assert not extractor._runs_parallel(1000)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,84 @@
+"""
+Tests for the per-page pdfplumber fallback
+"""
+
+import time
+
+import pytest
+import fitz
+
+from config import settings
+from services.text_extractor import PDFExtractor, clear_sessions
+from services.text_extractor import pdf_extractor
+from services.text_extractor.document_session import DocumentSession
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    path = tmp_path / "book.pdf"
+    doc = fitz.open()
+    for i in range(4):
+        page = doc.new_page()
+        if i != 2:
+            page.insert_text((72, 72), f"Text of page {i + 1}")
+    doc.save(str(path))
+    doc.close()
+    yield str(path)
+    clear_sessions()
+
+
+@pytest.fixture
+def failing_page(monkeypatch):
+    """PyMuPDF fails on the second page."""
+    page_text = DocumentSession.page_text
+
+    def fail_on_second(self, index, cache=True):
+        if index == 1:
+            raise RuntimeError("broken page")
+        return page_text(self, index, cache)
+
+    monkeypatch.setattr(DocumentSession, "page_text", fail_on_second)
+
+
+@pytest.mark.asyncio
+async def test_only_failed_and_empty_pages_use_pdfplumber(sample_pdf, failing_page, monkeypatch):
+    """Test that pdfplumber runs for the failed page and the empty one, and is recorded."""
+    retried = []
+    plumber_text = pdf_extractor._pdfplumber_page_text
+
+    def record(file_path, index):
+        retried.append(index)
+        return plumber_text(file_path, index)
+
+    monkeypatch.setattr(pdf_extractor, "_pdfplumber_page_text", record)
+
+    extracted, _ = await PDFExtractor(workers=0).extract(sample_pdf)
+
+    assert retried == [1, 2]
+    assert [p.text for p in extracted.pages] == ["Text of page 1", "Text of page 2", "", "Text of page 4"]
+    # The blank page has no text for pdfplumber either, so only page 2 came from it
+    assert extracted.fallback_pages == [2]
+    assert extracted.model_dump()["fallback_pages"] == [2]
+
+
+@pytest.mark.asyncio
+async def test_page_timeout_leaves_page_empty(sample_pdf, failing_page, monkeypatch):
+    """Test that a hanging pdfplumber page is given up on after its timeout."""
+    monkeypatch.setattr(settings, "PDF_FALLBACK_PAGE_TIMEOUT", 0.2)
+
+    def hang(file_path, index):
+        time.sleep(5)
+        return "too late"
+
+    monkeypatch.setattr(pdf_extractor, "_pdfplumber_page_text", hang)
+
+    start = time.monotonic()
+    extracted, _ = await PDFExtractor(workers=0).extract(sample_pdf)
+
+    assert time.monotonic() - start < 2
+    assert [p.text for p in extracted.pages] == ["Text of page 1", "", "", "Text of page 4"]
+    assert extracted.fallback_pages == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,82 @@
+"""
+Tests for per-job stage profiling
+"""
+
+import pstats
+import pytest
+import fitz
+
+from services.jobs import InMemoryJobStore
+from services.document_processor import DocumentProcessor
+from services.profiling import StageProfiler
+from models import ProcessingOptions, ProcessingStatus
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    path = tmp_path / "book.pdf"
+    doc = fitz.open()
+    for i in range(3):
+        page = doc.new_page()
+        for line in range(10):
+            page.insert_text((72, 72 + line * 14), f"Page {i + 1} line {line + 1} of the sample book")
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def _fib(n):
+    return n if n < 2 else _fib(n - 1) + _fib(n - 2)
+
+
+def test_stage_report_and_files(tmp_path):
+    """Test the report of a profiled stage and its pstats/collapsed files."""
+    profiler = StageProfiler(tmp_path, top_n=5)
+
+    with profiler.stage("compute"):
+        _fib(15)
+        data = [bytes(1024) for _ in range(100)]
+    del data
+
+    report = profiler.reports[0]
+    assert report["stage"] == "compute"
+    assert report["peak_memory_bytes"] >= 100 * 1024
+    assert len(report["top_functions"]) <= 5
+    assert any("_fib" in fn["function"] for fn in report["top_functions"])
+
+    stats = pstats.Stats(str(tmp_path / report["pstats_file"]))
+    assert any(func[2] == "_fib" for func in stats.stats)
+
+    lines = (tmp_path / report["collapsed_file"]).read_text().splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert stack and int(count) > 0
+
+
+@pytest.mark.asyncio
+async def test_processor_attaches_profile(sample_pdf, tmp_path):
+    """Test that profiled jobs record every stage and clean up with the job."""
+    store = InMemoryJobStore(result_dir=tmp_path / "results")
+    store.create("job-1", {"status": ProcessingStatus.PENDING, "progress": 0, "logs": []})
+
+    await DocumentProcessor().process(
+        "job-1", sample_pdf,
+        ProcessingOptions(use_ai_parsing=False, profile=True),
+        store
+    )
+
+    job = store.get_summary("job-1")
+    assert job["status"] == ProcessingStatus.COMPLETED
+    stages = [stage["stage"] for stage in job["profile"]]
+    assert stages == ["document_info", "text_extraction", "toc_detection", "content_splitting", "save_result"]
+
+    artifact_dir = store.artifact_dir("job-1")
+    assert (artifact_dir / job["profile"][1]["pstats_file"]).is_file()
+
+    store.delete("job-1")
+    assert not artifact_dir.exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
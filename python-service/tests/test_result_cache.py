@@ -0,0 +1,90 @@
+"""
+Tests for the pipeline result cache
+"""
+
+import os
+import pytest
+
+from services.result_cache import ResultCache
+from services.document_processor import DocumentProcessor
+from services.jobs import InMemoryJobStore
+from models import ProcessingOptions, ProcessingStatus
+from config import settings
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a result cache in a temp directory."""
+    return ResultCache(tmp_path / "cache", max_bytes=10 * 1024 * 1024)
+
+
+def test_key_depends_on_output_settings(monkeypatch):
+    """Test that settings changing the pipeline output change the key."""
+    base = ResultCache.make_key("hash", ProcessingOptions())
+    monkeypatch.setattr(settings, "OCR_DPI", 400)
+
+    assert base != ResultCache.make_key("hash", ProcessingOptions())
+
+
+def test_key_depends_on_relevant_options():
+    """Test that only output-affecting options change the key."""
+    base = ResultCache.make_key("hash", ProcessingOptions())
+
+    assert base == ResultCache.make_key("hash", ProcessingOptions(use_cache=False))
+    assert base != ResultCache.make_key("other", ProcessingOptions())
+    assert base != ResultCache.make_key("hash", ProcessingOptions(use_ocr=True))
+    assert (
+        ResultCache.make_key("hash", ProcessingOptions(use_ai_parsing=False, ai_provider="claude"))
+        == ResultCache.make_key("hash", ProcessingOptions(use_ai_parsing=False, ai_provider="openai"))
+    )
+
+
+def test_set_and_get(cache):
+    """Test storing and reading a result."""
+    cache.set("k1", {"chapters": [{"title": "الفصل الأول"}]})
+
+    assert cache.get("k1") == {"chapters": [{"title": "الفصل الأول"}]}
+    assert cache.get("missing") is None
+
+
+def test_lru_eviction(tmp_path):
+    """Test that the least recently used entries are evicted first."""
+    payload = {"text": os.urandom(4000).hex()}
+    cache = ResultCache(tmp_path / "cache", max_bytes=10000)
+
+    cache.set("old", payload)
+    os.utime(cache._path("old"), (1, 1))
+    cache.set("recent", payload)
+    os.utime(cache._path("recent"), (2, 2))
+    cache.get("old")  # touch: now most recently used
+    cache.set("new", payload)
+
+    assert cache.get("recent") is None
+    assert cache.get("old") is not None
+    assert cache.get("new") is not None
+
+
+@pytest.mark.asyncio
+async def test_processor_reuses_cached_result(cache, tmp_path):
+    """Test that a second run of the same file is served from the cache."""
+    abx_path = tmp_path / "book.abx"
+    abx_path.write_text("الفصل الأول\n\nمحتوى الفصل الأول\n" * 20, encoding="utf-8")
+
+    store = InMemoryJobStore()
+    processor = DocumentProcessor()
+    processor.result_cache = cache
+    options = ProcessingOptions(use_ai_parsing=False)
+
+    for upload_id in ("first", "second"):
+        store.create(upload_id, {"status": ProcessingStatus.PENDING, "progress": 0, "logs": []})
+        await processor.process(upload_id, str(abx_path), options, store)
+
+    first, second = store.get("first"), store.get("second")
+    assert second["status"] == ProcessingStatus.COMPLETED
+    assert second["result"]["upload_id"] == "second"
+    assert second["result"]["chapters"] == first["result"]["chapters"]
+    assert "Reused cached result" in second["logs"][-1]["message"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,56 @@
+"""
+Tests for the page-streaming pipeline
+"""
+
+import pytest
+import fitz
+
+from services.text_extractor import TextExtractor
+from services.jobs import InMemoryJobStore
+from services.document_processor import DocumentProcessor
+from models import ProcessingOptions, ProcessingStatus
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    path = tmp_path / "book.pdf"
+    doc = fitz.open()
+    for i in range(30):
+        page = doc.new_page()
+        for line in range(12):
+            page.insert_text((72, 72 + line * 14), f"Page {i + 1} line {line + 1} of the sample book")
+    doc.set_toc([[1, "Part one", 1], [1, "Part two", 12], [2, "Section", 15], [1, "Part three", 25]])
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.mark.asyncio
+async def test_stream_matches_extract(sample_pdf):
+    """Test that streamed pages build the same ExtractedText as extract()."""
+    extractor = TextExtractor()
+    expected = await extractor.extract(sample_pdf)
+
+    stream = extractor.stream(sample_pdf)
+    pages = [page async for page in stream]
+
+    assert stream.to_extracted(pages) == expected
+
+
+@pytest.mark.asyncio
+async def test_processor_splits_streamed_pages(sample_pdf):
+    """Test that the processor builds its chapters from the streamed pages."""
+    store = InMemoryJobStore()
+    store.create("job", {"status": ProcessingStatus.PENDING, "progress": 0, "logs": []})
+    await DocumentProcessor().process(
+        "job", sample_pdf, ProcessingOptions(use_ai_parsing=False, use_cache=False), store
+    )
+
+    job = store.get("job")
+    assert job["status"] == ProcessingStatus.COMPLETED
+    assert [c["title"] for c in job["result"]["chapters"]] == ["Part one", "Part two", "Part three"]
+    assert job["result"]["extracted_text"]["total_pages"] == 30
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,68 @@
+"""
+Tests for the single-pass Tesseract engine
+"""
+
+import pytest
+import pytesseract
+from PIL import Image
+
+from services.text_extractor import TesseractEngine
+from services.text_extractor.tesseract_engine import parse_tsv
+
+HEADER = "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext"
+
+
+def _row(level, page, block, par, line, word, conf, text):
+    return f"{level}\t{page}\t{block}\t{par}\t{line}\t{word}\t0\t0\t10\t10\t{conf}\t{text}"
+
+
+TSV = "\n".join([
+    HEADER,
+    _row(1, 1, 0, 0, 0, 0, -1, ""),
+    _row(4, 1, 1, 1, 1, 0, -1, ""),
+    _row(5, 1, 1, 1, 1, 1, 96, "بسم"),
+    _row(5, 1, 1, 1, 1, 2, 90, "الله"),
+    _row(5, 1, 1, 1, 2, 1, 80, "الرحمن"),
+    _row(5, 1, 1, 1, 2, 2, 95, " "),  # Empty word
+    _row(5, 1, 1, 2, 1, 1, 70, "Chapter"),
+    _row(5, 1, 2, 1, 1, 1, 60, "2"),
+    _row(1, 2, 0, 0, 0, 0, -1, ""),
+    _row(1, 3, 0, 0, 0, 0, -1, ""),
+    _row(5, 3, 1, 1, 1, 1, 50, "صفحة"),
+])
+
+
+def test_parse_tsv_rebuilds_pages_in_reading_order():
+    """Test that words are joined into lines and paragraphs, page by page."""
+    pages = parse_tsv(TSV, page_count=3)
+
+    assert pages[0].text == "بسم الله\nالرحمن\n\nChapter\n\n2"
+    assert [word.confidence for word in pages[0].words] == [0.96, 0.9, 0.8, 0.7, 0.6]
+    assert pages[0].confidence == pytest.approx(0.792)
+    assert pages[1].text == "" and pages[1].confidence == 0.0  # Blank page
+    assert pages[2].text == "صفحة" and pages[2].confidence == 0.5
+
+
+def test_batch_is_one_tesseract_run(monkeypatch):
+    """Test that several images go to Tesseract in a single call, as an image list."""
+    calls = []
+
+    def fake_image_to_data(source, lang, config):
+        with open(source, encoding="utf-8") as f:
+            calls.append((f.read().split(), lang, config))
+        return TSV
+
+    monkeypatch.setattr(pytesseract, "image_to_data", fake_image_to_data)
+    images = [Image.new("L", (40, 20), 255) for _ in range(3)]
+
+    pages = TesseractEngine().recognize(images)
+
+    assert len(calls) == 1
+    paths, lang, config = calls[0]
+    assert len(paths) == 3 and all(path.endswith(".pnm") for path in paths)
+    assert lang == "ara+eng" and config == "--psm 6"
+    assert [page.text for page in pages] == [p.text for p in parse_tsv(TSV, 3)]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
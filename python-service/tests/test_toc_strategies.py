@@ -0,0 +1,135 @@
+"""
+Tests for the concurrent TOC strategy runner
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+
+from models import AiTocParseResult, TocItem
+from services.toc_detector import TocDetector, TocStrategyRunner
+
+TOC_TEXT = "الفهرس\n" + "\n".join(f"الباب {i} ........ {i * 10}" for i in range(1, 6))
+PAGES = [{"page_number": 1, "text": "الباب الأول في الطهارة"}, {"page_number": 2, "text": "نص"}]
+
+
+def _ai_result(count=4):
+    return AiTocParseResult(
+        toc_items=[TocItem(title=f"Item {i}", level=1, order=i) for i in range(count)],
+        confidence=0.8,
+        provider="local"
+    )
+
+
+@pytest.fixture
+def ai_calls():
+    return []
+
+
+@pytest.fixture
+def detector(ai_calls):
+    """Detector whose AI blocks until released (or answers at once if not blocked)."""
+    detector = TocDetector(ai_provider="local")
+    detector.release = threading.Event()
+    detector.release.set()
+
+    async def parse(text, pages=None):
+        ai_calls.append(text)
+        detector.release.wait(5)
+        return _ai_result()
+
+    detector.ai_parser.parse = parse
+    return detector
+
+
+@pytest.mark.asyncio
+async def test_pattern_wins_without_waiting_for_ai(detector, ai_calls):
+    """Test early exit on a confident pattern result while the AI is still running."""
+    detector.release.clear()
+    try:
+        result = await TocStrategyRunner(detector, speculative_ai=True).run(TOC_TEXT, PAGES)
+    finally:
+        detector.release.set()
+
+    assert result.provider == "pattern"
+    assert len(result.toc_items) == 5
+    assert len(ai_calls) <= 1
+
+
+@pytest.mark.asyncio
+async def test_ai_not_sent_when_patterns_succeed(detector, ai_calls):
+    """Test that by default no AI request is made for a document the patterns handle."""
+    result = await detector.detect(TOC_TEXT, PAGES)
+
+    assert result.provider == "pattern"
+    assert ai_calls == []
+
+
+@pytest.mark.asyncio
+async def test_structure_only_runs_when_the_others_find_nothing(detector):
+    """Test that page structure analysis is skipped when a cheaper strategy found the TOC."""
+    analyzed = []
+    analyze = detector._analyze_page_structure
+    detector._analyze_page_structure = lambda pages: analyzed.append(pages) or analyze(pages)
+
+    assert (await detector.detect(TOC_TEXT, PAGES)).provider == "pattern"
+    assert (await detector.detect("نص بلا فهرس", PAGES)).provider == "local"
+    assert analyzed == []
+
+    detector.ai_parser.parse = lambda *args: asyncio.sleep(0)  # The AI finds nothing
+    assert (await detector.detect("نص بلا فهرس", PAGES)).provider == "structure_analysis"
+    assert analyzed == [PAGES]
+
+
+@pytest.mark.asyncio
+async def test_ai_runs_once_when_patterns_fail(detector, ai_calls):
+    """Test that the AI result is used, without a second request."""
+    result = await detector.detect("نص بلا فهرس", PAGES)
+
+    assert result.provider == "local"
+    assert len(ai_calls) == 1
+    assert detector.ai_seconds is not None  # Reported as the ai_parsing step
+
+
+@pytest.mark.asyncio
+async def test_ai_timeout_falls_back_to_structure(detector, ai_calls):
+    """Test that a slow AI is abandoned and page structure analysis is used."""
+    detector.release.clear()
+    try:
+        result = await TocStrategyRunner(detector, ai_timeout=0.1).run("نص بلا فهرس", PAGES)
+    finally:
+        detector.release.set()
+
+    assert result.provider == "structure_analysis"
+    assert [item.page_number for item in result.toc_items] == [1]
+
+
+def test_abandoned_ai_does_not_hold_up_the_job(detector):
+    """Test that the job's event loop shuts down without waiting for a timed-out AI request."""
+    detector.release.clear()
+    try:
+        started = time.monotonic()
+        result = asyncio.run(TocStrategyRunner(detector, ai_timeout=0.1).run("نص بلا فهرس", PAGES))
+        elapsed = time.monotonic() - started
+    finally:
+        detector.release.set()
+
+    assert result.provider == "structure_analysis"
+    assert elapsed < 2  # The AI would block for 5 seconds
+
+
+@pytest.mark.asyncio
+async def test_no_ai_provider(ai_calls):
+    """Test that detection without AI parsing never calls the AI."""
+    detector = TocDetector(ai_provider="pattern")
+    detector.ai_parser.parse = lambda *args: ai_calls.append(args)
+
+    result = await TocStrategyRunner(detector, speculative_ai=False).run("نص بلا فهرس")
+
+    assert result.toc_items == []
+    assert ai_calls == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
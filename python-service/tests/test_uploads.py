@@ -0,0 +1,81 @@
+"""
+Tests for streaming multipart uploads
+"""
+
+import hashlib
+import pytest
+
+from services.uploads import StreamingUploadWriter, UploadError, UploadTooLargeError
+
+BOUNDARY = "----testboundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def _multipart_body(content: bytes, filename: str = "book.abx", fields: dict = None) -> bytes:
+    parts = []
+    for name, value in (fields or {}).items():
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    parts.append(
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f'Content-Type: application/octet-stream\r\n\r\n'.encode() + content + b"\r\n"
+    )
+    parts.append(f"--{BOUNDARY}--\r\n".encode())
+    return b"".join(parts)
+
+
+async def _chunks(body: bytes, size: int = 1000):
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+
+@pytest.mark.asyncio
+async def test_stream_upload_to_disk(tmp_path):
+    """Test that the file is written, hashed and named after upload_id."""
+    content = "الفصل الأول\n".encode("utf-8") * 5000
+    body = _multipart_body(content, fields={"upload_id": "abc", "process": "true"})
+
+    writer = StreamingUploadWriter(CONTENT_TYPE, upload_dir=tmp_path, max_size=len(content))
+    stored = await writer.consume(_chunks(body))
+
+    assert stored.upload_id == "abc"
+    assert stored.file_name == "book.abx"
+    assert stored.file_size == len(content)
+    assert stored.file_hash == hashlib.sha256(content).hexdigest()
+    assert stored.fields["process"] == "true"
+    assert (tmp_path / "abc.abx").read_bytes() == content
+
+
+@pytest.mark.asyncio
+async def test_stream_upload_too_large(tmp_path):
+    """Test that oversized uploads are rejected and leave no file behind."""
+    body = _multipart_body(b"x" * 5000)
+
+    writer = StreamingUploadWriter(CONTENT_TYPE, upload_dir=tmp_path, max_size=1000)
+    with pytest.raises(UploadTooLargeError):
+        await writer.consume(_chunks(body))
+
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_stream_upload_rejects_bad_requests(tmp_path):
+    """Test unsupported extensions and missing file parts."""
+    with pytest.raises(UploadError):
+        writer = StreamingUploadWriter(CONTENT_TYPE, upload_dir=tmp_path)
+        await writer.consume(_chunks(_multipart_body(b"data", filename="evil.exe")))
+
+    with pytest.raises(UploadError):
+        body = f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="x"\r\n\r\n1\r\n--{BOUNDARY}--\r\n'
+        writer = StreamingUploadWriter(CONTENT_TYPE, upload_dir=tmp_path)
+        await writer.consume(_chunks(body.encode()))
+
+    with pytest.raises(UploadError):
+        StreamingUploadWriter("application/json", upload_dir=tmp_path)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])